@@ -0,0 +1,241 @@
+"""
+On-disk store of extracted article text, keyed by canonical URL.
+
+Predictions for a URL expire after the cache TTL, but the article behind it
+rarely changes. The extracted text is kept zlib-compressed in a SQLite file
+(shared by the workers on a host) together with the page's ETag and
+Last-Modified validators; the next fetch of the same article sends a
+conditional GET and a 304 skips the download and the extraction. Tracking
+parameters, fragments and AMP variants map to the same canonical key. The
+file is capped at ARTICLE_STORE_MAX_BYTES of compressed text, pruning least
+recently used articles first.
+"""
+import os
+import re
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+from app.metrics import register_collector, stats_families
+
+logger = logging.getLogger(__name__)
+
+# Empty disables the store
+ARTICLE_STORE_PATH = os.getenv("ARTICLE_STORE_PATH", "/tmp/fakecheck-articles.sqlite3")
+try:
+    ARTICLE_STORE_MAX_BYTES = int(os.getenv("ARTICLE_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+except ValueError:
+    ARTICLE_STORE_MAX_BYTES = 256 * 1024 * 1024
+# Pruning frees space down to this fraction of the cap, so it doesn't run on every write
+_PRUNE_TARGET = 0.9
+
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "yclid", "_ga", "_gl",
+    "ref", "ref_src", "ref_url", "cmpid", "ito", "ns_mchannel", "ns_source", "ns_campaign", "ns_linkname",
+    "share", "shared", "si", "s_cid", "amp", "amp_js_v", "usqp", "outputtype", "__twitter_impression",
+}
+_TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "at_")
+# Google's AMP viewer and the AMP CDN wrap the publisher URL: /amp/s/<host>/<path>, /c/s/<host>/<path>
+_AMP_CACHE_RE = re.compile(r"^/(?:amp|c|v)/(s/)?([^/]+\.[^/]+)(/.*)?$")
+_AMP_PATH_RE = re.compile(r"(?:/amp/?|\.amp(?:\.html)?|/amp\.html)$")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Cache key for an article URL: lowercase host without "www."/"m."/"amp."
+    and default port, AMP cache and AMP path variants unwrapped, tracking
+    parameters and the fragment removed, remaining parameters sorted.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    path = parts.path
+
+    match = _AMP_CACHE_RE.match(path)
+    if match and (host.endswith(".cdn.ampproject.org") or host in ("google.com", "www.google.com")):
+        host = unquote(match.group(2)).lower()
+        path = match.group(3) or "/"
+
+    for prefix in ("www.", "m.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = _AMP_PATH_RE.sub("", path).replace("/amp/", "/")
+    path = path.rstrip("/") or "/"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIXES)
+    )
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, urlencode(query), ""))
+
+
+@dataclass
+class StoredArticle:
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ArticleStore:
+    """
+    Compressed article texts with their HTTP validators in a SQLite file (WAL
+    mode). Errors are logged and treated as misses: a broken store only costs
+    the full download it would have saved.
+    """
+
+    def __init__(self, path: str, max_bytes: int = ARTICLE_STORE_MAX_BYTES, timeout: float = 1.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "key TEXT PRIMARY KEY, text BLOB NOT NULL, etag TEXT, last_modified TEXT, "
+            "size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS articles_accessed_at ON articles (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _failed(self, action: str, error: Exception):
+        self.errors += 1
+        logger.warning("Article store %s failed: %s", action, error)
+
+    def get(self, key: str) -> Optional[StoredArticle]:
+        try:
+            row = self._connect().execute(
+                "SELECT text, etag, last_modified FROM articles WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            text = zlib.decompress(row[0]).decode("utf-8")
+        except (sqlite3.Error, zlib.error, UnicodeDecodeError) as e:
+            self._failed("read", e)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return StoredArticle(text, row[1], row[2])
+
+    def touch(self, key: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """The stored text was confirmed current (304): bump its recency and refresh any new validators."""
+        self.revalidated += 1
+        try:
+            self._connect().execute(
+                "UPDATE articles SET accessed_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time(), etag, last_modified, key),
+            )
+        except sqlite3.Error as e:
+            self._failed("update", e)
+
+    def put(self, key: str, text: str, etag: Optional[str], last_modified: Optional[str]):
+        blob = zlib.compress(text.encode("utf-8"), 6)
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO articles (key, text, etag, last_modified, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, blob, etag, last_modified, len(blob), now, now),
+            )
+            self.writes += 1
+            self._prune(conn)
+        except sqlite3.Error as e:
+            self._failed("write", e)
+
+    def delete(self, key: str):
+        try:
+            self._connect().execute("DELETE FROM articles WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            self._failed("delete", e)
+
+    def _prune(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        with self._lock:
+            excess = total - int(self.max_bytes * _PRUNE_TARGET)
+            victims = []
+            for key, size in conn.execute("SELECT key, size FROM articles ORDER BY accessed_at"):
+                if excess <= 0:
+                    break
+                victims.append((key,))
+                excess -= size
+            conn.executemany("DELETE FROM articles WHERE key = ?", victims)
+            self.evictions += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"hits": self.hits, "misses": self.misses, "revalidated": self.revalidated, "writes": self.writes,
+                 "evictions": self.evictions, "errors": self.errors, "max_bytes": self.max_bytes}
+        try:
+            entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM articles").fetchone()
+            stats.update(entries=entries, bytes=size)
+        except sqlite3.Error:
+            pass
+        return stats
+
+
+_store: Optional[ArticleStore] = None
+_store_failed = False
+
+
+def get_article_store() -> Optional[ArticleStore]:
+    """The process-wide store, or None when ARTICLE_STORE_PATH is empty or the file can't be opened."""
+    global _store, _store_failed
+    if _store is None and ARTICLE_STORE_PATH and not _store_failed:
+        try:
+            _store = ArticleStore(ARTICLE_STORE_PATH)
+        except sqlite3.Error as e:
+            _store_failed = True
+            logger.warning("Article store disabled, cannot open %s: %s", ARTICLE_STORE_PATH, e)
+    return _store
+
+
+def get_article_store_stats() -> Dict[str, Any]:
+    return _store.stats() if _store is not None else {"enabled": False}
+
+
+def _collect_metrics():
+    if _store is None:
+        return
+    stats = _store.stats()
+    yield from stats_families("fakecheck_cache", stats, counters=("hits", "misses", "evictions"),
+                              gauges=("entries", "bytes"), labels={"cache": "articles"},
+                              documentation="Prediction and stance cache statistics")
+    yield from stats_families("fakecheck_article_store", stats, counters=("revalidated", "writes", "errors"),
+                              documentation="Article store conditional revalidation and write statistics")
+
+
+register_collector(_collect_metrics)
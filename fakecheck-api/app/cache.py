@@ -1,19 +1,400 @@
 """
-In-memory caching layer for predictions (1h TTL).
+Caching layer for predictions (1h TTL) and evidence provider results.
+A bounded in-process LRU (per-entry TTL, byte accounting, background expiry
+sweeps) in front of an optional shared backend selected by CACHE_BACKEND:
+"memory" (default, per worker), "redis" (any Redis-protocol server) or
+"sqlite" (one file shared by all workers on a host). Predictions are also
+written to the durable MongoDB tier in app.prediction_store when configured.
 """
 import os
+import logging
 import json
+import time
+import queue
+import asyncio
+import sqlite3
 import hashlib
-from typing import Optional
-from datetime import datetime, timedelta
+import inspect
+import threading
+import functools
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
 
+from app import prediction_store
+from app.metrics import register_collector, stats_families
 
-# In-memory cache as fallback
-_memory_cache = {}
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+PREDICTION_CACHE_TTL = 3600
+CACHE_MAX_ENTRIES = _env_int("CACHE_MAX_ENTRIES", 5000)
+CACHE_MAX_BYTES = _env_int("CACHE_MAX_BYTES", 64 * 1024 * 1024)
+CACHE_SWEEP_INTERVAL = _env_int("CACHE_SWEEP_INTERVAL", 60)
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "/tmp/fakecheck-cache.sqlite3")
+try:
+    CACHE_BACKEND_TIMEOUT = float(os.getenv("CACHE_BACKEND_TIMEOUT", "0.1"))
+except ValueError:
+    CACHE_BACKEND_TIMEOUT = 0.1
+# How long a failing backend is bypassed before it is tried again
+CACHE_BACKEND_RETRY_SECONDS = _env_int("CACHE_BACKEND_RETRY_SECONDS", 30)
+CACHE_WRITE_QUEUE_SIZE = _env_int("CACHE_WRITE_QUEUE_SIZE", 10000)
+
+# Provider results, per provider: long for encyclopedic sources, short for headlines
+PROVIDER_CACHE_TTLS = {
+    "claimreview": _env_int("PROVIDER_CACHE_TTL_CLAIMREVIEW", 6 * 3600),
+    "newsapi": _env_int("PROVIDER_CACHE_TTL_NEWSAPI", 600),
+    "gdelt": _env_int("PROVIDER_CACHE_TTL_GDELT", 900),
+    "web": _env_int("PROVIDER_CACHE_TTL_WEB", 1800),
+    "wikipedia": _env_int("PROVIDER_CACHE_TTL_WIKIPEDIA", 24 * 3600),
+}
+# Empty (or failed) provider results are kept only this long
+PROVIDER_CACHE_NEGATIVE_TTL = _env_int("PROVIDER_CACHE_NEGATIVE_TTL", 60)
+PROVIDER_CACHE_MAX_ENTRIES = _env_int("PROVIDER_CACHE_MAX_ENTRIES", 5000)
+PROVIDER_CACHE_MAX_BYTES = _env_int("PROVIDER_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a cached value via its JSON encoding."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and limits on entry count and bytes.
+    Expired entries are dropped on read and by periodic sweeps; the least recently
+    used entries are evicted when either limit is exceeded.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None, default_ttl: Optional[float] = None,
+                 sizeof: Callable[[Any], int] = _estimate_size, sweep_interval: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._sizeof = sizeof
+        # key -> (value, expires_at or None, size)
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._sweep_interval = sweep_interval
+        self._sweeper: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, size = entry
+            if expires_at is not None and now >= expires_at:
+                self._remove(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self._sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries
+                                  or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        self._ensure_sweeper()
+
+    def delete(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._remove(key, entry[2])
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [(k, e[2]) for k, e in self._data.items() if e[1] is not None and now >= e[1]]
+            for key, size in expired:
+                self._remove(key, size)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, key: str, size: int):
+        del self._data[key]
+        self._bytes -= size
+
+    def _ensure_sweeper(self):
+        if not self._sweep_interval or (self._sweeper is not None and self._sweeper.is_alive()):
+            return
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="cache-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(self._sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning("Cache sweep failed: %s", e)
+
+
+class RedisCacheBackend:
+    """Shared cache on any Redis-protocol server (Redis, KeyDB, Valkey, ...)."""
+
+    name = "redis"
+
+    def __init__(self, url: str, timeout: float = CACHE_BACKEND_TIMEOUT):
+        import redis  # optional dependency, only needed for CACHE_BACKEND=redis
+        self.client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, payload: str, ttl: int):
+        self.client.set(key, payload, ex=max(1, int(ttl)))
+
+
+class SQLiteCacheBackend:
+    """Shared cache in a SQLite file (WAL mode) for all workers on one host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, timeout: float = 1.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS predictions_expires_at ON predictions (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT value FROM predictions WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, payload: str, ttl: int):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO predictions (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, payload, time.time() + ttl),
+        )
+
+    def prune(self):
+        self._connect().execute("DELETE FROM predictions WHERE expires_at <= ?", (time.time(),))
+
+
+class SharedCache:
+    """
+    Wraps a shared backend: writes go through a background thread and reads from
+    the event loop (aget) run in a worker thread, so callers never block the loop
+    on the network or disk. Any backend error marks it down for
+    CACHE_BACKEND_RETRY_SECONDS during which reads simply miss.
+    """
+
+    def __init__(self, backend, retry_seconds: float = CACHE_BACKEND_RETRY_SECONDS,
+                 queue_size: int = CACHE_WRITE_QUEUE_SIZE):
+        self.backend = backend
+        self.retry_seconds = retry_seconds
+        self._down_until = 0.0
+        self._writes: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._writer = threading.Thread(target=self._write_loop, name=f"cache-writer-{backend.name}", daemon=True)
+        self._writer.start()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.dropped_writes = 0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, error: Exception):
+        self.errors += 1
+        if self.healthy:
+            logger.warning("Cache backend '%s' unavailable, bypassing for %ss: %s", self.backend.name, self.retry_seconds, error)
+        self._down_until = time.monotonic() + self.retry_seconds
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (value, remaining_ttl) or None; never raises."""
+        if not self.healthy:
+            self.misses += 1
+            return None
+        try:
+            raw = self.backend.get(key)
+        except Exception as e:
+            self._mark_down(e)
+            self.misses += 1
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        try:
+            record = json.loads(raw)
+            remaining = record["expires_at"] - time.time()
+        except (ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        if remaining <= 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record["value"], remaining
+
+    async def aget(self, key: str) -> Optional[tuple]:
+        """get() for the event loop: the backend read runs in a worker thread."""
+        if not self.healthy:
+            self.misses += 1
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    def set(self, key: str, value: Any, ttl: int):
+        """Queue an asynchronous write; dropped when the backend is down or the queue is full."""
+        if not self.healthy:
+            self.dropped_writes += 1
+            return
+        payload = json.dumps({"value": value, "expires_at": time.time() + ttl}, default=str)
+        try:
+            self._writes.put_nowait((key, payload, ttl))
+        except queue.Full:
+            self.dropped_writes += 1
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until queued writes have been applied (used in tests and at shutdown)."""
+        deadline = time.monotonic() + timeout
+        while self._writes.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _write_loop(self):
+        writes_since_prune = 0
+        while True:
+            key, payload, ttl = self._writes.get()
+            try:
+                if self.healthy:
+                    self.backend.set(key, payload, ttl)
+                    writes_since_prune += 1
+                    if writes_since_prune >= 1000 and hasattr(self.backend, "prune"):
+                        self.backend.prune()
+                        writes_since_prune = 0
+                else:
+                    self.dropped_writes += 1
+            except Exception as e:
+                self._mark_down(e)
+                self.dropped_writes += 1
+            finally:
+                self._writes.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "healthy": self.healthy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "dropped_writes": self.dropped_writes,
+            "queued_writes": self._writes.qsize(),
+        }
+
+
+def create_shared_cache(backend_name: str = CACHE_BACKEND) -> Optional[SharedCache]:
+    """Build the configured shared backend; None for the per-worker memory backend."""
+    try:
+        if backend_name == "redis":
+            url = os.getenv("REDIS_URL")
+            if not url:
+                logger.warning("CACHE_BACKEND=redis but REDIS_URL is not set; using in-memory cache only")
+                return None
+            return SharedCache(RedisCacheBackend(url))
+        if backend_name == "sqlite":
+            return SharedCache(SQLiteCacheBackend(CACHE_SQLITE_PATH))
+    except Exception as e:
+        logger.warning("Cache backend '%s' could not be initialised, using in-memory cache only: %s", backend_name, e)
+        return None
+    if backend_name != "memory":
+        logger.warning("Unknown CACHE_BACKEND '%s'; using in-memory cache only", backend_name)
+    return None
+
+
+# In-memory cache (always consulted first)
+_memory_cache = LRUCache(
+    max_entries=CACHE_MAX_ENTRIES,
+    max_bytes=CACHE_MAX_BYTES,
+    sweep_interval=CACHE_SWEEP_INTERVAL,
+)
+
+# Shared cross-worker backend (optional)
+_shared_cache: Optional[SharedCache] = create_shared_cache()
 
 
 def get_redis_client():
-    """Redis is optional - using in-memory cache."""
+    """Redis client of the shared backend when CACHE_BACKEND=redis, otherwise None."""
+    if _shared_cache is not None and isinstance(_shared_cache.backend, RedisCacheBackend):
+        return _shared_cache.backend.client
     return None
 
 
@@ -23,18 +404,203 @@ def cache_key(url: Optional[str], text: Optional[str], country: str, state: Opti
     return f"fakecheck:{hashlib.md5(payload.encode()).hexdigest()}"
 
 
-def get_cached_prediction(key: str) -> Optional[dict]:
-    """Retrieve cached prediction from memory."""
-    if key in _memory_cache:
-        cached_data, expiry = _memory_cache[key]
-        if datetime.now() < expiry:
-            return cached_data
-        else:
-            del _memory_cache[key]
-    return None
+async def get_cached_prediction(key: str) -> Optional[dict]:
+    """Retrieve cached prediction from memory, then the shared backend, then the durable Mongo store."""
+    value = _memory_cache.get(key)
+    if value is None and _shared_cache is not None:
+        shared = await _shared_cache.aget(key)
+        if shared is not None:
+            value, remaining = shared
+            _memory_cache.set(key, value, remaining)
+    if value is not None:
+        prediction_store.record_hit(key)
+        return value
+    stored = await prediction_store.load(key)
+    if stored is None:
+        return None
+    value, remaining = stored
+    preload_prediction(key, value, remaining)
+    return value
+
+
+def set_cached_prediction(key: str, value: dict, ttl: int = PREDICTION_CACHE_TTL):
+    """Cache prediction in memory and (asynchronously) in the shared backend and the durable store."""
+    _memory_cache.set(key, value, ttl)
+    if _shared_cache is not None:
+        _shared_cache.set(key, value, ttl)
+    prediction_store.enqueue(key, value)
+
+
+def preload_prediction(key: str, value: dict, remaining: float):
+    """Put a verdict from the durable store into memory, for at most the usual cache TTL."""
+    _memory_cache.set(key, value, min(remaining, PREDICTION_CACHE_TTL))
+
+
+# Single-flight: key -> in-flight computation shared by concurrent identical requests
+_inflight: Dict[str, asyncio.Task] = {}
+_coalesced = 0
+
+
+async def coalesce(key: str, factory: Callable[[], Awaitable[Any]], cancel_abandoned: bool = False) -> Any:
+    """
+    Run factory() once per key among concurrent callers; later callers await the
+    same task. Each caller waits through asyncio.shield, so one caller being
+    cancelled (e.g. a client disconnect) does not cancel the shared computation.
+    With ``cancel_abandoned`` the computation is cancelled once every caller has
+    been cancelled (see join_shared); otherwise it always runs to completion.
+    """
+    global _coalesced
+    task = _inflight.get(key)
+    if (task is None or task.done() or task.cancelling()
+            or task.get_loop() is not asyncio.get_running_loop()):
+        task = asyncio.create_task(factory())
+        _inflight[key] = task
+
+        def _release(finished: asyncio.Task):
+            if _inflight.get(key) is finished:
+                del _inflight[key]
+
+        task.add_done_callback(_release)
+    else:
+        _coalesced += 1
+    if cancel_abandoned:
+        return await join_shared(task)
+    return await asyncio.shield(task)
+
+
+# Callers currently awaiting each task passed to join_shared
+_waiters: Dict[asyncio.Task, int] = {}
+
+
+async def join_shared(task: asyncio.Task) -> Any:
+    """
+    Await a task shared by several callers. Cancelling one caller does not
+    cancel the task for the others; once every caller has left, the task is
+    cancelled too (nobody is waiting for its result).
+    """
+    _waiters[task] = _waiters.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _waiters[task] -= 1
+        if not _waiters[task]:
+            del _waiters[task]
+            if not task.done():
+                task.cancel()
+
+
+# Evidence provider results, separate from the verdicts: different claims or articles
+# that reduce to the same provider query share one upstream call
+_provider_cache = LRUCache(
+    max_entries=PROVIDER_CACHE_MAX_ENTRIES,
+    max_bytes=PROVIDER_CACHE_MAX_BYTES,
+    sweep_interval=CACHE_SWEEP_INTERVAL,
+)
+_provider_counts: Dict[str, Dict[str, int]] = {}
+
+
+def provider_cache_key(provider: str, query: str, country: Optional[str] = None, scope: Optional[str] = None,
+                       state: Optional[str] = None) -> str:
+    """Key on provider, normalized query, country and scope (and state where it changes the query)."""
+    normalized = " ".join((query or "").lower().split())
+    payload = f"{provider}|{normalized}|{(country or '').upper()}|{scope or ''}|{(state or '').lower()}"
+    return f"fakecheck:provider:{hashlib.md5(payload.encode()).hexdigest()}"
+
+
+def _count(provider: str, field: str):
+    counts = _provider_counts.setdefault(provider, {"hits": 0, "misses": 0, "negative": 0})
+    counts[field] += 1
+
+
+async def _get_provider_results(key: str) -> Optional[List[Dict]]:
+    value = _provider_cache.get(key)
+    if value is not None or _shared_cache is None:
+        return value
+    shared = await _shared_cache.aget(key)
+    if shared is None:
+        return None
+    value, remaining = shared
+    _provider_cache.set(key, value, remaining)
+    return value
+
+
+def _set_provider_results(provider: str, key: str, results: List[Dict]):
+    ttl = PROVIDER_CACHE_TTLS.get(provider, 600) if results else PROVIDER_CACHE_NEGATIVE_TTL
+    if ttl <= 0:
+        return
+    if not results:
+        _count(provider, "negative")
+    _provider_cache.set(key, results, ttl)
+    if _shared_cache is not None:
+        _shared_cache.set(key, results, ttl)
+
+
+def provider_cached(provider: str, key_args: Sequence[str]):
+    """
+    Read-through cache for an async provider function. ``key_args`` names the
+    parameters (query, then country/scope/state as applicable) that identify
+    the query; concurrent identical queries share one upstream call, which is
+    cancelled when all of them are (evidence deadline, client disconnect).
+    """
+    def decorate(fetch: Callable[..., Awaitable[List[Dict]]]):
+        signature = inspect.signature(fetch)
+
+        @functools.wraps(fetch)
+        async def wrapper(*args, **kwargs) -> List[Dict]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = provider_cache_key(provider, *(bound.arguments[name] for name in key_args))
+            cached = await _get_provider_results(key)
+            if cached is not None:
+                _count(provider, "hits")
+                return list(cached)
+            _count(provider, "misses")
+
+            async def load() -> List[Dict]:
+                results = await fetch(*args, **kwargs) or []
+                _set_provider_results(provider, key, results)
+                return results
+
+            return list(await coalesce(key, load, cancel_abandoned=True))
+        return wrapper
+    return decorate
+
+
+def get_provider_cache_stats() -> Dict[str, Any]:
+    stats = _provider_cache.stats()
+    stats["providers"] = {name: dict(counts) for name, counts in _provider_counts.items()}
+    return stats
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters and current size of the prediction cache."""
+    stats = _memory_cache.stats()
+    stats["inflight"] = len(_inflight)
+    stats["coalesced"] = _coalesced
+    if _shared_cache is not None:
+        stats["shared"] = _shared_cache.stats()
+    return stats
+
+
+def _collect_metrics():
+    stats = get_cache_stats()
+    yield from stats_families("fakecheck_cache", stats, counters=("hits", "misses", "evictions", "expirations", "coalesced"),
+                              gauges=("entries", "bytes", "inflight"), labels={"cache": "predictions"},
+                              documentation="Prediction and stance cache statistics")
+    if "shared" in stats:
+        yield from stats_families("fakecheck_cache", stats["shared"], counters=("hits", "misses", "errors", "dropped_writes"),
+                                  gauges=("healthy", "queued_writes"), labels={"cache": "shared"},
+                                  documentation="Prediction and stance cache statistics")
+    providers = get_provider_cache_stats()
+    yield from stats_families("fakecheck_cache", providers, counters=("evictions", "expirations"),
+                              gauges=("entries", "bytes"), labels={"cache": "providers"},
+                              documentation="Prediction and stance cache statistics")
+    for field in ("hits", "misses"):
+        yield (f"fakecheck_cache_{field}_total", "counter", "Prediction and stance cache statistics",
+               [({"cache": "providers", "provider": name}, counts[field])
+                for name, counts in providers["providers"].items()])
+    yield ("fakecheck_provider_negative_cached_total", "counter", "Empty provider results cached with the short TTL",
+           [({"provider": name}, counts["negative"]) for name, counts in providers["providers"].items()])
 
 
-def set_cached_prediction(key: str, value: dict, ttl: int = 3600):
-    """Cache prediction in memory with TTL (default 1h)."""
-    expiry = datetime.now() + timedelta(seconds=ttl)
-    _memory_cache[key] = (value, expiry)
+register_collector(_collect_metrics)
@@ -0,0 +1,143 @@
+"""
+Circuit breakers for the evidence providers' upstream services.
+
+Each upstream (GDELT, NewsAPI, DuckDuckGo, Bing, ...) gets a breaker that
+opens after CIRCUIT_FAILURE_THRESHOLD consecutive failures (exceptions,
+non-200 responses or CAPTCHA pages). While open, calls fail immediately
+instead of waiting out the provider timeout; after CIRCUIT_COOLDOWN_SECONDS
+one probe request is let through (half-open) and its outcome closes or
+re-opens the breaker. Breakers are per worker process.
+"""
+import os
+import time
+import logging
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from app.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+try:
+    CIRCUIT_FAILURE_THRESHOLD = max(1, int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3")))
+except ValueError:
+    CIRCUIT_FAILURE_THRESHOLD = 3
+try:
+    CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "30"))
+except ValueError:
+    CIRCUIT_COOLDOWN_SECONDS = 30.0
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe (event-loop confined)."""
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 cooldown: float = CIRCUIT_COOLDOWN_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self.rejected += 1
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self):
+        self._probing = False
+        self.failures = 0
+        if self.state != CLOSED:
+            logger.info("Circuit for %s closed", self.name)
+            self.state = CLOSED
+
+    def record_failure(self):
+        self._probing = False
+        self.failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.trips += 1
+            logger.warning("Circuit for %s opened after %d consecutive failure(s); skipping it for %.0fs",
+                           self.name, self.failures, self.cooldown)
+
+    def release(self):
+        """A probe ended without an outcome (e.g. cancelled); let the next call probe."""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name)
+    return breaker
+
+
+async def breaker_get(name: str, http: httpx.AsyncClient, url: str,
+                      is_blocked: Optional[Callable[[httpx.Response], bool]] = None, **kwargs) -> httpx.Response:
+    """
+    http.get(url, **kwargs) guarded by the ``name`` breaker. Raises
+    CircuitOpenError without a request while the breaker is open. Exceptions,
+    non-200 responses and responses ``is_blocked`` flags count as failures;
+    the response is returned either way.
+    """
+    breaker = get_breaker(name)
+    if not breaker.allow():
+        raise CircuitOpenError(f"{name} circuit open")
+    try:
+        response = await http.get(url, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        # Cancelled by the evidence deadline or a disconnect: says nothing about the upstream
+        breaker.release()
+        raise
+    if response.status_code != 200 or (is_blocked is not None and is_blocked(response)):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+def get_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+
+def _collect_metrics():
+    breakers = list(_breakers.values())
+    yield ("fakecheck_circuit_state", "gauge", "Provider circuit state (0 closed, 1 half-open, 2 open)",
+           [({"provider": b.name}, _STATE_VALUES[b.state]) for b in breakers])
+    yield ("fakecheck_circuit_trips_total", "counter", "Times a provider circuit opened",
+           [({"provider": b.name}, b.trips) for b in breakers])
+    yield ("fakecheck_circuit_rejected_total", "counter", "Provider calls skipped by an open circuit",
+           [({"provider": b.name}, b.rejected) for b in breakers])
+
+
+register_collector(_collect_metrics)
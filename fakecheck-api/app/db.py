@@ -0,0 +1,191 @@
+"""
+Async MongoDB access (optional, enabled by MONGO_URI).
+
+One AsyncMongoClient connection pool is created at startup. A background
+monitor pings the server and keeps a health state: after a failed ping or
+operation Mongo is treated as down and get_db() returns None at once, so
+requests fall back immediately instead of each waiting out the server
+selection timeout; the monitor retries with exponential backoff
+(MONGO_RETRY_SECONDS doubling up to MONGO_RETRY_MAX_SECONDS). Indexes of
+all collections are created the first time the server is reached.
+"""
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, AsyncMongoClient
+from pymongo.errors import PyMongoError
+
+from app.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "securenest")
+MONGO_MAX_POOL_SIZE = int(_env_float("MONGO_MAX_POOL_SIZE", 50))
+# Server selection / connect timeout of each operation
+MONGO_TIMEOUT_MS = int(_env_float("MONGO_TIMEOUT_MS", 1000))
+MONGO_RETRY_SECONDS = _env_float("MONGO_RETRY_SECONDS", 5)
+MONGO_RETRY_MAX_SECONDS = _env_float("MONGO_RETRY_MAX_SECONDS", 300)
+# Ping interval while healthy
+MONGO_HEALTH_INTERVAL = _env_float("MONGO_HEALTH_INTERVAL", 30)
+
+# collection -> [(keys, options)], created once the server is reachable
+INDEXES: Dict[str, List[Tuple[List[Tuple[str, int]], Dict[str, Any]]]] = {
+    "sources": [
+        ([("domain", ASCENDING)], {"unique": True}),
+        ([("country_code", ASCENDING)], {}),
+        ([("regions", ASCENDING)], {}),
+    ],
+    # Durable prediction tier (app.prediction_store): per-document expiry, warm-start orderings
+    "predictions": [
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+        ([("hits", DESCENDING)], {}),
+        ([("created_at", DESCENDING)], {}),
+    ],
+}
+
+
+class MongoHealth:
+    """Up/down state with exponential backoff between reconnection attempts."""
+
+    def __init__(self, retry_seconds: float = MONGO_RETRY_SECONDS, retry_max_seconds: float = MONGO_RETRY_MAX_SECONDS):
+        self.retry_seconds = retry_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.healthy = False
+        self.failures = 0
+        self.down_until = 0.0
+        self.last_error: Optional[str] = None
+
+    def mark_up(self):
+        if not self.healthy:
+            logger.info("MongoDB reachable")
+        self.healthy = True
+        self.failures = 0
+        self.last_error = None
+
+    def mark_down(self, error: Exception):
+        self.failures += 1
+        delay = min(self.retry_seconds * 2 ** (self.failures - 1), self.retry_max_seconds)
+        self.down_until = time.monotonic() + delay
+        self.last_error = str(error)
+        if self.healthy or self.failures == 1:
+            logger.warning("MongoDB unavailable, retrying in %.0fs: %s", delay, error)
+        self.healthy = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.down_until - time.monotonic())
+
+
+_client: Optional[AsyncMongoClient] = None
+_health = MongoHealth()
+_monitor: Optional[asyncio.Task] = None
+_indexes_ready = False
+
+
+def get_db():
+    """The application database if Mongo is configured and healthy, else None (never blocks)."""
+    if _client is None or not _health.healthy:
+        return None
+    return _client[MONGO_DB_NAME]
+
+
+def report_mongo_failure(error: Exception):
+    """Called by users of get_db() when an operation fails; bypasses Mongo until the next successful ping."""
+    if _client is not None:
+        _health.mark_down(error)
+
+
+async def ensure_indexes(db) -> None:
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                await db[collection].create_index(keys, **options)
+            except PyMongoError as e:
+                # e.g. duplicate domains blocking the unique index: keep serving, fix the data
+                logger.warning("Could not create index %s on %s: %s", keys, collection, e)
+
+
+async def _check() -> bool:
+    global _indexes_ready
+    try:
+        await _client.admin.command("ping")
+    except PyMongoError as e:
+        _health.mark_down(e)
+        return False
+    _health.mark_up()
+    if not _indexes_ready:
+        await ensure_indexes(_client[MONGO_DB_NAME])
+        _indexes_ready = True
+    return True
+
+
+async def _monitor_loop():
+    while True:
+        await _check()
+        next_ping = time.monotonic() + MONGO_HEALTH_INTERVAL
+        # Stop waiting when an operation reports a failure, so the retry follows the backoff
+        while _health.healthy and time.monotonic() < next_ping:
+            await asyncio.sleep(1)
+        if not _health.healthy:
+            await asyncio.sleep(_health.retry_in())
+
+
+async def start_mongo() -> None:
+    """Create the connection pool and start the health monitor (no-op without MONGO_URI)."""
+    global _client, _monitor, _health, _indexes_ready
+    uri = os.getenv("MONGO_URI")
+    if not uri or _client is not None:
+        return
+    _client = AsyncMongoClient(
+        uri,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+        connectTimeoutMS=MONGO_TIMEOUT_MS,
+        appname="fakecheck-api",
+    )
+    _health = MongoHealth()
+    _indexes_ready = False
+    # The first ping also runs in the monitor task: startup doesn't wait on an unreachable server
+    _monitor = asyncio.create_task(_monitor_loop())
+
+
+async def stop_mongo() -> None:
+    global _client, _monitor
+    if _monitor is not None:
+        _monitor.cancel()
+        await asyncio.gather(_monitor, return_exceptions=True)
+        _monitor = None
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def get_mongo_stats() -> Dict[str, Any]:
+    if _client is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "healthy": _health.healthy,
+        "failures": _health.failures,
+        "retry_in": round(_health.retry_in(), 1),
+        "last_error": _health.last_error,
+    }
+
+
+def _collect_metrics():
+    if _client is not None:
+        yield ("fakecheck_mongo_up", "gauge", "Whether MongoDB is reachable (1) or bypassed (0)",
+               [({}, 1 if _health.healthy else 0)])
+
+
+register_collector(_collect_metrics)
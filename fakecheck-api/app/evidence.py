@@ -0,0 +1,135 @@
+"""
+Evidence gathering: concurrent provider fan-out with a single deadline.
+"""
+import os
+import logging
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from app.http_client import get_http_client
+from app.metrics import PROVIDER_REQUESTS, PROVIDER_RESULTS, stage
+from app.retrieval import query_claimreview, query_newsapi, query_gdelt, search_web_fallback, search_wikipedia
+
+logger = logging.getLogger(__name__)
+
+try:
+    EVIDENCE_DEADLINE_SECONDS = float(os.getenv("EVIDENCE_DEADLINE_SECONDS", "12"))
+except ValueError:
+    EVIDENCE_DEADLINE_SECONDS = 12.0
+
+# Providers queried unconditionally; the fallbacks below are gated on their result counts
+CORE_PROVIDERS = ("claimreview", "newsapi", "gdelt")
+# Web fallback runs only when the core providers return fewer than this many results
+WEB_FALLBACK_THRESHOLD = 3
+# Wikipedia runs only when core + web return fewer than this many results
+WIKIPEDIA_THRESHOLD = 2
+
+PROVIDERS = CORE_PROVIDERS + ("web", "wikipedia")
+
+
+async def _timed(name: str, coro) -> List[Dict]:
+    """Run one provider call as the provider_<name> stage and count its outcome."""
+    outcome = "error"
+    try:
+        with stage(f"provider_{name}"):
+            results = await coro
+        outcome = "ok" if results else "empty"
+        PROVIDER_RESULTS.inc(len(results or []), provider=name)
+        return results
+    except asyncio.CancelledError:
+        outcome = "timeout"
+        raise
+    finally:
+        PROVIDER_REQUESTS.inc(provider=name, outcome=outcome)
+
+
+async def gather_evidence(query: str, country: Optional[str], scope: str = "national",
+                          deadline: Optional[float] = None, client: Optional[httpx.AsyncClient] = None,
+                          on_result: Optional[Callable[[str, List[Dict]], None]] = None) -> Dict:
+    """
+    Query all evidence providers concurrently under one overall deadline.
+
+    The core providers start immediately. The web fallback starts as soon as the
+    core results are known to be scarce (or is skipped as soon as they are known
+    to be sufficient), and Wikipedia likewise once core + web counts are known.
+    Providers still running at the deadline are cancelled and reported in
+    ``timed_out``. ``on_result(provider, results)`` is called as each provider
+    finishes (used by /predict/stream).
+
+    Returns {"results": {provider: [..]}, "timed_out": [provider, ..]}.
+    """
+    loop = asyncio.get_running_loop()
+    client = client or get_http_client()
+    deadline_at = loop.time() + (EVIDENCE_DEADLINE_SECONDS if deadline is None else deadline)
+
+    results: Dict[str, List[Dict]] = {name: [] for name in PROVIDERS}
+    tasks: Dict[asyncio.Task, str] = {}
+    completed = set()
+
+    def start(name: str, coro) -> asyncio.Task:
+        task = asyncio.create_task(_timed(name, coro))
+        tasks[task] = name
+        return task
+
+    start("claimreview", query_claimreview(query, os.getenv("GOOGLE_FACTCHECK_API_KEY"), client=client))
+    start("newsapi", query_newsapi(query, country, os.getenv("NEWSAPI_KEY"), client=client))
+    start("gdelt", query_gdelt(query, country, client=client))
+
+    web_decided = False
+    wiki_decided = False
+    pending = set(tasks)
+
+    try:
+        while pending:
+            timeout = deadline_at - loop.time()
+            if timeout <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+
+            for task in done:
+                name = tasks[task]
+                completed.add(name)
+                try:
+                    results[name] = task.result() or []
+                except Exception as e:
+                    logger.warning("%s provider error: %s", name, e)
+                    results[name] = []
+                if on_result is not None:
+                    on_result(name, results[name])
+
+            core_count = sum(len(results[name]) for name in CORE_PROVIDERS)
+            core_done = all(name in completed for name in CORE_PROVIDERS)
+
+            # Only trigger the web fallback when high-quality sources are scarce
+            if not web_decided:
+                if core_count >= WEB_FALLBACK_THRESHOLD:
+                    web_decided = True
+                elif core_done:
+                    web_decided = True
+                    pending.add(start("web", search_web_fallback(query, country, scope, client=client)))
+
+            # Wikipedia for historical events when very few sources were found
+            if not wiki_decided:
+                if core_count >= WIKIPEDIA_THRESHOLD:
+                    wiki_decided = True
+                elif "web" in completed:
+                    wiki_decided = True
+                    if core_count + len(results["web"]) < WIKIPEDIA_THRESHOLD:
+                        pending.add(start("wikipedia", search_wikipedia(query, client=client)))
+    finally:
+        # Cancel whatever is still running (deadline hit or caller cancelled)
+        leftover = [task for task in tasks if not task.done()]
+        for task in leftover:
+            task.cancel()
+        if leftover:
+            await asyncio.gather(*leftover, return_exceptions=True)
+
+    timed_out = [tasks[task] for task in leftover]
+    if timed_out:
+        logger.warning("Evidence deadline reached; cancelled providers: %s", timed_out)
+
+    return {"results": results, "timed_out": timed_out}
@@ -0,0 +1,151 @@
+"""
+Shared pooled HTTP client for all retrieval providers.
+
+One httpx.AsyncClient is created in the FastAPI lifespan and reused by every
+provider call, so connections (DNS, TCP, TLS) to newsapi.org, gdeltproject.org,
+duckduckgo, bing and wikipedia are kept alive between requests.
+"""
+import os
+import logging
+import asyncio
+import weakref
+from typing import Dict, Optional, Set
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+HTTP_MAX_CONNECTIONS = _env_int("HTTP_MAX_CONNECTIONS", 100)
+HTTP_MAX_KEEPALIVE = _env_int("HTTP_MAX_KEEPALIVE", 40)
+HTTP_KEEPALIVE_EXPIRY = _env_float("HTTP_KEEPALIVE_EXPIRY", 60.0)
+HTTP_MAX_PER_HOST = _env_int("HTTP_MAX_PER_HOST", 10)
+HTTP_CONNECT_TIMEOUT = _env_float("HTTP_CONNECT_TIMEOUT", 3.0)
+HTTP_READ_TIMEOUT = _env_float("HTTP_READ_TIMEOUT", 10.0)
+HTTP_POOL_TIMEOUT = _env_float("HTTP_POOL_TIMEOUT", 2.0)
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Caps concurrent in-flight requests per host on top of the global pool limits."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def host_semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+        return sem
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with self.host_semaphore(request.url.host):
+            return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("HTTP2_ENABLED is set but the 'h2' package is missing; falling back to HTTP/1.1")
+        return False
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build the pooled client (keep-alive, per-host limits, optional HTTP/2, tuned timeouts)."""
+    http2 = _http2_available()
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    transport = HostLimitedTransport(
+        httpx.AsyncHTTPTransport(limits=limits, http2=http2, retries=1),
+        max_per_host=HTTP_MAX_PER_HOST,
+    )
+    timeout = httpx.Timeout(
+        HTTP_READ_TIMEOUT,
+        connect=HTTP_CONNECT_TIMEOUT,
+        pool=HTTP_POOL_TIMEOUT,
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=timeout,
+    )
+
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+# Clients created outside the lifespan, one per event loop
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_closers: Set[asyncio.Task] = set()
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client for the running event loop (called from the app lifespan)."""
+    global _client, _client_loop
+    if _client is None:
+        _client = create_http_client()
+        _client_loop = asyncio.get_running_loop()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+async def _close_with_loop(client: httpx.AsyncClient) -> None:
+    # asyncio.run (and the anyio portal of TestClient) cancel leftover tasks before closing the
+    # loop, which is the last point at which the client's connections can still be closed
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await client.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client. When called outside the lifespan (scripts, tests)
+    or from a different event loop, a client bound to the current loop is created
+    lazily, since pooled connections cannot be shared across loops; it is reused
+    for that loop and closed when the loop shuts down.
+    """
+    loop = asyncio.get_running_loop()
+    if _client is not None and _client_loop is loop and not _client.is_closed:
+        return _client
+    client = _loop_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _loop_clients[loop] = create_http_client()
+        closer = loop.create_task(_close_with_loop(client))
+        _closers.add(closer)
+        closer.add_done_callback(_closers.discard)
+    return client
@@ -0,0 +1,133 @@
+"""
+Local NLI inference server.
+
+One process owns the stance model and serves the API workers over a Unix
+domain socket, so the model (1.5 GB+ for bart-large-mnli) is loaded once per
+node and inference never blocks a worker's event loop. Requests from all
+workers are micro-batched together and memoized as in-process inference is.
+
+    python -m app.inference_server --socket /tmp/fakecheck-nli.sock
+    NLI_SERVER_SOCKET=/tmp/fakecheck-nli.sock uvicorn app.main:app --workers 8
+
+Protocol: one JSON object per line. Request {"id": n, "pairs": [[premise, claim], ...]},
+response {"id": n, "results": [[stance, score], ...]} or {"id": n, "error": "..."}.
+Responses on one connection may come back out of order.
+"""
+import os
+import logging
+import json
+import signal
+import asyncio
+import argparse
+from typing import Optional
+
+from app import nli_model
+from app.logging_config import setup_logging, shutdown_logging
+from app.nli_model import NLI_SERVER_MAX_MESSAGE, StanceBatcher, classify_stances, get_inference_executor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = os.getenv("NLI_SERVER_SOCKET") or "/tmp/fakecheck-nli.sock"
+
+
+class InferenceServer:
+    """Serves classify_stances over a Unix socket, batching across all connections."""
+
+    def __init__(self, path: str, batcher: Optional[StanceBatcher] = None):
+        self.path = path
+        # Always in-process inference here, whatever NLI_SERVER_SOCKET says
+        self.batcher = batcher or StanceBatcher(classify=classify_stances)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.connections = 0
+        self.requests = 0
+
+    async def start(self):
+        if os.path.exists(self.path):
+            # Stale socket left by a previous run
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path, limit=NLI_SERVER_MAX_MESSAGE)
+        os.chmod(self.path, 0o660)
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # Pipelined: every request is answered as soon as its batch is done
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, ValueError) as e:
+            logger.warning("Inference client connection error: %s", e)
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            self.connections -= 1
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        request_id = None
+        try:
+            message = json.loads(line)
+            request_id = message.get("id")
+            results = await asyncio.gather(*(self.batcher.classify(p, h) for p, h in message["pairs"]))
+            reply = {"id": request_id, "results": [[stance, score] for stance, score in results]}
+        except Exception as e:
+            reply = {"id": request_id, "error": str(e)}
+        self.requests += 1
+        writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(path: str = DEFAULT_SOCKET):
+    # Load the model before accepting connections, so workers never see a cold server
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_inference_executor(), nli_model.get_nli_pipeline)
+    server = InferenceServer(path)
+    await server.start()
+    logger.info("NLI inference server (%s) listening on %s", nli_model.get_nli_model_id(), path)
+    serving = asyncio.ensure_future(server.serve_forever())
+    try:
+        loop.add_signal_handler(signal.SIGTERM, serving.cancel)
+    except NotImplementedError:
+        pass
+    try:
+        await serving
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve NLI stance inference over a Unix socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    args = parser.parse_args()
+    setup_logging()
+    try:
+        asyncio.run(serve(args.socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
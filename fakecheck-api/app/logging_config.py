@@ -0,0 +1,147 @@
+"""
+Logging: structured JSON lines written off the event loop.
+
+Records go through a QueueHandler to a QueueListener thread that encodes and
+writes them, so a log call on the request path is an in-memory enqueue (and
+is dropped, not blocked on, if the queue is full). Every record carries the id
+of the request it was logged for. Per-item traces (per source, per provider
+result, per stance) go through sampled_debug: DEBUG level, and only for the
+LOG_SAMPLE_RATE fraction of requests, which then keep all of their traces.
+"""
+import os
+import sys
+import copy
+import json
+import uuid
+import queue
+import random
+import logging
+import contextvars
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" (one object per line) or "text"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+try:
+    LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+except ValueError:
+    LOG_SAMPLE_RATE = 0.01
+try:
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+except ValueError:
+    LOG_QUEUE_SIZE = 10000
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+_sampled_var: contextvars.ContextVar[Optional[bool]] = contextvars.ContextVar("log_sampled", default=None)
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the current request id (runs on the logging thread of the caller)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", None),
+            "msg": record.getMessage(),
+        }
+        payload.update({k: v for k, v in record.__dict__.items() if k not in _RECORD_ATTRS})
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller: records are dropped when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback here (args and exc_info don't survive the
+        # thread hop safely); JSON encoding and I/O happen on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[NonBlockingQueueHandler] = None
+
+
+def setup_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    """Route the app.* loggers through the queue to stdout. Idempotent."""
+    global _listener, _handler
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stdout)
+    if fmt == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+    _handler = NonBlockingQueueHandler(log_queue)
+    _handler.addFilter(RequestContextFilter())
+    app_logger = logging.getLogger("app")
+    app_logger.handlers = [_handler]
+    app_logger.setLevel(level)
+    app_logger.propagate = False
+    _listener = QueueListener(log_queue, stream)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and detach the handler."""
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger("app").removeHandler(_handler)
+        logging.getLogger("app").propagate = True
+        _handler = None
+
+
+def start_request(request_id: Optional[str] = None) -> str:
+    """Bind a request id (and the debug sampling decision) to the current context."""
+    request_id = request_id or uuid.uuid4().hex[:16]
+    request_id_var.set(request_id)
+    _sampled_var.set(random.random() < LOG_SAMPLE_RATE)
+    return request_id
+
+
+def debug_sampled() -> bool:
+    sampled = _sampled_var.get()
+    # Outside a request (e.g. the inference thread) sample per call
+    return random.random() < LOG_SAMPLE_RATE if sampled is None else sampled
+
+
+def sampled_debug(logger: logging.Logger, msg: str, *args, **fields):
+    """DEBUG record for per-item traces, emitted only for sampled requests."""
+    if logger.isEnabledFor(logging.DEBUG) and debug_sampled():
+        logger.debug(msg, *args, extra=fields or None)
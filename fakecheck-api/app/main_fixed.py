@@ -120,7 +120,7 @@ async def predict(payload: PredictRequest, x_internal_api_key: Optional[str] = H
 
         # Check cache
         ck = cache_key(payload.url, payload.text, payload.country or "GLOBAL", payload.state)
-        cached = get_cached_prediction(ck)
+        cached = await get_cached_prediction(ck)
         if cached:
             return PredictResponse(**cached)
 
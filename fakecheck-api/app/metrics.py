@@ -0,0 +1,202 @@
+"""
+Metrics: stage timers, histograms and counters in Prometheus text format.
+
+Request-path stages (article fetch, claim extraction, each evidence provider,
+scoring, body verification, NLI) are timed with ``stage(name)``; every timing
+feeds the fakecheck_stage_seconds histogram and, inside a request, that
+request's breakdown for the optional Server-Timing header. Modules that
+already keep their own counters (caches, NLI batcher) expose them through
+``register_collector`` and are read at scrape time.
+"""
+import os
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Add a Server-Timing header with the per-stage breakdown to every response
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+
+# Prometheus client defaults, extended up to the /predict budget
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0)
+
+Labels = Dict[str, str]
+# (name, type, help, [(labels, value), ...])
+Family = Tuple[str, str, str, List[Tuple[Labels, float]]]
+
+_timings_var: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("stage_timings", default=None)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels[n]) for n in self.labelnames), 0)
+
+    def collect(self) -> Iterable[Family]:
+        with self._lock:
+            samples = [(dict(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+        yield self.name, "counter", self.documentation, samples
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> [per-bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(str(labels[n]) for n in self.labelnames))
+        return series[-1] if series else 0
+
+    def collect(self) -> Iterable[Family]:
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        samples = []
+        for key, series in snapshot.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, series[-2]))
+            samples.append((f"{self.name}_count", labels, series[-1]))
+        yield self.name, "histogram", self.documentation, samples
+
+
+_metrics: List = []
+_collectors: List[Callable[[], Iterable[Family]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[Family]]):
+    """Register a callable read at scrape time; it yields (name, type, help, [(labels, value)])."""
+    _collectors.append(collector)
+
+
+def stats_families(prefix: str, stats: Dict, counters: Sequence[str] = (), gauges: Sequence[str] = (),
+                   labels: Optional[Labels] = None, documentation: str = "") -> Iterable[Family]:
+    """Families for the numeric fields of a stats dict (as returned by the get_*_stats functions)."""
+    labels = labels or {}
+    for field in counters:
+        if field in stats:
+            yield f"{prefix}_{field}_total", "counter", documentation, [(labels, stats[field])]
+    for field in gauges:
+        if field in stats:
+            yield f"{prefix}_{field}", "gauge", documentation, [(labels, stats[field])]
+
+
+def render() -> str:
+    """Everything in Prometheus text exposition format (version 0.0.4)."""
+    families: Dict[str, List] = {}
+    for source in [m.collect for m in _metrics] + _collectors:
+        try:
+            collected = list(source())
+        except Exception:
+            # A broken collector must not take the whole scrape down
+            continue
+        for name, kind, documentation, samples in collected:
+            family = families.setdefault(name, [kind, documentation, []])
+            family[2].extend(samples)
+
+    lines = []
+    for name, (kind, documentation, samples) in families.items():
+        if documentation:
+            lines.append(f"# HELP {name} {_escape(documentation)}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample in samples:
+            sample_name, labels, value = sample if len(sample) == 3 else (name, *sample)
+            lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+STAGE_SECONDS = Histogram("fakecheck_stage_seconds", "Duration of /predict stages", ("stage",))
+REQUEST_SECONDS = Histogram("fakecheck_http_request_seconds", "HTTP request latency", ("method", "path", "status"))
+PROVIDER_REQUESTS = Counter("fakecheck_provider_requests_total", "Evidence provider calls by outcome", ("provider", "outcome"))
+PROVIDER_RESULTS = Counter("fakecheck_provider_results_total", "Sources returned by evidence providers", ("provider",))
+
+
+def start_timing() -> Dict[str, float]:
+    """Start collecting stage timings for the current request (read back for Server-Timing)."""
+    timings: Dict[str, float] = {}
+    _timings_var.set(timings)
+    return timings
+
+
+def record_stage(name: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, stage=name)
+    timings = _timings_var.get()
+    if timings is not None:
+        # Repeated or concurrent runs of a stage within one request add up
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block (sync or async code alike) with the monotonic clock."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def server_timing_header(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
@@ -0,0 +1,217 @@
+"""
+Near-duplicate claim index.
+
+Forwarded misinformation arrives in many small variants (emoji, punctuation,
+"BREAKING:" prefixes, a changed number) that all miss the exact prediction
+cache key. Recent verdicts are indexed by the shingles of the normalized
+claim (word unigrams and bigrams, non-year numbers masked) with MinHash LSH:
+a 64-value signature split into 16 bands of 4, so claims whose shingle sets
+are similar share a band and are found by a few dict lookups instead of a
+scan. Candidates are then checked by exact Jaccard similarity. Negation and
+polarity words ("not", "never", "fake", "denies", ...) must match exactly:
+they are part of the bucket keys, so "X has not announced Y" never reuses the
+verdict of "X has announced Y". /predict consults the index with the main
+extracted claim after claim extraction, before the provider fan-out, and
+indexes that same claim with the verdict it computed.
+"""
+import os
+import re
+import time
+import random
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.metrics import register_collector, stats_families
+
+NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "true").lower() == "true"
+try:
+    # Jaccard similarity of the claims' shingle sets needed to reuse a verdict
+    NEAR_DUP_MIN_SIMILARITY = float(os.getenv("NEAR_DUP_MIN_SIMILARITY", "0.9"))
+except ValueError:
+    NEAR_DUP_MIN_SIMILARITY = 0.9
+try:
+    # Served verdicts' confidence is multiplied by this (1.0 keeps it)
+    NEAR_DUP_CONFIDENCE_FACTOR = float(os.getenv("NEAR_DUP_CONFIDENCE_FACTOR", "0.9"))
+except ValueError:
+    NEAR_DUP_CONFIDENCE_FACTOR = 0.9
+try:
+    NEAR_DUP_MAX_ENTRIES = int(os.getenv("NEAR_DUP_MAX_ENTRIES", "10000"))
+except ValueError:
+    NEAR_DUP_MAX_ENTRIES = 10000
+try:
+    NEAR_DUP_TTL = float(os.getenv("NEAR_DUP_TTL", "3600"))
+except ValueError:
+    NEAR_DUP_TTL = 3600.0
+# Claims with fewer tokens (after normalization) are too generic to match approximately
+NEAR_DUP_MIN_TOKENS = 5
+
+# 16 bands x 4 rows: pairs at Jaccard 0.9 collide in some band with p > 0.9999, at 0.3 with p ~ 0.12
+LSH_BANDS = 16
+LSH_ROWS = 4
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(LSH_BANDS * LSH_ROWS)]
+
+_FILLER = {"breaking", "fwd", "forwarded", "viral", "urgent", "alert", "exclusive", "news"}
+# Words that flip or qualify a claim; the set present in a claim must match exactly
+_POLARITY = {
+    "not", "no", "never", "nor", "neither", "none", "nobody", "nothing", "cannot", "without",
+    "fake", "false", "untrue", "hoax", "myth", "rumour", "rumor", "misleading",
+    "deny", "denies", "denied", "refute", "refutes", "refuted", "debunk", "debunks", "debunked",
+}
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+# 1,00,000 / 5,000 / 5.000 -> 100000 / 5000 / 5000
+_DIGIT_GROUP_RE = re.compile(r"(?<=\d)[,.](?=\d{2,3}\b)")
+_TOKEN_RE = re.compile(r"\w+")
+# isn't / don't / won't -> is not / do not / wo not
+_NEGATED_CONTRACTION_RE = re.compile(r"n['\u2019]t\b")
+_YEAR_RE = re.compile(r"(19|20)\d\d")
+
+
+def normalize(text: str) -> List[str]:
+    """Tokens of a claim with case, emoji, punctuation, URLs and filler words removed."""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = _URL_RE.sub(" ", text)
+    text = _DIGIT_GROUP_RE.sub("", text)
+    text = _NEGATED_CONTRACTION_RE.sub(" not", text)
+    return [t for t in _TOKEN_RE.findall(text) if t.strip("_") and t not in _FILLER]
+
+
+def shingles(tokens: List[str]) -> FrozenSet[str]:
+    """Unigrams and bigrams; numbers other than years are masked, so a changed amount or date still matches."""
+    shapes = ["#" if t.isdigit() and not _YEAR_RE.fullmatch(t) else t for t in tokens]
+    return frozenset(shapes) | frozenset(f"{a} {b}" for a, b in zip(shapes, shapes[1:]))
+
+
+def minhash(features: FrozenSet[str]) -> Tuple[int, ...]:
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big") for f in features]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class NearDuplicateIndex:
+    """
+    Bounded, TTL'd map of claims to verdicts with MinHash LSH lookup.
+    Entries are separated by namespace (country/state/scope), since the same
+    claim can get a different verdict in a different scope.
+    """
+
+    def __init__(self, min_similarity: float = NEAR_DUP_MIN_SIMILARITY, max_entries: int = NEAR_DUP_MAX_ENTRIES,
+                 ttl: float = NEAR_DUP_TTL):
+        self.min_similarity = min_similarity
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # entry id -> (band keys, shingles, value, expires_at)
+        self._entries: "OrderedDict[int, Tuple[List[tuple], FrozenSet[str], Any, float]]" = OrderedDict()
+        self._buckets: Dict[tuple, Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _signature(claim: str, namespace: str) -> Optional[Tuple[FrozenSet[str], List[tuple]]]:
+        tokens = normalize(claim)
+        if len(tokens) < NEAR_DUP_MIN_TOKENS:
+            return None
+        features = shingles(tokens)
+        signature = minhash(features)
+        polarity = tuple(sorted(set(tokens) & _POLARITY))
+        keys = [(namespace, polarity, band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]) for band in range(LSH_BANDS)]
+        return features, keys
+
+    def _remove(self, entry_id: int):
+        keys, _, _, _ = self._entries.pop(entry_id)
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def add(self, claim: str, namespace: str, value: Any):
+        signed = self._signature(claim, namespace)
+        if signed is None:
+            return
+        features, keys = signed
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (keys, features, value, time.monotonic() + self.ttl)
+            for key in keys:
+                self._buckets.setdefault(key, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def lookup(self, claim: str, namespace: str) -> Optional[Tuple[Any, float]]:
+        """(value, similarity) of the most similar live entry at or above min_similarity."""
+        signed = self._signature(claim, namespace)
+        if signed is None:
+            return None
+        features, keys = signed
+        now = time.monotonic()
+        best: Optional[Tuple[Any, float]] = None
+        with self._lock:
+            candidates = set()
+            for key in keys:
+                candidates.update(self._buckets.get(key, ()))
+            for entry_id in candidates:
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                _, other, value, expires_at = entry
+                if now >= expires_at:
+                    self._remove(entry_id)
+                    continue
+                score = jaccard(features, other)
+                if score >= self.min_similarity and (best is None or score > best[1]):
+                    best = (value, score)
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return best
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "min_similarity": self.min_similarity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+_index = NearDuplicateIndex()
+
+
+def get_near_dup_index() -> NearDuplicateIndex:
+    return _index
+
+
+def claim_namespace(country: Optional[str], state: Optional[str], scope: str) -> str:
+    return f"{(country or 'GLOBAL').upper()}|{(state or '').lower()}|{scope}"
+
+
+def _collect_metrics():
+    yield from stats_families("fakecheck_cache", _index.stats(), counters=("hits", "misses", "evictions"),
+                              gauges=("entries",), labels={"cache": "near_duplicates"},
+                              documentation="Prediction and stance cache statistics")
+
+
+register_collector(_collect_metrics)
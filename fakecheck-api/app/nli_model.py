@@ -4,11 +4,101 @@ Default: roberta-large-mnli (or lighter alternative for CPU).
 """
 import os
 import re
-from typing import Literal, Optional, Tuple
+import json
+import asyncio
+import hashlib
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
 from transformers import pipeline
 
+from app.cache import LRUCache
+from app.patterns import PhraseMatcher, RuleMatcher
+from app.logging_config import sampled_debug
+from app.metrics import register_collector, stage, stats_families
+
+logger = logging.getLogger(__name__)
+
+Stance = Literal["supports", "refutes", "neutral"]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+# Micro-batching: concurrent stance requests are collected for up to
+# NLI_MAX_WAIT_MS (or until NLI_MAX_BATCH are queued) and run as one padded batch
+NLI_MAX_BATCH = max(1, _env_int("NLI_MAX_BATCH", 16))
+try:
+    NLI_MAX_WAIT_MS = max(0.0, float(os.getenv("NLI_MAX_WAIT_MS", "5")))
+except ValueError:
+    NLI_MAX_WAIT_MS = 5.0
+
+# Inference backend: "transformers" (PyTorch pipeline) or "onnx" (int8 ONNX Runtime, see app/nli_onnx.py)
+NLI_BACKEND = os.getenv("NLI_BACKEND", "transformers").lower()
+
+# Stance memo: (premise, hypothesis, model) -> (stance, score), so the same trusted
+# article checked against the same claim is only run through the model once
+NLI_CACHE_MAX_ENTRIES = _env_int("NLI_CACHE_MAX_ENTRIES", 20000)
+
+# Passage selection: only the top-k sentence windows that best match the claim's
+# key words, within an approximate token budget, are sent to the model
+NLI_PASSAGE_TOP_K = max(1, _env_int("NLI_PASSAGE_TOP_K", 3))
+NLI_PASSAGE_WINDOW = max(1, _env_int("NLI_PASSAGE_WINDOW", 2))
+NLI_PASSAGE_TOKEN_BUDGET = max(16, _env_int("NLI_PASSAGE_TOKEN_BUDGET", 256))
+
+# Out-of-process inference: when set, stance requests go to app.inference_server
+# over this Unix socket and the worker never loads the model itself
+NLI_SERVER_SOCKET = os.getenv("NLI_SERVER_SOCKET")
+try:
+    NLI_SERVER_TIMEOUT = float(os.getenv("NLI_SERVER_TIMEOUT", "30"))
+except ValueError:
+    NLI_SERVER_TIMEOUT = 30.0
+# Largest request/response line on the socket (article passages included)
+NLI_SERVER_MAX_MESSAGE = 16 * 1024 * 1024
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r"\w+")
 
 _nli_pipeline = None
+_passage_stats = {"premises": 0, "premise_tokens": 0, "selected_tokens": 0}
+_stance_memo = LRUCache(max_entries=NLI_CACHE_MAX_ENTRIES, sizeof=lambda value: 0)
+_inference_executor: Optional[ThreadPoolExecutor] = None
+
+# Suspicious/fake news indicators
+NEG_CUES = [
+    "false", "fake", "hoax", "rumor", "not true", "no plans",
+    "denied", "debunked", "misleading", "refuted", "fact-check: false",
+    "no evidence", "unverified", "fabricated", "misinformation"
+]
+
+# Suspicious claims patterns (unusual/extraordinary claims)
+SUSPICIOUS_PATTERNS = [
+    "painted gold", "paint gold", "to be painted", "will be painted",
+    "second sun", "two suns", "aliens", "ufo landing", "miracle cure",
+    "secret government", "conspiracy", "shocking discovery"
+]
+
+# Real news indicators
+POS_CUES = [
+    "announced", "confirmed", "will require", "mandatory", "official",
+    "govt", "ministry", "press release", "notification", "railways", "irctc",
+    "according to", "statement", "spokesperson", "minister said"
+]
+
+# Heuristic cue tables compiled once; one pass per premise / hypothesis
+_PREMISE_CUES = RuleMatcher({"neg": NEG_CUES, "pos": POS_CUES})
+_SUSPICIOUS_CLAIMS = PhraseMatcher(SUSPICIOUS_PATTERNS)
+
+
+def get_nli_model_id() -> str:
+    """Identifies the configured model; stance memo entries are keyed by it."""
+    return f"{NLI_BACKEND}:{os.getenv('NLI_MODEL', 'facebook/bart-large-mnli')}"
 
 
 def get_nli_pipeline():
@@ -23,9 +113,14 @@ def get_nli_pipeline():
             raise NotImplementedError("HF endpoint not yet implemented")
 
         try:
-            _nli_pipeline = pipeline("zero-shot-classification", model=model_name, device=-1)
+            if NLI_BACKEND == "onnx":
+                from app.nli_onnx import load_onnx_pipeline
+                _nli_pipeline = load_onnx_pipeline(model_name)
+            else:
+                # Scores (premise, hypothesis) pairs: entailment / neutral / contradiction
+                _nli_pipeline = pipeline("text-classification", model=model_name, device=-1)
         except Exception as e:
-            print(f"NLI pipeline load failed, using heuristic fallback: {e}")
+            logger.warning("NLI pipeline load failed, using heuristic fallback: %s", e)
             _nli_pipeline = None
 
     return _nli_pipeline
@@ -84,99 +179,473 @@ def extract_key_words(text: str) -> list[str]:
     return key_words[:15]  # Limit to top 15 words
 
 
+def get_inference_executor() -> ThreadPoolExecutor:
+    """Single worker thread that owns model calls, kept off the event loop."""
+    global _inference_executor
+    if _inference_executor is None:
+        _inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nli-inference")
+    return _inference_executor
+
+
+def _approx_tokens(text: str) -> int:
+    """Word and punctuation count; a lower bound on the model's subword tokens."""
+    return len(_TOKEN.findall(text))
+
+
+def select_passages(premise: str, hypothesis: str, top_k: int = NLI_PASSAGE_TOP_K,
+                    window: int = NLI_PASSAGE_WINDOW, token_budget: int = NLI_PASSAGE_TOKEN_BUDGET) -> str:
+    """
+    Cut the premise down to the passages relevant to the claim. The premise is
+    split into sentence windows, each scored by how many of the claim's key words
+    (extract_key_words) it contains; the best top_k windows that fit in
+    token_budget are returned in document order. Premises already within the
+    budget are returned unchanged.
+    """
+    if _approx_tokens(premise) <= token_budget:
+        return premise
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(premise) if s and s.strip()]
+    key_words = {w for phrase in extract_key_words(hypothesis) for w in _WORD.findall(phrase.lower())}
+    matched = [key_words.intersection(_WORD.findall(s.lower())) for s in sentences]
+    lengths = [_approx_tokens(s) for s in sentences]
+
+    windows = []
+    for start in range(max(1, len(sentences) - window + 1)):
+        span = range(start, min(start + window, len(sentences)))
+        score = len(set().union(*(matched[i] for i in span)))
+        windows.append((score, start, span))
+    # Best coverage first; earlier windows (leads, headlines) win ties
+    windows.sort(key=lambda w: (-w[0], w[1]))
+
+    chosen, used = set(), 0
+    for score, _, span in windows[:top_k]:
+        if score == 0 and chosen:
+            break
+        new = [i for i in span if i not in chosen]
+        cost = sum(lengths[i] for i in new)
+        if used + cost > token_budget:
+            # Keep the window's matching sentences that still fit, best first
+            for i in sorted(new, key=lambda i: -len(matched[i])):
+                if matched[i] and used + lengths[i] <= token_budget:
+                    chosen.add(i)
+                    used += lengths[i]
+            continue
+        chosen.update(new)
+        used += cost
+
+    if not chosen:
+        # A single sentence longer than the budget: leave truncation to the tokenizer
+        return sentences[windows[0][1]] if sentences else premise
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def _memo_key(model_id: str, premise: str, hypothesis: str) -> str:
+    premise_hash = hashlib.blake2b(premise.encode("utf-8"), digest_size=16).hexdigest()
+    hypothesis_hash = hashlib.blake2b(hypothesis.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{model_id}|{premise_hash}|{hypothesis_hash}"
+
+
+def _label_to_stance(label: str) -> Stance:
+    """MNLI class ("entailment", "CONTRADICTION", ...) -> stance of the premise toward the claim."""
+    label = label.lower()
+    if label.startswith("entail"):
+        return "supports"
+    if label.startswith("contradict"):
+        return "refutes"
+    return "neutral"
+
+
+def _heuristic_stance(premise: str, hypothesis: str, relevance_score: float) -> Tuple[Stance, float]:
+    """Cue-word fallback used when transformers/torch is unavailable."""
+    cues = _PREMISE_CUES.scan(premise.lower())
+    hypothesis_lower = hypothesis.lower()
+
+    # Check if the claim itself contains suspicious patterns
+    if _SUSPICIOUS_CLAIMS.search(hypothesis_lower):
+        # Suspicious claim - unless premise strongly supports it, mark as refutes
+        if not cues["pos"]:
+            final_score = 0.6 * relevance_score
+            sampled_debug(logger, "[classify_stance] Heuristic: suspicious claim detected, refutes, score=%.3f", final_score)
+            return "refutes", final_score
+
+    if cues["neg"]:
+        final_score = 0.7 * relevance_score
+        sampled_debug(logger, "[classify_stance] Heuristic: refutes, score=%.3f", final_score)
+        return "refutes", final_score
+    if cues["pos"]:
+        final_score = 0.6 * relevance_score
+        sampled_debug(logger, "[classify_stance] Heuristic: supports, score=%.3f", final_score)
+        return "supports", final_score
+
+    # If relevant but no cues, treat as neutral with moderate confidence
+    final_score = 0.5 * relevance_score
+    sampled_debug(logger, "[classify_stance] Heuristic: neutral (no cues), score=%.3f", final_score)
+    return "neutral", final_score
+
+
 def classify_stance(premise: str, hypothesis: str) -> tuple[Literal["supports", "refutes", "neutral"], float]:
     """
     Classify stance between premise (article text) and hypothesis (claim).
     Pipeline path: uses HF transformers if available, otherwise falls back to a
     heuristic based on relevance and cue words. Always returns a usable score.
     """
-    if not premise or not hypothesis:
-        return "neutral", 0.0
+    return classify_stances([(premise, hypothesis)])[0]
 
+
+def classify_stances(pairs: Sequence[Tuple[str, str]], allow_model: bool = True,
+                     use_memo: bool = True) -> List[Tuple[Stance, float]]:
+    """
+    Batch form of classify_stance over (premise, hypothesis) pairs, in order.
+    Pairs failing the relevance gate are neutral, stances already in the memo
+    are reused, and the remaining relevant premises go through the pipeline as
+    one padded batch. allow_model=False forces the heuristic fallback;
+    use_memo=False neither reads nor fills the memo (warm-up runs).
+    """
+    results: List[Tuple[Stance, float]] = [("neutral", 0.0)] * len(pairs)
     try:
         # Step 1: Relevance gate
-        is_relevant, relevance_score = check_relevance(premise, hypothesis)
-        
-        print(f"[classify_stance] Relevance check: is_relevant={is_relevant}, score={relevance_score:.3f}")
-        
-        if not is_relevant:
-            return "neutral", 0.0
-
-        # Step 2: Try transformers pipeline
-        pipe = get_nli_pipeline()
+        pending = []
+        for index, (premise, hypothesis) in enumerate(pairs):
+            if not premise or not hypothesis:
+                continue
+            is_relevant, relevance_score = check_relevance(premise, hypothesis)
+            sampled_debug(logger, "[classify_stance] Relevance check: is_relevant=%s, score=%.3f", is_relevant, relevance_score)
+            if is_relevant:
+                pending.append((index, premise, hypothesis, relevance_score))
+        if not pending:
+            return results
+
+        # Step 2: Reuse stances already computed by the same model (or heuristic)
+        pipe = get_nli_pipeline() if allow_model else None
+        model_id = get_nli_model_id() if pipe is not None else "heuristic"
+        # memo key -> indexes of the pairs it answers (repeats within a batch run once)
+        misses: Dict[str, List[int]] = {}
+        unique = []
+        for item in pending:
+            index, premise, hypothesis, _ = item
+            key = _memo_key(model_id, premise, hypothesis)
+            if key in misses:
+                misses[key].append(index)
+                continue
+            cached = _stance_memo.get(key) if use_memo else None
+            if cached is not None:
+                results[index] = cached
+            else:
+                misses[key] = [index]
+                unique.append((key, item))
+        if not unique:
+            return results
+
+        def _store(key: str, result: Tuple[Stance, float]):
+            if use_memo:
+                _stance_memo.set(key, result)
+            for index in misses[key]:
+                results[index] = result
+
+        # Step 3: Try transformers pipeline
         if pipe is not None:
-            result = pipe(
-                premise,
-                candidate_labels=[
-                    "supports the claim",
-                    "refutes the claim",
-                    "neutral to the claim",
-                ],
-                hypothesis_template="{}",
+            passages = []
+            for _, (_, premise, hypothesis, _) in unique:
+                passage = select_passages(premise, hypothesis)
+                _passage_stats["premises"] += 1
+                _passage_stats["premise_tokens"] += _approx_tokens(premise)
+                _passage_stats["selected_tokens"] += _approx_tokens(passage)
+                passages.append(passage)
+            # Premise = selected passage, hypothesis = the claim; one padded forward pass
+            outputs = pipe(
+                [{"text": passage, "text_pair": hypothesis}
+                 for passage, (_, (_, _, hypothesis, _)) in zip(passages, unique)],
+                top_k=None,
+                truncation="only_first",
+                batch_size=len(unique),
             )
+            for (key, (_, _, _, relevance_score)), result in zip(unique, outputs):
+                # Classes sorted by score, best first
+                best = result[0] if isinstance(result, list) else result
+                stance = _label_to_stance(best["label"])
+                final_score = best["score"] * relevance_score
+                sampled_debug(logger, "[classify_stance] Transformers result: stance=%s, score=%.3f", stance, final_score)
+                _store(key, (stance, final_score))
+            return results
+
+        # Step 4: Heuristic fallback (no transformers/torch)
+        sampled_debug(logger, "[classify_stance] Using heuristic fallback (no transformers)")
+        for key, (_, premise, hypothesis, relevance_score) in unique:
+            _store(key, _heuristic_stance(premise, hypothesis, relevance_score))
+        return results
+
+    except Exception as e:
+        logger.warning("NLI classification error: %s", e)
+        return [("neutral", 0.0)] * len(pairs)
 
-            label = result["labels"][0]
-            score = result["scores"][0]
 
-            if "refutes" in label.lower():
-                stance = "refutes"
-            elif "supports" in label.lower():
-                stance = "supports"
+class StanceBatcher:
+    """
+    Micro-batching scheduler for stance inference. Concurrent callers (from
+    many /predict requests) enqueue (premise, hypothesis); one worker task
+    takes the first item, waits up to max_wait_ms for more (at most max_batch),
+    runs the batch on the inference thread and resolves each caller's future.
+    """
+
+    def __init__(self, max_batch: int = NLI_MAX_BATCH, max_wait_ms: float = NLI_MAX_WAIT_MS,
+                 classify=classify_stances):
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        # A coroutine function (remote inference) runs on the loop, batches pipelined;
+        # a plain function runs on the inference thread, one batch at a time
+        self._classify = classify
+        self._remote = asyncio.iscoroutinefunction(classify)
+        self._dispatched: set = set()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = 0
+        self.batches = 0
+        self.items = 0
+        self.max_queue_depth = 0
+        self.largest_batch = 0
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            # Shared by all requests: don't inherit the id of the request that started it
+            self._worker = loop.create_task(self._run(), context=contextvars.Context())
+        return self._queue
+
+    async def classify(self, premise: str, hypothesis: str) -> Tuple[Stance, float]:
+        queue = self._ensure_worker()
+        future = self._loop.create_future()
+        queue.put_nowait((premise, hypothesis, future))
+        self.max_queue_depth = max(self.max_queue_depth, queue.qsize())
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue) -> list:
+        batch = [await queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # Callers that gave up (request cancelled) don't cost inference
+        return [item for item in batch if not item[2].done()]
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            batch = await self._collect(queue)
+            if not batch:
+                continue
+            if self._remote:
+                task = self._loop.create_task(self._dispatch(batch))
+                self._dispatched.add(task)
+                task.add_done_callback(self._dispatched.discard)
             else:
-                stance = "neutral"
-
-            final_score = score * relevance_score
-            print(f"[classify_stance] Transformers result: stance={stance}, score={final_score:.3f}")
-            return stance, final_score
-
-        # Step 3: Heuristic fallback (no transformers/torch)
-        print(f"[classify_stance] Using heuristic fallback (no transformers)")
-        text = premise.lower()
-        hypothesis_lower = hypothesis.lower()
-        
-        # Suspicious/fake news indicators
-        neg_cues = [
-            "false", "fake", "hoax", "rumor", "not true", "no plans",
-            "denied", "debunked", "misleading", "refuted", "fact-check: false",
-            "no evidence", "unverified", "fabricated", "misinformation"
-        ]
-        
-        # Suspicious claims patterns (unusual/extraordinary claims)
-        suspicious_patterns = [
-            "painted gold", "paint gold", "to be painted", "will be painted",
-            "second sun", "two suns", "aliens", "ufo landing", "miracle cure",
-            "secret government", "conspiracy", "shocking discovery"
-        ]
-        
-        # Real news indicators
-        pos_cues = [
-            "announced", "confirmed", "will require", "mandatory", "official",
-            "govt", "ministry", "press release", "notification", "railways", "irctc",
-            "according to", "statement", "spokesperson", "minister said"
-        ]
-
-        # Check if the claim itself contains suspicious patterns
-        if any(pattern in hypothesis_lower for pattern in suspicious_patterns):
-            # Suspicious claim - unless premise strongly supports it, mark as refutes
-            if not any(cue in text for cue in pos_cues):
-                final_score = 0.6 * relevance_score
-                print(f"[classify_stance] Heuristic: suspicious claim detected, refutes, score={final_score:.3f}")
-                return "refutes", final_score
-
-        if any(cue in text for cue in neg_cues):
-            final_score = 0.7 * relevance_score
-            print(f"[classify_stance] Heuristic: refutes, score={final_score:.3f}")
-            return "refutes", final_score
-        if any(cue in text for cue in pos_cues):
-            final_score = 0.6 * relevance_score
-            print(f"[classify_stance] Heuristic: supports, score={final_score:.3f}")
-            return "supports", final_score
+                await self._dispatch(batch)
 
-        # If relevant but no cues, treat as neutral with moderate confidence
-        final_score = 0.5 * relevance_score
-        print(f"[classify_stance] Heuristic: neutral (no cues), score={final_score:.3f}")
-        return "neutral", final_score
+    async def _dispatch(self, batch: list):
+        pairs = [(p, h) for p, h, _ in batch]
+        self._running += len(batch)
+        try:
+            # Shared by many requests, so this only feeds the histogram
+            with stage("nli_batch"):
+                if self._remote:
+                    results = await self._classify(pairs)
+                else:
+                    results = await self._loop.run_in_executor(get_inference_executor(), self._classify, pairs)
+        except Exception as e:
+            logger.warning("NLI batch failed: %s", e)
+            results = [("neutral", 0.0)] * len(batch)
+        finally:
+            self._running -= len(batch)
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
 
-    except Exception as e:
-        print(f"NLI classification error: {e}")
+    async def close(self):
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        for task in list(self._dispatched):
+            task.cancel()
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+        self._worker = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "max_queue_depth": self.max_queue_depth,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+
+class InferenceClient:
+    """
+    Async client of app.inference_server. Requests are pipelined over one Unix
+    socket connection per event loop and matched to responses by id.
+    """
+
+    def __init__(self, path: str, timeout: float = NLI_SERVER_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self.requests = 0
+        self.failures = 0
+
+    async def _connection(self) -> asyncio.StreamWriter:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._lock, self._writer = loop, asyncio.Lock(), None
+        async with self._lock:
+            if self._writer is None or self._writer.is_closing():
+                reader, self._writer = await asyncio.open_unix_connection(self.path, limit=NLI_SERVER_MAX_MESSAGE)
+                self._pending = {}
+                loop.create_task(self._read_loop(reader, self._writer, self._pending), context=contextvars.Context())
+        return self._writer
+
+    async def _read_loop(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                         pending: Dict[int, asyncio.Future]):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                future = pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(RuntimeError(f"inference server: {message['error']}"))
+                else:
+                    future.set_result([(stance, float(score)) for stance, score in message["results"]])
+        except (OSError, ValueError) as e:
+            logger.warning("Inference server connection error: %s", e)
+        finally:
+            # Connection gone: fail everything still waiting on it
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("inference server connection closed"))
+            pending.clear()
+            writer.close()
+
+    async def classify_pairs(self, pairs: Sequence[Tuple[str, str]]) -> List[Tuple[Stance, float]]:
+        writer = await self._connection()
+        self._next_id += 1
+        request_id, pending = self._next_id, self._pending
+        future = self._loop.create_future()
+        pending[request_id] = future
+        self.requests += 1
+        try:
+            writer.write(json.dumps({"id": request_id, "pairs": [list(p) for p in pairs]}).encode("utf-8") + b"\n")
+            await writer.drain()
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            pending.pop(request_id, None)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"socket": self.path, "requests": self.requests, "failures": self.failures,
+                "in_flight": len(self._pending)}
+
+
+_stance_batcher: Optional[StanceBatcher] = None
+_inference_client: Optional[InferenceClient] = None
+
+
+def get_inference_client() -> InferenceClient:
+    global _inference_client
+    if _inference_client is None:
+        _inference_client = InferenceClient(NLI_SERVER_SOCKET)
+    return _inference_client
+
+
+async def _classify_remote(pairs: Sequence[Tuple[str, str]]) -> List[Tuple[Stance, float]]:
+    client = get_inference_client()
+    try:
+        return await client.classify_pairs(pairs)
+    except (OSError, ConnectionError, asyncio.TimeoutError, RuntimeError, ValueError) as e:
+        client.failures += 1
+        logger.warning("Inference server unavailable, using heuristic fallback: %s", e)
+        return classify_stances(pairs, allow_model=False)
+
+
+def get_stance_batcher() -> StanceBatcher:
+    global _stance_batcher
+    if _stance_batcher is None:
+        _stance_batcher = StanceBatcher(classify=_classify_remote if NLI_SERVER_SOCKET else classify_stances)
+    return _stance_batcher
+
+
+async def classify_stance_async(premise: str, hypothesis: str) -> Tuple[Stance, float]:
+    """classify_stance for async callers; concurrent calls are micro-batched."""
+    if not premise or not hypothesis:
         return "neutral", 0.0
+    # Time the request waits for its stance, queueing included
+    with stage("nli"):
+        return await get_stance_batcher().classify(premise, hypothesis)
+
+
+async def close_stance_batcher():
+    if _stance_batcher is not None:
+        await _stance_batcher.close()
+    if _inference_client is not None:
+        await _inference_client.close()
+
+
+def get_nli_stats() -> Dict[str, Any]:
+    memo = _stance_memo.stats()
+    memo.pop("bytes", None)
+    memo.pop("max_bytes", None)
+    passages = dict(_passage_stats)
+    passages["reduction"] = (round(passages["premise_tokens"] / passages["selected_tokens"], 2)
+                             if passages["selected_tokens"] else 0.0)
+    stats = {"model": get_nli_model_id(), "batcher": get_stance_batcher().stats(), "memo": memo, "passages": passages}
+    if NLI_SERVER_SOCKET:
+        # Model, memo and passage selection live in the inference server process
+        stats["server"] = get_inference_client().stats()
+    return stats
+
+
+def _collect_metrics():
+    yield from stats_families("fakecheck_cache", _stance_memo.stats(), counters=("hits", "misses", "evictions"),
+                              gauges=("entries",), labels={"cache": "nli_memo"}, documentation="Prediction and stance cache statistics")
+    if _stance_batcher is not None:
+        yield from stats_families("fakecheck_nli_batcher", _stance_batcher.stats(), counters=("batches", "items"),
+                                  gauges=("queue_depth", "running"), documentation="NLI micro-batcher")
+    if _inference_client is not None:
+        yield from stats_families("fakecheck_nli_server", _inference_client.stats(), counters=("requests", "failures"),
+                                  gauges=("in_flight",), documentation="NLI inference server client")
+
+
+register_collector(_collect_metrics)
@@ -0,0 +1,164 @@
+"""
+ONNX Runtime backend for NLI stance detection (NLI_BACKEND=onnx).
+
+The MNLI model is exported to ONNX once, its weights are quantized to int8
+(dynamic quantization) and it is served by ONNX Runtime behind the same call
+signature as the transformers text-classification pipeline on
+{"text", "text_pair"} inputs, so classify_stance and the batcher are unchanged. Requires ``pip install onnxruntime``; the export also
+needs ``torch`` and ``onnx``:
+
+    python -m app.nli_onnx export --model facebook/bart-large-mnli
+"""
+import os
+import argparse
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from transformers import AutoConfig, AutoTokenizer
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+MODEL_FILE = "model.int8.onnx"
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+# Directory with the exported model (default: models/<model name>-int8)
+NLI_ONNX_DIR = os.getenv("NLI_ONNX_DIR")
+try:
+    # ONNX Runtime intra-op threads; 0 lets the runtime pick (one per core)
+    NLI_ONNX_THREADS = int(os.getenv("NLI_ONNX_THREADS", "0"))
+except ValueError:
+    NLI_ONNX_THREADS = 0
+
+
+def default_model_dir(model_name: str) -> str:
+    return os.path.join(MODELS_DIR, model_name.replace("/", "--") + "-int8")
+
+
+def nli_scores(logits: np.ndarray) -> np.ndarray:
+    """(pairs, nli_classes) logits -> class probabilities, as the text-classification pipeline's softmax."""
+    logits = logits.astype(np.float64)
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class OnnxNLIPipeline:
+    """Premise/hypothesis classification over an int8 ONNX MNLI model."""
+
+    def __init__(self, model_dir: str, threads: int = NLI_ONNX_THREADS):
+        if onnxruntime is None:
+            raise ImportError("onnxruntime is not installed (pip install onnxruntime)")
+        path = os.path.join(model_dir, MODEL_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found; export it with: python -m app.nli_onnx export --out {model_dir}")
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.id2label = {int(index): label for index, label in AutoConfig.from_pretrained(model_dir).id2label.items()}
+        self.model_dir = model_dir
+
+    def _logits(self, pairs: List[tuple], batch_size: int, truncation: str = "only_first") -> np.ndarray:
+        chunks = []
+        for start in range(0, len(pairs), batch_size):
+            chunk = pairs[start:start + batch_size]
+            encoded = self.tokenizer(
+                [premise for premise, _ in chunk],
+                [hypothesis for _, hypothesis in chunk],
+                padding=True,
+                truncation=truncation,
+                return_tensors="np",
+            )
+            feed = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            chunks.append(self.session.run(None, feed)[0])
+        return np.concatenate(chunks)
+
+    def __call__(self, inputs: Union[Dict[str, str], Sequence[Dict[str, str]]], top_k: Optional[int] = None,
+                 batch_size: Optional[int] = None, truncation: str = "only_first"):
+        """{"text": premise, "text_pair": hypothesis} (or a list) -> classes with scores, best first."""
+        single = isinstance(inputs, dict)
+        if single:
+            inputs = [inputs]
+        pairs = [(item["text"], item["text_pair"]) for item in inputs]
+        if not pairs:
+            return []
+
+        scores = nli_scores(self._logits(pairs, batch_size or len(pairs), truncation))
+        results: List[List[Dict[str, Any]]] = []
+        for row in scores:
+            order = np.argsort(-row, kind="stable")[:top_k]
+            results.append([{"label": self.id2label.get(int(i), f"LABEL_{i}"), "score": float(row[i])} for i in order])
+        return results[0] if single else results
+
+
+def load_onnx_pipeline(model_name: str, model_dir: Optional[str] = None) -> OnnxNLIPipeline:
+    return OnnxNLIPipeline(model_dir or NLI_ONNX_DIR or default_model_dir(model_name))
+
+
+def export_quantized_model(model_name: str, output_dir: Optional[str] = None, opset: int = 14,
+                           keep_fp32: bool = False) -> str:
+    """Export model_name to ONNX and quantize its weights to int8. Returns the output directory."""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForSequenceClassification
+
+    output_dir = output_dir or default_model_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    class _Logits(torch.nn.Module):
+        # Export only the classification logits (BART also returns encoder states)
+        def __init__(self, wrapped):
+            super().__init__()
+            self.wrapped = wrapped
+
+        def forward(self, input_ids, attention_mask):
+            return self.wrapped(input_ids=input_ids, attention_mask=attention_mask, return_dict=True).logits
+
+    sample = tokenizer(["The ministry announced the scheme."], ["This supports the claim."], return_tensors="pt")
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    axes = {"input_ids": {0: "batch", 1: "sequence"}, "attention_mask": {0: "batch", 1: "sequence"}, "logits": {0: "batch"}}
+    with torch.no_grad():
+        torch.onnx.export(
+            _Logits(model),
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes=axes,
+            opset_version=opset,
+        )
+
+    quantize_dynamic(fp32_path, os.path.join(output_dir, MODEL_FILE), weight_type=QuantType.QInt8)
+    if not keep_fp32:
+        os.remove(fp32_path)
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the NLI model to int8 ONNX")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export")
+    export.add_argument("--model", default=os.getenv("NLI_MODEL", "facebook/bart-large-mnli"))
+    export.add_argument("--out", default=None, help="Output directory (default: NLI_ONNX_DIR or models/<model>-int8)")
+    export.add_argument("--opset", type=int, default=14)
+    export.add_argument("--keep-fp32", action="store_true")
+    args = parser.parse_args()
+
+    out = export_quantized_model(args.model, args.out or NLI_ONNX_DIR, opset=args.opset, keep_fp32=args.keep_fp32)
+    print(f"Exported {args.model} to {os.path.join(out, MODEL_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
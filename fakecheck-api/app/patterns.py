@@ -0,0 +1,129 @@
+"""
+Multi-pattern phrase matching for the claim and evidence keyword rules.
+
+Every phrase table used by /predict is compiled once into an Aho-Corasick
+automaton, so a text is scanned a single time and all matched rules from all
+tables come back together, instead of one ``phrase in text`` scan per phrase.
+Matching keeps the substring semantics of ``in`` (callers lowercase the text).
+Uses the C ``pyahocorasick`` package when installed, otherwise a pure Python
+automaton.
+"""
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class _PythonAutomaton:
+    """
+    Pure Python Aho-Corasick automaton. Fail links are folded into a full
+    transition table at build time, so the scan is one dict lookup per character.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Hashable]]):
+        goto: List[Dict[str, int]] = [{}]
+        fail: List[int] = [0]
+        out: List[Tuple] = [()]
+        for key, value in entries:
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    fail.append(0)
+                    out.append(())
+                    goto[state][ch] = nxt
+                state = nxt
+            out[state] = out[state] + (value,)
+
+        # Breadth-first pass: fail links, outputs inherited along them, and each
+        # state's transitions completed with those of its fail state
+        delta: List[Dict[str, int]] = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            row = dict(delta[fail[state]])
+            row.update(goto[state])
+            delta[state] = row
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._delta = delta
+        self._out = out
+
+    def iter_values(self, text: str) -> Iterator[Hashable]:
+        delta, out = self._delta, self._out
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                yield from out[state]
+
+
+class _NativeAutomaton:
+    """pyahocorasick-backed automaton with the same interface."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Hashable]]):
+        values: Dict[str, List[Hashable]] = {}
+        for key, value in entries:
+            values.setdefault(key, []).append(value)
+        self._automaton = ahocorasick.Automaton() if values else None
+        for key, key_values in values.items():
+            self._automaton.add_word(key, tuple(key_values))
+        if self._automaton is not None:
+            self._automaton.make_automaton()
+
+    def iter_values(self, text: str) -> Iterator[Hashable]:
+        if self._automaton is None:
+            return
+        for _, key_values in self._automaton.iter(text):
+            yield from key_values
+
+
+def _build_automaton(entries: List[Tuple[str, Hashable]], native: bool = None):
+    if native is None:
+        native = ahocorasick is not None
+    return _NativeAutomaton(entries) if native else _PythonAutomaton(entries)
+
+
+class PhraseMatcher:
+    """Finds which phrases of one list occur in a text, in a single pass."""
+
+    def __init__(self, phrases: Iterable[str], native: bool = None):
+        self.phrases = tuple(dict.fromkeys(p for p in phrases if p))
+        self._automaton = _build_automaton([(p, p) for p in self.phrases], native)
+
+    def find(self, text: str) -> Set[str]:
+        """All phrases that occur in text."""
+        return set(self._automaton.iter_values(text or ""))
+
+    def search(self, text: str) -> bool:
+        """True if any phrase occurs in text (stops at the first match)."""
+        for _ in self._automaton.iter_values(text or ""):
+            return True
+        return False
+
+
+class RuleMatcher:
+    """
+    Several named phrase tables compiled into one automaton. ``scan`` returns
+    {table: {matched phrases}} for every table after one pass over the text.
+    """
+
+    def __init__(self, tables: Dict[str, Iterable[str]], native: bool = None):
+        self.tables = {name: tuple(dict.fromkeys(p for p in phrases if p)) for name, phrases in tables.items()}
+        entries = [(phrase, (name, phrase)) for name, phrases in self.tables.items() for phrase in phrases]
+        self._automaton = _build_automaton(entries, native)
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        matches: Dict[str, Set[str]] = {name: set() for name in self.tables}
+        for name, phrase in self._automaton.iter_values(text or ""):
+            matches[name].add(phrase)
+        return matches
@@ -0,0 +1,238 @@
+"""
+Durable prediction store: the MongoDB tier behind the prediction caches.
+
+Verdicts are queued by set_cached_prediction and written in batches by a
+background task (one unordered bulk write per PREDICTION_STORE_FLUSH_SECONDS),
+so requests never wait on Mongo. Documents expire through a TTL index on
+``expires_at``. Cache hits are counted per key and flushed with the writes,
+which lets a restarted worker preload the most popular (or most recent)
+PREDICTION_WARM_START verdicts into memory instead of starting cold. While
+app.db reports Mongo as down, reads miss and writes stay queued.
+"""
+import os
+import time
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymongo import DESCENDING, UpdateOne
+from pymongo.errors import PyMongoError
+
+from app.db import get_db, report_mongo_failure
+from app.metrics import register_collector, stats_families
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+PREDICTION_STORE_ENABLED = os.getenv("PREDICTION_STORE_ENABLED", "true").lower() == "true"
+# Lifetime of stored verdicts (the TTL index removes them afterwards)
+PREDICTION_STORE_TTL = _env_int("PREDICTION_STORE_TTL", 6 * 3600)
+PREDICTION_STORE_BATCH_SIZE = _env_int("PREDICTION_STORE_BATCH_SIZE", 200)
+try:
+    PREDICTION_STORE_FLUSH_SECONDS = float(os.getenv("PREDICTION_STORE_FLUSH_SECONDS", "1"))
+except ValueError:
+    PREDICTION_STORE_FLUSH_SECONDS = 1.0
+PREDICTION_STORE_QUEUE_SIZE = _env_int("PREDICTION_STORE_QUEUE_SIZE", 10000)
+# Verdicts preloaded into memory at startup, chosen by hit count ("popular") or age ("recent")
+PREDICTION_WARM_START = _env_int("PREDICTION_WARM_START", 1000)
+PREDICTION_WARM_START_ORDER = os.getenv("PREDICTION_WARM_START_ORDER", "popular").lower()
+# How long the warm start waits for Mongo to become reachable
+PREDICTION_WARM_START_WAIT = _env_int("PREDICTION_WARM_START_WAIT", 10)
+
+COLLECTION = "predictions"
+
+_pending: Dict[str, Tuple[dict, float]] = {}
+_hits: Counter = Counter()
+_writer: Optional[asyncio.Task] = None
+_warm_task: Optional[asyncio.Task] = None
+_stats = {"hits": 0, "misses": 0, "written": 0, "dropped": 0, "errors": 0, "preloaded": 0}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue(key: str, value: dict, ttl: int = PREDICTION_STORE_TTL):
+    """Queue a verdict for the next batch; never blocks. A later verdict for the same key replaces it."""
+    if _writer is None:
+        return
+    if key not in _pending and len(_pending) >= PREDICTION_STORE_QUEUE_SIZE:
+        _stats["dropped"] += 1
+        return
+    _pending[key] = (value, ttl)
+
+
+def record_hit(key: str):
+    """Count a cache hit for the popularity-ordered warm start."""
+    if _writer is not None:
+        _hits[key] += 1
+
+
+async def load(key: str) -> Optional[Tuple[dict, float]]:
+    """(value, remaining seconds) of a live stored verdict, or None (also when Mongo is down)."""
+    db = get_db() if _writer is not None else None
+    if db is None:
+        return None
+    try:
+        doc = await db[COLLECTION].find_one({"_id": key, "expires_at": {"$gt": _now()}}, {"value": 1, "expires_at": 1})
+    except PyMongoError as e:
+        _stats["errors"] += 1
+        report_mongo_failure(e)
+        return None
+    if doc is None:
+        _stats["misses"] += 1
+        return None
+    _stats["hits"] += 1
+    _hits[key] += 1
+    return doc["value"], (_as_utc(doc["expires_at"]) - _now()).total_seconds()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # The driver returns naive UTC datetimes unless the client is tz-aware
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def flush() -> int:
+    """Write the queued verdicts and hit counts in unordered bulk writes; returns the verdicts written."""
+    if not _pending and not _hits:
+        return 0
+    db = get_db()
+    if db is None:
+        # Mongo is down: verdicts wait (up to the queue size), hit counts are not worth keeping
+        _hits.clear()
+        return 0
+    writes = list(_pending.items())
+    hits = list(_hits.items())
+    _pending.clear()
+    _hits.clear()
+
+    now = _now()
+    ops = [
+        UpdateOne(
+            {"_id": key},
+            {"$set": {"value": value, "created_at": now, "expires_at": now + timedelta(seconds=ttl)},
+             "$setOnInsert": {"hits": 0}},
+            upsert=True,
+        )
+        for key, (value, ttl) in writes
+    ] + [UpdateOne({"_id": key}, {"$inc": {"hits": count}}) for key, count in hits]
+
+    written = 0
+    for start in range(0, len(ops), PREDICTION_STORE_BATCH_SIZE):
+        batch = ops[start:start + PREDICTION_STORE_BATCH_SIZE]
+        try:
+            await db[COLLECTION].bulk_write(batch, ordered=False)
+        except PyMongoError as e:
+            _stats["errors"] += 1
+            report_mongo_failure(e)
+            logger.warning("Prediction store write of %d operation(s) failed: %s", len(ops) - start, e)
+            # Hit increments are not retried: part of a failed unordered batch may have been applied
+            _requeue(writes[start:])
+            break
+        # The verdict upserts come before the hit increments
+        written += max(0, min(len(batch), len(writes) - start))
+    _stats["written"] += written
+    return written
+
+
+def _requeue(writes: List[Tuple[str, Tuple[dict, float]]]):
+    """Put unwritten verdicts back for the next flush; a verdict queued meanwhile is newer and wins."""
+    for key, entry in writes:
+        if key in _pending:
+            continue
+        if len(_pending) >= PREDICTION_STORE_QUEUE_SIZE:
+            _stats["dropped"] += 1
+            continue
+        _pending[key] = entry
+
+
+async def preload(warm: Callable[[str, dict, float], None], limit: int = PREDICTION_WARM_START,
+                  order: str = PREDICTION_WARM_START_ORDER) -> int:
+    """Hand the top ``limit`` live verdicts to ``warm(key, value, remaining_seconds)``."""
+    db = get_db()
+    if db is None or limit <= 0:
+        return 0
+    sort_field = "created_at" if order == "recent" else "hits"
+    try:
+        cursor = db[COLLECTION].find({"expires_at": {"$gt": _now()}}).sort(sort_field, DESCENDING).limit(limit)
+        docs = await cursor.to_list(length=limit)
+    except PyMongoError as e:
+        _stats["errors"] += 1
+        report_mongo_failure(e)
+        logger.warning("Prediction warm start failed: %s", e)
+        return 0
+    now = _now()
+    for doc in docs:
+        warm(doc["_id"], doc["value"], (_as_utc(doc["expires_at"]) - now).total_seconds())
+    _stats["preloaded"] += len(docs)
+    logger.info("Preloaded %d stored prediction(s) (%s)", len(docs), "most recent" if order == "recent" else "most popular")
+    return len(docs)
+
+
+async def _write_loop():
+    while True:
+        await asyncio.sleep(PREDICTION_STORE_FLUSH_SECONDS)
+        await flush()
+
+
+async def _warm_start(warm: Callable[[str, dict, float], None]):
+    # app.db learns that Mongo is reachable from its first background ping
+    deadline = time.monotonic() + PREDICTION_WARM_START_WAIT
+    while get_db() is None:
+        if time.monotonic() >= deadline:
+            logger.info("Prediction warm start skipped: MongoDB not reachable")
+            return
+        await asyncio.sleep(0.1)
+    await preload(warm)
+
+
+def start_prediction_store(warm: Callable[[str, dict, float], None]):
+    """Start the batch writer and the warm start (no-op when disabled or without MONGO_URI)."""
+    global _writer, _warm_task
+    if not PREDICTION_STORE_ENABLED or not os.getenv("MONGO_URI") or _writer is not None:
+        return
+    _writer = asyncio.create_task(_write_loop())
+    _warm_task = asyncio.create_task(_warm_start(warm))
+
+
+async def stop_prediction_store():
+    """Stop the background tasks and write what is still queued."""
+    global _writer, _warm_task
+    tasks = [task for task in (_writer, _warm_task) if task is not None]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if _writer is not None:
+        try:
+            await asyncio.wait_for(flush(), timeout=5)
+        except asyncio.TimeoutError:
+            logger.warning("Prediction store: final flush timed out")
+    _writer = _warm_task = None
+    _pending.clear()
+    _hits.clear()
+
+
+def get_prediction_store_stats() -> Dict[str, Any]:
+    if _writer is None:
+        return {"enabled": False}
+    return {"enabled": True, "queued": len(_pending), **_stats}
+
+
+def _collect_metrics():
+    stats = get_prediction_store_stats()
+    yield from stats_families("fakecheck_cache", stats, counters=("hits", "misses"), labels={"cache": "mongo"},
+                              documentation="Prediction and stance cache statistics")
+    yield from stats_families("fakecheck_prediction_store", stats, counters=("written", "dropped", "errors", "preloaded"),
+                              gauges=("queued",), documentation="Durable prediction store writes and warm start")
+
+
+register_collector(_collect_metrics)
@@ -2,89 +2,181 @@
 Retrieval module: article fetching, claim extraction, ClaimReview, NewsAPI/GDELT
 """
 import os
+import asyncio
+import contextvars
+import logging
 import httpx
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 from app.trusted_sources import is_trusted_source
+from app.http_client import get_http_client, DEFAULT_USER_AGENT
+from app.circuit_breaker import breaker_get
+from app.cache import provider_cached
+from app.article_store import canonical_url, get_article_store
 from urllib.parse import quote_plus
 from newspaper import Article
+from app.logging_config import sampled_debug
 
+logger = logging.getLogger(__name__)
 
-def fetch_article_text(url: str) -> Optional[str]:
-    """Fetch and parse article from URL using newspaper3k with fallbacks."""
-    # Try newspaper3k first
-    try:
-        # Configure article with better settings
-        article = Article(url, language='en')
-        article.download()
-        article.parse()
-        
-        # Return text if we got something substantial
-        if article.text and len(article.text) > 50:
-            print(f"Successfully extracted article using newspaper3k (English)")
-            return article.text
-    except Exception as e:
-        print(f"Newspaper3k English failed: {e}")
-    
-    # Try Hindi
-    try:
-        article = Article(url, language='hi')
-        article.download()
-        article.parse()
-        if article.text and len(article.text) > 50:
-            print(f"Successfully extracted article using newspaper3k (Hindi)")
-            return article.text
-    except Exception as e:
-        print(f"Newspaper3k Hindi failed: {e}")
+
+try:
+    ARTICLE_PARSE_WORKERS = int(os.getenv("ARTICLE_PARSE_WORKERS", "4"))
+except ValueError:
+    ARTICLE_PARSE_WORKERS = 4
+
+ARTICLE_FETCH_TIMEOUT = 10.0
+ARTICLE_HEADERS = {'User-Agent': DEFAULT_USER_AGENT}
+
+_parse_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_parse_executor() -> ThreadPoolExecutor:
+    """Worker pool for CPU-heavy HTML parsing, kept off the event loop."""
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = ThreadPoolExecutor(max_workers=ARTICLE_PARSE_WORKERS, thread_name_prefix="article-parse")
+    return _parse_executor
+
+
+def extract_article_text(html: str, url: str) -> Optional[str]:
+    """
+    Extract article text from already-downloaded HTML.
+    Tries newspaper3k (English, then Hindi) and falls back to BeautifulSoup,
+    all on the same bytes so the page is never downloaded twice.
+    """
+    if not html:
+        return None
+
+    for language, label in (('en', 'English'), ('hi', 'Hindi')):
+        try:
+            article = Article(url, language=language)
+            article.download(input_html=html)
+            article.parse()
+            
+            # Return text if we got something substantial
+            if article.text and len(article.text) > 50:
+                logger.debug("Successfully extracted article using newspaper3k (%s)", label)
+                return article.text
+        except Exception as e:
+            logger.debug("Newspaper3k %s failed: %s", label, e)
     
-    # Fallback: Direct HTTP request with BeautifulSoup
+    # Fallback: BeautifulSoup over the same HTML
     try:
-        import httpx
-        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
         
-        print(f"Trying direct HTTP fetch for {url}")
-        with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-            response = client.get(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style", "nav", "footer", "header"]):
-                    script.decompose()
-                
-                # Try to find article content
-                article_text = ""
-                
-                # Common article selectors
-                selectors = ['article', '.article-content', '.story-content', 
-                           '.post-content', 'main', '.content']
-                
-                for selector in selectors:
-                    content = soup.select_one(selector)
-                    if content:
-                        article_text = content.get_text(separator=' ', strip=True)
-                        if len(article_text) > 100:
-                            print(f"Extracted {len(article_text)} chars using selector: {selector}")
-                            return article_text
-                
-                # Fallback: get all paragraph text
-                paragraphs = soup.find_all('p')
-                article_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
+        # Remove script and style elements
+        for script in soup(["script", "style", "nav", "footer", "header"]):
+            script.decompose()
+        
+        # Common article selectors
+        selectors = ['article', '.article-content', '.story-content', 
+                   '.post-content', 'main', '.content']
+        
+        for selector in selectors:
+            content = soup.select_one(selector)
+            if content:
+                article_text = content.get_text(separator=' ', strip=True)
                 if len(article_text) > 100:
-                    print(f"Extracted {len(article_text)} chars from paragraphs")
+                    logger.debug("Extracted %d chars using selector: %s", len(article_text), selector)
                     return article_text
-                    
+        
+        # Fallback: get all paragraph text
+        paragraphs = soup.find_all('p')
+        article_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
+        if len(article_text) > 100:
+            logger.debug("Extracted %d chars from paragraphs", len(article_text))
+            return article_text
     except Exception as e:
-        print(f"Direct HTTP fetch failed: {e}")
+        logger.debug("BeautifulSoup extraction failed: %s", e)
     
-    print(f"All article extraction methods failed for {url}")
+    logger.warning("All article extraction methods failed for %s", url)
+    return None
+
+
+def _revalidation_headers(key: str):
+    """(stored article or None, request headers with its validators)."""
+    store = get_article_store()
+    stored = store.get(key) if store is not None else None
+    headers = dict(ARTICLE_HEADERS)
+    if stored is not None:
+        headers.update(stored.conditional_headers())
+    return stored, headers
+
+
+def _extract_and_store(key: str, response: httpx.Response) -> Optional[str]:
+    """Extract the article and keep it for revalidation when the server sent validators."""
+    text = extract_article_text(response.text, str(response.url))
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    store = get_article_store()
+    if text and store is not None and (etag or last_modified):
+        store.put(key, text, etag, last_modified)
+    return text
+
+
+def _stored_or_none(key: str, stored, response: Optional[httpx.Response], url: str) -> Optional[str]:
+    """Outcome of a non-200 response (or none at all): the stored text if still valid, else None."""
+    if stored is not None and response is not None and response.status_code == 304:
+        get_article_store().touch(key, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        logger.debug("Article not modified, reusing stored text for %s", url)
+        return stored.text
+    if response is not None and response.status_code in (404, 410):
+        if stored is not None:
+            get_article_store().delete(key)
+        logger.warning("Article download returned %s for %s", response.status_code, url)
+        return None
+    if stored is not None and (response is None or response.status_code >= 500):
+        # Serve the last good copy while the site is failing
+        logger.warning("Article download failed for %s; using the stored copy", url)
+        return stored.text
+    if response is not None:
+        logger.warning("Article download returned %s for %s", response.status_code, url)
     return None
 
 
+async def _in_parse_pool(func, *args):
+    # Run in a copy of this context so the worker's log records keep the request id
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(get_parse_executor(), ctx.run, func, *args)
+
+
+async def fetch_article_text_async(url: str, client: Optional[httpx.AsyncClient] = None) -> Optional[str]:
+    """
+    Download the article once with the shared client and parse it in the worker pool.
+    A stored copy is revalidated with a conditional GET; a 304 skips the download and the parse.
+    Article store reads and writes (SQLite, zlib) also run in the worker pool.
+    """
+    http = client or get_http_client()
+    key = canonical_url(url)
+    stored, headers = await _in_parse_pool(_revalidation_headers, key)
+    try:
+        response = await http.get(url, headers=headers, timeout=ARTICLE_FETCH_TIMEOUT, follow_redirects=True)
+    except Exception as e:
+        logger.warning("Article download failed for %s: %s", url, e)
+        return await _in_parse_pool(_stored_or_none, key, stored, None, url)
+    if response.status_code != 200:
+        return await _in_parse_pool(_stored_or_none, key, stored, response, url)
+    return await _in_parse_pool(_extract_and_store, key, response)
+
+
+def fetch_article_text(url: str) -> Optional[str]:
+    """Synchronous variant of fetch_article_text_async for scripts; downloads the page once."""
+    key = canonical_url(url)
+    stored, headers = _revalidation_headers(key)
+    try:
+        with httpx.Client(timeout=ARTICLE_FETCH_TIMEOUT, follow_redirects=True) as client:
+            response = client.get(url, headers=headers)
+    except Exception as e:
+        logger.warning("Article download failed for %s: %s", url, e)
+        return _stored_or_none(key, stored, None, url)
+    if response.status_code != 200:
+        return _stored_or_none(key, stored, response, url)
+    return _extract_and_store(key, response)
+
+
 def extract_candidate_claims(text: str, max_claims: int = 2) -> List[str]:
     """
     Extract candidate claim sentences from text.
@@ -111,186 +203,203 @@ def extract_candidate_claims(text: str, max_claims: int = 2) -> List[str]:
             if len(claims) >= max_claims:
                 break
     
-    return list(set(claims))[:max_claims]
+    # Deduplicated in order: the lead sentence stays the main claim on every worker
+    return list(dict.fromkeys(claims))[:max_claims]
 
 
-async def query_claimreview(claim: str, api_key: Optional[str]) -> List[Dict]:
+def _blocked_by_captcha(result_marker: str):
+    """Response check for search pages: a CAPTCHA/anomaly page instead of results is a failure."""
+    def is_blocked(response: httpx.Response) -> bool:
+        text = response.text
+        return result_marker not in text and ("captcha" in text.lower() or "anomaly" in text.lower())
+    return is_blocked
+
+
+@provider_cached("claimreview", ("claim",))
+async def query_claimreview(claim: str, api_key: Optional[str], client: Optional[httpx.AsyncClient] = None) -> List[Dict]:
     """
     Query Google Fact Check Tools API for ClaimReview matches - FILTERED BY TRUSTED FACT-CHECKERS ONLY.
     """
     if not api_key:
         return []
     
-    print(f"[Fact Check API] Filtering results by trusted fact-checkers only")
+    logger.debug("[Fact Check API] Filtering results by trusted fact-checkers only")
     
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(
-                "https://factchecktools.googleapis.com/v1alpha1/claims:search",
-                params={"query": claim, "key": api_key, "languageCode": "en"}
-            )
-            if resp.status_code != 200:
-                return []
-            
-            data = resp.json()
-            results = []
-            for item in data.get("claims", [])[:3]:
-                for review in item.get("claimReview", [])[:1]:
-                    url = review.get("url", "")
-                    # FILTER: Only add if fact-checker is in trusted sources list
-                    is_trusted, reliability = is_trusted_source(url, None, "international")
-                    if is_trusted:
-                        parsed_domain = urlparse(url).netloc
-                        print(f"✓ TRUSTED FACT-CHECKER: {parsed_domain} (reliability: {reliability})")
-                        results.append({
-                            "type": "claim_review",
-                            "source": review.get("publisher", {}).get("name", "Unknown"),
-                            "url": url,
-                            "rating": review.get("textualRating", ""),
-                            "reliability": reliability
-                        })
-                    else:
-                        parsed_domain = urlparse(url).netloc
-                        print(f"✗ BLOCKED FACT-CHECKER: {parsed_domain} (not in trusted list)")
-            return results
+        http = client or get_http_client()
+        resp = await breaker_get("claimreview", http,
+            "https://factchecktools.googleapis.com/v1alpha1/claims:search",
+            timeout=5.0,
+            params={"query": claim, "key": api_key, "languageCode": "en"}
+        )
+        if resp.status_code != 200:
+            return []
+        
+        data = resp.json()
+        results = []
+        for item in data.get("claims", [])[:3]:
+            for review in item.get("claimReview", [])[:1]:
+                url = review.get("url", "")
+                # FILTER: Only add if fact-checker is in trusted sources list
+                is_trusted, reliability = is_trusted_source(url, None, "international")
+                if is_trusted:
+                    parsed_domain = urlparse(url).netloc
+                    sampled_debug(logger, "TRUSTED FACT-CHECKER: %s (reliability: %s)", parsed_domain, reliability)
+                    results.append({
+                        "type": "claim_review",
+                        "source": review.get("publisher", {}).get("name", "Unknown"),
+                        "url": url,
+                        "rating": review.get("textualRating", ""),
+                        "reliability": reliability
+                    })
+                else:
+                    parsed_domain = urlparse(url).netloc
+                    sampled_debug(logger, "BLOCKED FACT-CHECKER: %s (not in trusted list)", parsed_domain)
+        return results
     except Exception:
         return []
 
 
-async def query_newsapi(query: str, country: Optional[str], api_key: Optional[str]) -> List[Dict]:
+@provider_cached("newsapi", ("query", "country"))
+async def query_newsapi(query: str, country: Optional[str], api_key: Optional[str], client: Optional[httpx.AsyncClient] = None) -> List[Dict]:
     """
     Query NewsAPI for articles - FILTERED BY TRUSTED SOURCES ONLY.
     """
     if not api_key:
         return []
     
-    print(f"[NewsAPI] Filtering results by trusted sources only")
+    logger.debug("[NewsAPI] Filtering results by trusted sources only")
 
     try:
         results = []
-        async with httpx.AsyncClient(timeout=10.0) as client:
-
-            # Strategy 1: Broader search - any news sources
-            resp = await client.get(
-                "https://newsapi.org/v2/everything",
-                params={
-                    "q": query,
-                    "language": "en",
-                    "sortBy": "relevancy",
-                    "pageSize": 15,  # Get more results
-                    "apiKey": api_key
-                }
-            )
-
-            if resp.status_code == 200:
-                data = resp.json()
-                for art in data.get("articles", [])[:10]:
-                    url = art.get("url", "")
-                    # FILTER: Only add if URL is from a trusted source
-                    is_trusted, reliability = is_trusted_source(url, country, "national")
-                    if is_trusted:
-                        parsed_domain = urlparse(url).netloc
-                        print(f"✓ TRUSTED (NewsAPI): {parsed_domain} (reliability: {reliability})")
-                        results.append({
-                            "title": art.get("title", ""),
-                            "url": url,
-                            "source": art.get("source", {}).get("name", "Unknown"),
-                            "description": art.get("description", ""),
-                            "reliability": reliability
-                        })
-                    else:
-                        parsed_domain = urlparse(url).netloc
-                        print(f"✗ BLOCKED (NewsAPI): {parsed_domain}")
-
-            # Strategy 2: Country-specific headlines if available
-            if country and len(results) < 5:
-                try:
-                    country_code = country.lower() if len(country) == 2 else None
-                    if country_code:
-                        resp = await client.get(
-                            "https://newsapi.org/v2/top-headlines",
-                            params={
-                                "q": query,
-                                "country": country_code,
-                                "pageSize": 10,
-                                "apiKey": api_key
-                            }
-                        )
-                        if resp.status_code == 200:
-                            data = resp.json()
-                            for art in data.get("articles", [])[:5]:
-                                url = art.get("url", "")
-                                # FILTER: Only add if URL is from a trusted source
-                                is_trusted, reliability = is_trusted_source(url, country, "national")
-                                if is_trusted:
-                                    parsed_domain = urlparse(url).netloc
-                                    print(f"✓ TRUSTED (NewsAPI Headlines): {parsed_domain}")
-                                    results.append({
-                                        "title": art.get("title", ""),
-                                        "url": url,
-                                        "source": art.get("source", {}).get("name", "Unknown"),
-                                        "description": art.get("description", ""),
-                                        "reliability": reliability
-                                    })
-                                else:
-                                    parsed_domain = urlparse(url).netloc
-                                    print(f"✗ BLOCKED (NewsAPI Headlines): {parsed_domain}")
-                except:
-                    pass
-
-            return results[:15]
-    except Exception as e:
-        print(f"NewsAPI error: {e}")
-        return []
-
-
-async def query_gdelt(query: str, country: Optional[str]) -> List[Dict]:
-    """
-    Query GDELT for articles using their free API - FILTERED BY TRUSTED SOURCES ONLY.
-    """
-    print(f"[GDELT] Filtering results by trusted sources only")
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # GDELT 2.0 DOC API
-            resp = await client.get(
-                "https://api.gdeltproject.org/api/v2/doc/doc",
-                params={
-                    "query": query,
-                    "mode": "artlist",
-                    "maxrecords": 10,
-                    "format": "json",
-                    "sort": "hybridrel"
-                }
-            )
-            if resp.status_code != 200:
-                return []
-            
+        http = client or get_http_client()
+
+        # Strategy 1: Broader search - any news sources
+        resp = await breaker_get("newsapi", http,
+            "https://newsapi.org/v2/everything",
+            timeout=10.0,
+            params={
+                "q": query,
+                "language": "en",
+                "sortBy": "relevancy",
+                "pageSize": 15,  # Get more results
+                "apiKey": api_key
+            }
+        )
+
+        if resp.status_code == 200:
             data = resp.json()
-            results = []
-            for art in data.get("articles", [])[:5]:
+            for art in data.get("articles", [])[:10]:
                 url = art.get("url", "")
                 # FILTER: Only add if URL is from a trusted source
                 is_trusted, reliability = is_trusted_source(url, country, "national")
                 if is_trusted:
                     parsed_domain = urlparse(url).netloc
-                    print(f"✓ TRUSTED (GDELT): {parsed_domain} (reliability: {reliability})")
+                    sampled_debug(logger, "TRUSTED (NewsAPI): %s (reliability: %s)", parsed_domain, reliability)
                     results.append({
                         "title": art.get("title", ""),
                         "url": url,
-                        "source": art.get("domain", "Unknown"),
-                        "description": art.get("title", ""),
+                        "source": art.get("source", {}).get("name", "Unknown"),
+                        "description": art.get("description", ""),
                         "reliability": reliability
                     })
                 else:
                     parsed_domain = urlparse(url).netloc
-                    print(f"✗ BLOCKED (GDELT): {parsed_domain}")
-            return results
+                    sampled_debug(logger, "BLOCKED (NewsAPI): %s", parsed_domain)
+
+        # Strategy 2: Country-specific headlines if available
+        if country and len(results) < 5:
+            try:
+                country_code = country.lower() if len(country) == 2 else None
+                if country_code:
+                    resp = await breaker_get("newsapi", http,
+                        "https://newsapi.org/v2/top-headlines",
+                        timeout=10.0,
+                        params={
+                            "q": query,
+                            "country": country_code,
+                            "pageSize": 10,
+                            "apiKey": api_key
+                        }
+                    )
+                    if resp.status_code == 200:
+                        data = resp.json()
+                        for art in data.get("articles", [])[:5]:
+                            url = art.get("url", "")
+                            # FILTER: Only add if URL is from a trusted source
+                            is_trusted, reliability = is_trusted_source(url, country, "national")
+                            if is_trusted:
+                                parsed_domain = urlparse(url).netloc
+                                sampled_debug(logger, "TRUSTED (NewsAPI Headlines): %s", parsed_domain)
+                                results.append({
+                                    "title": art.get("title", ""),
+                                    "url": url,
+                                    "source": art.get("source", {}).get("name", "Unknown"),
+                                    "description": art.get("description", ""),
+                                    "reliability": reliability
+                                })
+                            else:
+                                parsed_domain = urlparse(url).netloc
+                                sampled_debug(logger, "BLOCKED (NewsAPI Headlines): %s", parsed_domain)
+            except:
+                pass
+
+        return results[:15]
     except Exception as e:
-        print(f"GDELT error: {e}")
+        logger.warning("NewsAPI error: %s", e)
         return []
 
 
-async def search_web_fallback(query: str, country: str = None, scope: str = "national", state: str = None) -> List[Dict]:
+@provider_cached("gdelt", ("query", "country"))
+async def query_gdelt(query: str, country: Optional[str], client: Optional[httpx.AsyncClient] = None) -> List[Dict]:
+    """
+    Query GDELT for articles using their free API - FILTERED BY TRUSTED SOURCES ONLY.
+    """
+    logger.debug("[GDELT] Filtering results by trusted sources only")
+    try:
+        http = client or get_http_client()
+        # GDELT 2.0 DOC API
+        resp = await breaker_get("gdelt", http,
+            "https://api.gdeltproject.org/api/v2/doc/doc",
+            timeout=10.0,
+            params={
+                "query": query,
+                "mode": "artlist",
+                "maxrecords": 10,
+                "format": "json",
+                "sort": "hybridrel"
+            }
+        )
+        if resp.status_code != 200:
+            return []
+        
+        data = resp.json()
+        results = []
+        for art in data.get("articles", [])[:5]:
+            url = art.get("url", "")
+            # FILTER: Only add if URL is from a trusted source
+            is_trusted, reliability = is_trusted_source(url, country, "national")
+            if is_trusted:
+                parsed_domain = urlparse(url).netloc
+                sampled_debug(logger, "TRUSTED (GDELT): %s (reliability: %s)", parsed_domain, reliability)
+                results.append({
+                    "title": art.get("title", ""),
+                    "url": url,
+                    "source": art.get("domain", "Unknown"),
+                    "description": art.get("title", ""),
+                    "reliability": reliability
+                })
+            else:
+                parsed_domain = urlparse(url).netloc
+                sampled_debug(logger, "BLOCKED (GDELT): %s", parsed_domain)
+        return results
+    except Exception as e:
+        logger.warning("GDELT error: %s", e)
+        return []
+
+
+@provider_cached("web", ("query", "country", "scope", "state"))
+async def search_web_fallback(query: str, country: str = None, scope: str = "national", state: str = None, client: Optional[httpx.AsyncClient] = None) -> List[Dict]:
     """
     Search for sources from TRUSTED DOMAINS ONLY.
     For international scope, searches international news sources.
@@ -298,7 +407,7 @@ async def search_web_fallback(query: str, country: str = None, scope: str = "nat
     """
     results = []
     
-    print(f"[TRUSTED SOURCES ONLY] Starting web search with scope: {scope}" + (f", state: {state}" if state else ""))
+    logger.debug("[TRUSTED SOURCES ONLY] Starting web search with scope: %s, state: %s", scope, state)
 
     # Extract key terms only (first 5-7 important words) to avoid overly specific searches
     words = query.split()
@@ -326,59 +435,61 @@ async def search_web_fallback(query: str, country: str = None, scope: str = "nat
             f"{clean_query} {country}" if country else f"{clean_query} news",
         ]
 
-    print(f"Search queries (scope: {scope}): {search_queries}")
+    logger.debug("Search queries (scope: %s): %s", scope, search_queries)
 
     # Try multiple search engines and queries
     for search_query in search_queries[:2]:  # Limit to avoid too many requests
         try:
-            async with httpx.AsyncClient(timeout=12.0, follow_redirects=True) as client:
-                from bs4 import BeautifulSoup
-
-                print(f"Trying DuckDuckGo with: '{search_query}'")
-
-                resp = await client.get(
-                    "https://html.duckduckgo.com/html/",
-                    params={"q": search_query, "s": "0"},
-                    headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    }
-                )
-
-                if resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, 'html.parser')
-
-                    for result in soup.select('.result')[:8]:  # Get more results
-                        title_elem = result.select_one('.result__title')
-                        link_elem = result.select_one('.result__url')
-
-                        if title_elem and link_elem:
-                            url = link_elem.get('href', '')
-                            if url.startswith('//duckduckgo.com/l/?'):
-                                import urllib.parse
-                                parsed = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
-                                url = parsed.get('uddg', [''])[0]
-
-                            if url and url.startswith('http'):
-                                # FILTER: Only add if URL is from a trusted source
-                                is_trusted, reliability = is_trusted_source(url, country, scope, state)
-                                if is_trusted:
-                                    parsed_domain = urlparse(url).netloc
-                                    print(f"✓ TRUSTED source found: {parsed_domain} (reliability: {reliability})")
-                                    results.append({
-                                        "title": title_elem.get_text(strip=True)[:100],
-                                        "url": url,
-                                        "source": "Trusted Web Source",
-                                        "description": search_query,
-                                        "reliability": reliability
-                                    })
-                                else:
-                                    parsed_domain = urlparse(url).netloc
-                                    print(f"✗ BLOCKED untrusted source: {parsed_domain}")
-
-                print(f"DuckDuckGo found {len(results)} results for '{search_query}'")
+            http = client or get_http_client()
+            from bs4 import BeautifulSoup
+
+            sampled_debug(logger, "Trying DuckDuckGo with: '%s'", search_query)
+
+            resp = await breaker_get("duckduckgo", http,
+                "https://html.duckduckgo.com/html/",
+                is_blocked=_blocked_by_captcha("result__"),
+                timeout=12.0,
+                follow_redirects=True,
+                params={"q": search_query, "s": "0"},
+                headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                }
+            )
 
+            if resp.status_code == 200:
+                soup = BeautifulSoup(resp.text, 'html.parser')
+
+                for result in soup.select('.result')[:8]:  # Get more results
+                    title_elem = result.select_one('.result__title')
+                    link_elem = result.select_one('.result__url')
+
+                    if title_elem and link_elem:
+                        url = link_elem.get('href', '')
+                        if url.startswith('//duckduckgo.com/l/?'):
+                            import urllib.parse
+                            parsed = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+                            url = parsed.get('uddg', [''])[0]
+
+                        if url and url.startswith('http'):
+                            # FILTER: Only add if URL is from a trusted source
+                            is_trusted, reliability = is_trusted_source(url, country, scope, state)
+                            if is_trusted:
+                                parsed_domain = urlparse(url).netloc
+                                sampled_debug(logger, "TRUSTED source found: %s (reliability: %s)", parsed_domain, reliability)
+                                results.append({
+                                    "title": title_elem.get_text(strip=True)[:100],
+                                    "url": url,
+                                    "source": "Trusted Web Source",
+                                    "description": search_query,
+                                    "reliability": reliability
+                                })
+                            else:
+                                parsed_domain = urlparse(url).netloc
+                                sampled_debug(logger, "BLOCKED untrusted source: %s", parsed_domain)
+
+            logger.debug("DuckDuckGo found %d results for '%s'", len(results), search_query)
         except Exception as e:
-            print(f"DuckDuckGo error for '{search_query}': {e}")
+            logger.warning("DuckDuckGo error for '%s': %s", search_query, e)
 
         # If we got some results, break early
         if len(results) >= 5:
@@ -387,69 +498,71 @@ async def search_web_fallback(query: str, country: str = None, scope: str = "nat
     # If still no results, try even broader search (still filtered by trusted sources)
     if len(results) < 3:
         try:
-            print(f"Trying very broad search for '{clean_query}' (trusted sources only)...")
-            broad_results = await simple_web_search(clean_query, country or "", scope, state)
+            sampled_debug(logger, "Trying very broad search for '%s' (trusted sources only)...", clean_query)
+            broad_results = await simple_web_search(clean_query, country or "", scope, state, client=client)
             results.extend(broad_results[:10])
         except Exception as e:
-            print(f"Broad search error: {e}")
+            logger.warning("Broad search error: %s", e)
 
-    print(f"Total web search results: {len(results)}")
+    logger.debug("Total web search results: %d", len(results))
     return results[:15]
 
 
-async def simple_web_search(query: str, country: Optional[str], scope: str = "national", state: Optional[str] = None) -> List[Dict]:
+async def simple_web_search(query: str, country: Optional[str], scope: str = "national", state: Optional[str] = None, client: Optional[httpx.AsyncClient] = None) -> List[Dict]:
     """Simpler web search using direct search engines - FILTERED BY TRUSTED SOURCES ONLY."""
     results = []
-    print(f"[SIMPLE WEB SEARCH] Searching trusted sources only (scope: {scope})")
+    logger.debug("[SIMPLE WEB SEARCH] Searching trusted sources only (scope: %s)", scope)
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Try Bing search
-            resp = await client.get(
-                "https://www.bing.com/search",
-                params={"q": f"{query} news", "count": 10},
-                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            )
-
-            if resp.status_code == 200:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(resp.text, 'html.parser')
-
-                for result in soup.select('.b_algo')[:8]:
-                    title_elem = result.select_one('h2 a')
-                    link_elem = result.select_one('h2 a')
-                    snippet_elem = result.select_one('.b_caption p')
-
-                    if title_elem and link_elem:
-                        url = link_elem.get('href', '')
+        http = client or get_http_client()
+        # Try Bing search
+        resp = await breaker_get("bing", http,
+            "https://www.bing.com/search",
+            is_blocked=_blocked_by_captcha("b_algo"),
+            timeout=10.0,
+            params={"q": f"{query} news", "count": 10},
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        )
+
+        if resp.status_code == 200:
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(resp.text, 'html.parser')
+
+            for result in soup.select('.b_algo')[:8]:
+                title_elem = result.select_one('h2 a')
+                link_elem = result.select_one('h2 a')
+                snippet_elem = result.select_one('.b_caption p')
+
+                if title_elem and link_elem:
+                    url = link_elem.get('href', '')
+                    
+                    # Skip if it's a Bing internal link
+                    if not url or 'bing.com' in url.lower():
+                        continue
                         
-                        # Skip if it's a Bing internal link
-                        if not url or 'bing.com' in url.lower():
-                            continue
-                            
-                        # FILTER: Only add if URL is from a trusted source
-                        is_trusted, reliability = is_trusted_source(url, country, scope, state)
-                        if is_trusted:
-                            parsed_domain = urlparse(url).netloc
-                            print(f"✓ TRUSTED source found (Bing): {parsed_domain} (reliability: {reliability})")
-                            results.append({
-                                "title": title_elem.get_text(strip=True)[:100],
-                                "url": url,
-                                "source": "Trusted Web Source",
-                                "description": snippet_elem.get_text(strip=True)[:200] if snippet_elem else "",
-                                "reliability": reliability
-                            })
-                        else:
-                            parsed_domain = urlparse(url).netloc
-                            print(f"✗ BLOCKED untrusted source (Bing): {parsed_domain}")
-
+                    # FILTER: Only add if URL is from a trusted source
+                    is_trusted, reliability = is_trusted_source(url, country, scope, state)
+                    if is_trusted:
+                        parsed_domain = urlparse(url).netloc
+                        sampled_debug(logger, "TRUSTED source found (Bing): %s (reliability: %s)", parsed_domain, reliability)
+                        results.append({
+                            "title": title_elem.get_text(strip=True)[:100],
+                            "url": url,
+                            "source": "Trusted Web Source",
+                            "description": snippet_elem.get_text(strip=True)[:200] if snippet_elem else "",
+                            "reliability": reliability
+                        })
+                    else:
+                        parsed_domain = urlparse(url).netloc
+                        sampled_debug(logger, "BLOCKED untrusted source (Bing): %s", parsed_domain)
     except Exception as e:
-        print(f"Bing search error: {e}")
+        logger.warning("Bing search error: %s", e)
 
     return results
 
 
-async def search_wikipedia(query: str) -> List[Dict]:
+@provider_cached("wikipedia", ("query",))
+async def search_wikipedia(query: str, client: Optional[httpx.AsyncClient] = None) -> List[Dict]:
     """
     Search Wikipedia directly for historical events and facts.
     Returns articles that match the query.
@@ -473,56 +586,56 @@ async def search_wikipedia(query: str) -> List[Dict]:
     if not search_queries:
         search_queries.append(query[:50])
     
-    print(f"[WIKIPEDIA] Trying search strategies: {search_queries}")
+    logger.debug("[WIKIPEDIA] Trying search strategies: %s", search_queries)
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Try each search query until we get results
-            for search_query in search_queries:
-                print(f"[WIKIPEDIA] Searching for: '{search_query}'...")
-                
-                resp = await client.get(
-                    "https://en.wikipedia.org/w/api.php",
-                    params={
-                        "action": "query",
-                        "list": "search",
-                        "srsearch": search_query,
-                        "format": "json",
-                        "srlimit": 5
-                    }
-                )
+        http = client or get_http_client()
+        # Try each search query until we get results
+        for search_query in search_queries:
+            sampled_debug(logger, "[WIKIPEDIA] Searching for: '%s'...", search_query)
+            
+            resp = await breaker_get("wikipedia", http,
+                "https://en.wikipedia.org/w/api.php",
+                timeout=10.0,
+                params={
+                    "action": "query",
+                    "list": "search",
+                    "srsearch": search_query,
+                    "format": "json",
+                    "srlimit": 5
+                }
+            )
+            
+            if resp.status_code == 200:
+                data = resp.json()
+                search_results = data.get("query", {}).get("search", [])
                 
-                if resp.status_code == 200:
-                    data = resp.json()
-                    search_results = data.get("query", {}).get("search", [])
+                for item in search_results[:3]:
+                    title = item.get("title", "")
+                    pageid = item.get("pageid", "")
+                    snippet = item.get("snippet", "").replace("<span class='searchmatch'>", "").replace("</span>", "")
                     
-                    for item in search_results[:3]:
-                        title = item.get("title", "")
-                        pageid = item.get("pageid", "")
-                        snippet = item.get("snippet", "").replace("<span class='searchmatch'>", "").replace("</span>", "")
-                        
-                        url = f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
-                        
-                        print(f"✓ FOUND Wikipedia article: {title}")
-                        results.append({
-                            "title": f"Wikipedia: {title}",
-                            "url": url,
-                            "source": "Wikipedia",
-                            "description": snippet[:200],
-                            "reliability": 0.92,
-                            "type": "wikipedia"
-                        })
-                    
-                    if len(results) > 0:
-                        print(f"✓ Wikipedia found {len(results)} relevant articles")
-                        break  # Stop searching if we found results
-                    else:
-                        print(f"✗ No results for '{search_query}', trying next strategy...")
-            
-            if len(results) == 0:
-                print(f"✗ No Wikipedia articles found for any search strategy")
+                    url = f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
                     
+                    sampled_debug(logger, "FOUND Wikipedia article: %s", title)
+                    results.append({
+                        "title": f"Wikipedia: {title}",
+                        "url": url,
+                        "source": "Wikipedia",
+                        "description": snippet[:200],
+                        "reliability": 0.92,
+                        "type": "wikipedia"
+                    })
+                
+                if len(results) > 0:
+                    sampled_debug(logger, "Wikipedia found %d relevant articles", len(results))
+                    break  # Stop searching if we found results
+                else:
+                    sampled_debug(logger, "No results for '%s', trying next strategy...", search_query)
+        
+        if len(results) == 0:
+            sampled_debug(logger, "No Wikipedia articles found for any search strategy")
     except Exception as e:
-        print(f"Wikipedia search error: {e}")
+        logger.warning("Wikipedia search error: %s", e)
     
     return results
@@ -0,0 +1,269 @@
+"""
+Data-driven rules for /predict.
+
+The phrase tables, verdict tables, domain tiers and direct-announcement
+patterns live in a versioned JSON file (app/rules.json by default). The file
+is compiled once into an immutable RuleSet; reloads (admin endpoint or file
+watch) compile the new file completely before swapping the active reference,
+so a request always sees one consistent rule version and a broken file never
+replaces a working one.
+"""
+import os
+import logging
+import json
+import threading
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Set, Tuple
+
+from app.patterns import PhraseMatcher, RuleMatcher
+from app.trusted_sources import DomainInfo, TrustRecord, compile_trust_index, domain_info, set_trust_index_provider
+
+logger = logging.getLogger(__name__)
+
+RULES_PATH = os.getenv("RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.json"))
+try:
+    # Seconds between rules file mtime checks; 0 disables the watcher
+    RULES_WATCH_INTERVAL = float(os.getenv("RULES_WATCH_INTERVAL", "0"))
+except ValueError:
+    RULES_WATCH_INTERVAL = 0.0
+
+CLAIM_TABLES = (
+    "fake_patterns", "sports_events", "sports_results", "sports_keywords", "retirement_keywords",
+    "loss_keywords", "indian_cricket", "pakistan_league", "freebie_patterns", "reward_terms",
+    "vaccine_terms", "conspiracy_patterns", "space_missions", "legitimate_space_missions", "conspiracy_topics",
+)
+SOURCE_TABLES = ("debunk_keywords", "confirmation_words", "space_missions")
+VERDICT_TABLES = {
+    "international": ("official_orgs", "impossible", "reasonable_claims", "reporting_words"),
+    "national": ("fake_retirement", "reasonable_govt", "unrealistic_govt", "sensational", "real_news_patterns",
+                 "locations", "announcement_words", "positive_indicators", "negative_indicators"),
+}
+
+
+class AnnouncementRule(NamedTuple):
+    name: str
+    countries: Optional[frozenset]
+    path: str
+    type: str
+    title: str
+    description: str
+    patterns: Tuple[Tuple[str, str, Optional[str]], ...]
+    domain_by_country: Mapping[str, str]
+    default_domain: Optional[str]
+
+
+def _phrases(section: Mapping, key: str, where: str) -> Tuple[str, ...]:
+    value = section.get(key)
+    if not isinstance(value, list) or not all(isinstance(p, str) for p in value):
+        raise ValueError(f"rules: {where}.{key} must be a list of strings")
+    return tuple(value)
+
+
+def _pairs(data: Mapping, key: str) -> Tuple[Tuple[str, str], ...]:
+    value = data.get(key)
+    if not isinstance(value, list) or not all(isinstance(p, list) and len(p) == 2 for p in value):
+        raise ValueError(f"rules: {key} must be a list of [claim, article] pairs")
+    return tuple((str(a), str(b)) for a, b in value)
+
+
+def _announcement(entry: Mapping) -> AnnouncementRule:
+    try:
+        patterns = tuple((p[0], p[1], p[2] if len(p) > 2 else None) for p in entry["patterns"])
+        rule = AnnouncementRule(
+            name=entry["name"],
+            countries=frozenset(c.upper() for c in entry["countries"]) if entry.get("countries") else None,
+            path=entry["path"],
+            type=entry["type"],
+            title=entry["title"],
+            description=entry["description"],
+            patterns=patterns,
+            domain_by_country=MappingProxyType({k.upper(): v for k, v in entry.get("domain_by_country", {}).items()}),
+            default_domain=entry.get("default_domain"),
+        )
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"rules: invalid announcement group {entry.get('name', '?')}: {e}") from e
+    if any(domain is None for _, _, domain in patterns) and not (rule.default_domain or rule.domain_by_country):
+        raise ValueError(f"rules: announcement group {rule.name} needs a domain per pattern or a default_domain")
+    return rule
+
+
+class RuleSet:
+    """One compiled, read-only version of the rules file."""
+
+    def __init__(self, data: Mapping[str, Any], source: Optional[str] = None):
+        if not isinstance(data, Mapping) or not data.get("version"):
+            raise ValueError("rules: top-level object with a 'version' is required")
+        self.version = str(data["version"])
+        self.source = source
+        self.loaded_at = datetime.utcnow().isoformat() + "Z"
+
+        claim, source_section = data.get("claim", {}), data.get("source", {})
+        verdict = data.get("verdict", {})
+        self.contradiction_pairs = _pairs(data, "contradiction_pairs")
+        self.topic_mismatch_pairs = _pairs(data, "topic_mismatch_pairs")
+
+        # Everything matched against the claim text goes into one automaton
+        claim_tables = {name: _phrases(claim, name, "claim") for name in CLAIM_TABLES}
+        claim_tables["contradiction_claim"] = tuple(c for c, _ in self.contradiction_pairs)
+        claim_tables["topic_claim"] = tuple(c for c, _ in self.topic_mismatch_pairs)
+        for scope, names in VERDICT_TABLES.items():
+            for name in names:
+                claim_tables[f"{scope}.{name}"] = _phrases(verdict.get(scope, {}), name, f"verdict.{scope}")
+        claim_tables["negative_words"] = _phrases(verdict, "negative_words", "verdict")
+        self.claim_matcher = RuleMatcher(claim_tables)
+
+        # Everything matched against a source's title/description/URL goes into another
+        source_tables = {name: _phrases(source_section, name, "source") for name in SOURCE_TABLES}
+        source_tables["contradiction_article"] = tuple(a for _, a in self.contradiction_pairs)
+        source_tables["topic_article"] = tuple(a for _, a in self.topic_mismatch_pairs)
+        # Whether the article itself mentions the claim topic (tax claims: any tax/income mention)
+        source_tables["topic_mentions"] = claim_tables["topic_claim"] + ("tax", "income")
+        self.source_matcher = RuleMatcher(source_tables)
+
+        self.search_engines = _phrases(verdict, "search_engines", "verdict")
+
+        tiers = data.get("domain_tiers", {})
+        self.premium_domains = frozenset(_phrases(tiers, "premium", "domain_tiers"))
+        # The trusted-source tables and these tiers share one trie, also used by is_trusted_source
+        self.domain_index = compile_trust_index(
+            (domain, TrustRecord(category, 0.0))
+            for key, category in (("high", "tier_high"), ("medium", "tier_medium"),
+                                  ("generic_gov", "generic_gov"), ("health_authorities", "health_authority"))
+            for domain in _phrases(tiers, key, "domain_tiers")
+        )
+        self.lookup_domain = lru_cache(maxsize=4096)(self._lookup_domain)
+
+        if not isinstance(data.get("announcements"), list):
+            raise ValueError("rules: announcements must be a list of pattern groups")
+        self.announcements = tuple(_announcement(entry) for entry in data["announcements"])
+        self._announcement_matcher = PhraseMatcher(
+            phrase for rule in self.announcements for p1, p2, _ in rule.patterns for phrase in (p1, p2)
+        )
+
+    def scan_claim(self, text: str) -> Dict[str, Set[str]]:
+        """Claim-side tables (patterns, verdict tables, pair keys) matched in one pass."""
+        return self.claim_matcher.scan(text)
+
+    def scan_source(self, text: str) -> Dict[str, Set[str]]:
+        """Source-side tables (debunk keywords, pair keys, ...) matched in one pass."""
+        return self.source_matcher.scan(text)
+
+    def _lookup_domain(self, domain: str) -> DomainInfo:
+        """Scoring tier, reliability and country of a domain in O(labels)."""
+        return domain_info(self.domain_index.lookup(domain))
+
+    def match_announcement(self, query: str, country: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """First announcement pattern pair found in the query, as a synthetic source dict."""
+        found = self._announcement_matcher.find(query.lower())
+        if not found:
+            return None
+        country_upper = country.upper() if country else None
+        for rule in self.announcements:
+            if rule.countries is not None and country_upper not in rule.countries:
+                continue
+            for pattern1, pattern2, domain in rule.patterns:
+                if pattern1 in found and pattern2 in found:
+                    source_domain = domain or rule.domain_by_country.get(country_upper, rule.default_domain)
+                    fields = {"query": query[:100], "pattern1": pattern1, "pattern2": pattern2,
+                              "pattern1_title": pattern1.title()}
+                    return {
+                        'url': f'https://{source_domain}{rule.path}',
+                        'source': source_domain,
+                        'title': rule.title.format(**fields),
+                        'description': rule.description.format(**fields),
+                        'type': rule.type,
+                    }
+        return None
+
+    def info(self) -> Dict[str, Any]:
+        return {"version": self.version, "source": self.source, "loaded_at": self.loaded_at}
+
+
+def load_rules(path: Optional[str] = None) -> RuleSet:
+    """Read and compile a rules file. Raises ValueError/OSError on a bad file."""
+    path = path or RULES_PATH
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"rules: {path} is not valid JSON: {e}") from e
+    return RuleSet(data, source=path)
+
+
+_rules_lock = threading.Lock()
+_active_rules: Optional[RuleSet] = None
+_active_mtime: Optional[int] = None
+_watcher: Optional[threading.Thread] = None
+_watcher_stop = threading.Event()
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_rules() -> RuleSet:
+    """The active rule set (loaded on first use). Hold the returned object for a whole request."""
+    rules = _active_rules
+    if rules is None:
+        with _rules_lock:
+            if _active_rules is None:
+                _swap(load_rules(), RULES_PATH)
+            rules = _active_rules
+    return rules
+
+
+def _swap(rules: RuleSet, path: str):
+    global _active_rules, _active_mtime
+    _active_rules = rules
+    _active_mtime = _mtime(path)
+
+
+def reload_rules(path: Optional[str] = None) -> RuleSet:
+    """Compile the rules file and atomically make it active. On error the current set stays active."""
+    path = path or RULES_PATH
+    rules = load_rules(path)
+    with _rules_lock:
+        _swap(rules, path)
+    logger.info("Rules %s loaded from %s", rules.version, path)
+    return rules
+
+
+def _watch_loop(interval: float):
+    global _active_mtime
+    while not _watcher_stop.wait(interval):
+        mtime = _mtime(RULES_PATH)
+        if mtime is None or mtime == _active_mtime:
+            continue
+        try:
+            reload_rules()
+        except (OSError, ValueError) as e:
+            logger.warning("Rules reload failed, keeping version %s: %s", _active_rules.version if _active_rules else None, e)
+            # Don't retry the same broken file on every tick
+            _active_mtime = mtime
+
+
+def start_rules_watcher(interval: float = RULES_WATCH_INTERVAL):
+    """Reload the rules file whenever its mtime changes (no-op when interval is 0)."""
+    global _watcher
+    get_rules()
+    if interval <= 0 or (_watcher is not None and _watcher.is_alive()):
+        return
+    _watcher_stop.clear()
+    _watcher = threading.Thread(target=_watch_loop, args=(interval,), name="rules-watcher", daemon=True)
+    _watcher.start()
+
+
+def stop_rules_watcher():
+    global _watcher
+    _watcher_stop.set()
+    if _watcher is not None:
+        _watcher.join(timeout=5)
+    _watcher = None
+
+
+set_trust_index_provider(lambda: get_rules().domain_index)
@@ -1,7 +1,14 @@
 """
 Trusted news sources database - organized by country and region.
 Only these sources will be prioritized for fact-checking to ensure reliability.
+All tables are compiled into one suffix trie keyed by domain labels, so
+lookups cost O(labels) and match whole labels only. Each rule set (see
+app.rules) compiles these tables together with its /predict scoring tiers and
+serves the result as the active index, so one lookup answers tier,
+reliability and country.
 """
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
 
 TRUSTED_SOURCES = {
     "INTERNATIONAL": [
@@ -193,6 +200,170 @@ CORPORATE_DOMAINS = {
 }
 
 
+# Government portals that must not back Indian claims
+US_GOV_DOMAINS = ['whitehouse.gov', 'usa.gov', 'state.gov', 'defense.gov', 'cdc.gov',
+                  'congress.gov', 'opm.gov', 'senate.gov', 'house.gov']
+
+# Country owning each government suffix (used to report a gov domain's country)
+GOV_SUFFIX_COUNTRY = {
+    'gov': 'US', 'gov.in': 'IN', 'nic.in': 'IN', 'gov.uk': 'GB', 'parliament.uk': 'GB', 'gouv.fr': 'FR',
+    'elysee.fr': 'FR', 'go.jp': 'JP', 'go.kr': 'KR', 'gov.br': 'BR', 'gov.au': 'AU', 'govt.nz': 'NZ',
+    'gov.sg': 'SG', 'gc.ca': 'CA', 'canada.ca': 'CA', 'gov.cn': 'CN', 'bund.de': 'DE', 'gov.za': 'ZA',
+    'gov.ng': 'NG', 'gov.pk': 'PK', 'gov.bd': 'BD', 'gov.il': 'IL', 'gov.sa': 'SA', 'europa.eu': 'EU',
+}
+
+
+class TrustRecord(NamedTuple):
+    category: str            # gov, gov_suffix, corporate, fact_checker, international, global, national, regional, us_gov (app.rules adds the /predict tiers)
+    reliability: float
+    name: str = ""
+    country: Optional[str] = None
+    path: str = ""           # required URL path prefix (e.g. indiatoday.in/fact-check)
+    subdomains_only: bool = False
+
+
+class DomainInfo(NamedTuple):
+    reliability: float       # best reliability from the trusted-source tables, 0.0 if unknown
+    country: Optional[str]
+    is_gov: bool
+    tier: Optional[str]      # /predict scoring tier: "high", "medium" or None
+    is_health_authority: bool
+
+
+def normalize_host(url_or_host: str) -> str:
+    """Lowercase host of a URL (or bare host) without port, trailing dot or credentials."""
+    value = (url_or_host or "").strip().lower()
+    if "//" in value:
+        value = urlparse(value).netloc
+    else:
+        value = value.split("/", 1)[0]
+    value = value.rsplit("@", 1)[-1].split(":", 1)[0]
+    return value.rstrip(".")
+
+
+class DomainTrie:
+    """
+    Suffix trie over reversed domain labels: "news.bbc.co.uk" is stored under
+    uk -> co -> bbc -> news. A lookup walks the host's labels once and collects
+    the records of every registered suffix, so "sport.bbc.co.uk" matches
+    "bbc.co.uk" while "notbbc.co.uk" does not.
+    """
+
+    _RECORDS = None  # key under which a node keeps its records
+
+    def __init__(self):
+        self._root: Dict = {}
+
+    def add(self, domain: str, record: TrustRecord):
+        node = self._root
+        for label in reversed(normalize_host(domain).split(".")):
+            node = node.setdefault(label, {})
+        node.setdefault(self._RECORDS, []).append(record)
+
+    def lookup(self, host: str) -> List[TrustRecord]:
+        """Records of all registered suffixes of host, least specific first. O(labels)."""
+        labels = normalize_host(host).split(".")
+        node = self._root
+        matches: List[TrustRecord] = []
+        for depth, label in enumerate(reversed(labels), start=1):
+            node = node.get(label)
+            if node is None:
+                break
+            for record in node.get(self._RECORDS, ()):
+                if record.subdomains_only and depth == len(labels):
+                    continue
+                matches.append(record)
+        return matches
+
+
+def _gov_country(domain: str) -> Optional[str]:
+    labels = domain.split(".")
+    for i in range(len(labels)):
+        country = GOV_SUFFIX_COUNTRY.get(".".join(labels[i:]))
+        if country:
+            return country
+    return None
+
+
+def compile_trust_index(extra: Iterable[Tuple[str, TrustRecord]] = ()) -> DomainTrie:
+    """Compile every trusted-source table, plus ``extra`` (domain, record) pairs, into one suffix trie."""
+    index = DomainTrie()
+    for domain in GOV_DOMAINS:
+        index.add(domain, TrustRecord("gov", 0.97, country=_gov_country(domain)))
+    for suffix in GOV_TLD_SUFFIXES:
+        suffix = suffix.lstrip(".")
+        index.add(suffix, TrustRecord("gov_suffix", 0.97, country=_gov_country(suffix), subdomains_only=True))
+    for domain in CORPORATE_DOMAINS:
+        index.add(domain, TrustRecord("corporate", 0.95))
+    for source in FACT_CHECKERS:
+        domain, _, path = source["domain"].partition("/")
+        index.add(domain, TrustRecord("fact_checker", source["reliability"], source["name"], path="/" + path if path else ""))
+    for category, key in (("international", "INTERNATIONAL"), ("global", "GLOBAL")):
+        for source in TRUSTED_SOURCES.get(key, []):
+            index.add(source["domain"], TrustRecord(category, source["reliability"], source["name"]))
+    for country_code, country_data in TRUSTED_SOURCES.items():
+        if not isinstance(country_data, dict):
+            continue
+        for source in country_data.get("national", []):
+            index.add(source["domain"], TrustRecord("national", source["reliability"], source["name"], country_code))
+        for state_sources in country_data.get("regional", {}).values():
+            for source in state_sources:
+                index.add(source["domain"], TrustRecord("regional", source["reliability"], source["name"], country_code))
+    for domain in US_GOV_DOMAINS:
+        index.add(domain, TrustRecord("us_gov", 0.0, country="US"))
+    for domain, record in extra:
+        index.add(domain, record)
+    return index
+
+
+_BASE_INDEX = compile_trust_index()
+# app.rules installs a provider returning the active rule set's index (tables plus scoring tiers)
+_index_provider: Callable[[], DomainTrie] = lambda: _BASE_INDEX
+
+
+def get_trust_index() -> DomainTrie:
+    return _index_provider()
+
+
+def set_trust_index_provider(provider: Callable[[], DomainTrie]):
+    global _index_provider
+    _index_provider = provider
+
+
+def _first(matches: List[TrustRecord], category: str, country: Optional[str] = None, path: str = "") -> Optional[TrustRecord]:
+    """Most specific record of a category (optionally for a country / URL path)."""
+    for record in reversed(matches):
+        if record.category != category:
+            continue
+        if country is not None and record.country != country:
+            continue
+        if record.path and not path.startswith(record.path):
+            continue
+        return record
+    return None
+
+
+def domain_info(matches: List[TrustRecord]) -> DomainInfo:
+    """Reliability, country, government status and scoring tier from a domain's trie records."""
+    categories = {record.category for record in matches}
+    reliability = max((record.reliability for record in matches), default=0.0)
+    country = next((record.country for record in reversed(matches) if record.country), None)
+    # Generic tourism/info gov portals are never highly trusted
+    if "tier_high" in categories and "generic_gov" not in categories:
+        tier = "high"
+    elif "tier_medium" in categories:
+        tier = "medium"
+    else:
+        tier = None
+    return DomainInfo(
+        reliability=reliability,
+        country=country,
+        is_gov=bool(categories & {"gov", "gov_suffix"}),
+        tier=tier,
+        is_health_authority="health_authority" in categories,
+    )
+
+
 def is_trusted_source(url: str, country: str = None, scope: str = "national", state: str = None) -> tuple[bool, float]:
     """
     Check if a URL is from a trusted source.
@@ -207,84 +378,48 @@ def is_trusted_source(url: str, country: str = None, scope: str = "national", st
     if not url:
         return False, 0.0
     
-    url_lower = url.lower()
-    try:
-        from urllib.parse import urlparse
-        host = urlparse(url_lower).netloc
-    except Exception:
-        host = url_lower
+    host = normalize_host(url)
+    if not host:
+        return False, 0.0
+    path = urlparse(url.lower()).path if "//" in url else ""
+    matches = get_trust_index().lookup(host)
+    country_upper = country.upper() if country else None
 
     # Government portals: trust by explicit domain or by trusted TLD suffix
     # BUT filter by country to avoid US sources for Indian claims, etc.
-    if host:
-        # Country-specific filtering for government domains
-        if country:
-            country_upper = country.upper()
-            
-            # For Indian claims, block US/UK/EU government domains
-            if country_upper in ['IN', 'INDIA']:
-                us_gov_domains = ['whitehouse.gov', 'usa.gov', 'state.gov', 'defense.gov', 'cdc.gov', 
-                                  'congress.gov', 'opm.gov', 'senate.gov', 'house.gov']
-                if any(d in host for d in us_gov_domains):
-                    return False, 0.0
-                # Only accept .gov.in or Indian government domains
-                if not (host.endswith('.gov.in') or host.endswith('.nic.in') or any(d in host for d in ['pib.gov.in', 'india.gov.in', 'pmindia.gov.in'])):
-                    # Check if it's a US gov domain
-                    if '.gov' in host and not '.gov.in' in host:
-                        return False, 0.0
-        
-        # Exact domain or subdomain match
-        for d in GOV_DOMAINS:
-            if d in host:
-                return True, 0.97
-        # TLD suffix match (e.g., *.gov.in, *.go.jp)
-        for suf in GOV_TLD_SUFFIXES:
-            if host.endswith(suf):
-                return True, 0.97
-        
-        # Corporate domains: trust official company websites
-        for d in CORPORATE_DOMAINS:
-            if d in host:
-                return True, 0.95
-    
+    if country_upper in ('IN', 'INDIA'):
+        if _first(matches, "us_gov"):
+            return False, 0.0
+        # Only accept Indian government domains; block other governments' portals
+        labels = host.split(".")
+        is_indian_gov = _first(matches, "gov", "IN") or _first(matches, "gov_suffix", "IN")
+        if not is_indian_gov and ("gov" in labels or "govt" in labels):
+            return False, 0.0
+
+    for category, reliability in (("gov", 0.97), ("gov_suffix", 0.97), ("corporate", 0.95)):
+        if _first(matches, category):
+            return True, reliability
+
     # Check fact-checkers first (highest priority - always checked)
-    for source in FACT_CHECKERS:
-        if source["domain"] in url_lower:
-            return True, source["reliability"]
-    
+    record = _first(matches, "fact_checker", path=path)
+    if record:
+        return True, record.reliability
+
     # For international scope, prioritize international sources
     if scope == "international":
-        # Check international sources
-        for source in TRUSTED_SOURCES.get("INTERNATIONAL", []):
-            if source["domain"] in url_lower:
-                return True, source["reliability"]
-        
-        # Also check global sources
-        for source in TRUSTED_SOURCES.get("GLOBAL", []):
-            if source["domain"] in url_lower:
-                return True, source["reliability"]
-    
+        record = _first(matches, "international") or _first(matches, "global")
+        if record:
+            return True, record.reliability
+
     # Check global sources (always)
-    for source in TRUSTED_SOURCES.get("GLOBAL", []):
-        if source["domain"] in url_lower:
-            return True, source["reliability"]
-    
+    record = _first(matches, "global")
+    if record:
+        return True, record.reliability
+
     # Check country-specific sources (for national scope or if country provided)
-    if country:
-        country_upper = country.upper()
-        if country_upper in TRUSTED_SOURCES:
-            country_data = TRUSTED_SOURCES[country_upper]
-            
-            # Check national sources
-            for source in country_data.get("national", []):
-                if source["domain"] in url_lower:
-                    return True, source["reliability"]
-            
-            # Check regional sources
-            if "regional" in country_data:
-                for state_sources in country_data["regional"].values():
-                    for source in state_sources:
-                        if source["domain"] in url_lower:
-                            return True, source["reliability"]
+    if country_upper:
+        record = _first(matches, "national", country_upper) or _first(matches, "regional", country_upper)
+        if record:
+            return True, record.reliability
     
     return False, 0.0
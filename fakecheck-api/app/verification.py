@@ -0,0 +1,119 @@
+"""
+Body verification: stance of the top trusted evidence articles from their text.
+
+/predict decides stance from provider titles, descriptions and URLs. For the
+top-k trusted sources the article bodies are fetched concurrently (bounded per
+host) and run through the stance model (premise = article passages,
+hypothesis = the claim) within what is left of the request's time budget. A
+refuting body marks the source as refuting; a supporting one leaves the
+title-based decision, as do sources not verified in time.
+"""
+import os
+import logging
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from app.metrics import register_collector, stats_families
+from app.nli_model import classify_stance_async
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+# Trusted sources whose bodies are verified per request (0 disables the stage)
+BODY_VERIFY_TOP_K = max(0, _env_int("BODY_VERIFY_TOP_K", 3))
+# Concurrent body fetches per host, across requests of this worker
+BODY_VERIFY_PER_HOST = max(1, _env_int("BODY_VERIFY_PER_HOST", 2))
+# Upper bound for the stage, on top of the request's remaining budget
+BODY_VERIFY_MAX_SECONDS = _env_float("BODY_VERIFY_MAX_SECONDS", 6.0)
+# Stances scored below this stay with the title-based decision
+BODY_VERIFY_MIN_SCORE = _env_float("BODY_VERIFY_MIN_SCORE", 0.25)
+
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+_stats = {"requests": 0, "urls": 0, "verified": 0, "inconclusive": 0, "no_body": 0, "timed_out": 0, "failed": 0}
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    global _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore_loop is not loop:
+        # Semaphores belong to one event loop
+        _host_semaphores.clear()
+        _semaphore_loop = loop
+    host = urlparse(url).netloc.lower()
+    sem = _host_semaphores.get(host)
+    if sem is None:
+        sem = _host_semaphores[host] = asyncio.Semaphore(BODY_VERIFY_PER_HOST)
+    return sem
+
+
+async def verify_bodies(claim: str, urls: Sequence[str], budget: float,
+                        fetch: Callable[[str], Awaitable[Optional[str]]]) -> Dict[str, Tuple[str, float]]:
+    """
+    Fetch each URL's article text and classify it against the claim, all
+    concurrently, for at most ``budget`` seconds (capped by
+    BODY_VERIFY_MAX_SECONDS). Returns {url: (stance, score)} for the URLs that
+    finished in time with a conclusive stance; work still running is cancelled.
+    """
+    budget = min(budget, BODY_VERIFY_MAX_SECONDS)
+    if not urls or budget <= 0:
+        return {}
+    _stats["requests"] += 1
+    _stats["urls"] += len(urls)
+
+    async def verify(url: str) -> Optional[Tuple[str, float]]:
+        async with _host_semaphore(url):
+            body = await fetch(url)
+        if not body:
+            _stats["no_body"] += 1
+            return None
+        return await classify_stance_async(body, claim)
+
+    tasks = {asyncio.create_task(verify(url)): url for url in urls}
+    done, pending = await asyncio.wait(tasks, timeout=budget)
+    for task in pending:
+        task.cancel()
+    _stats["timed_out"] += len(pending)
+
+    results: Dict[str, Tuple[str, float]] = {}
+    for task in done:
+        url = tasks[task]
+        if task.exception() is not None:
+            logger.warning("Body verification failed for %s: %s", url, task.exception())
+            _stats["failed"] += 1
+            continue
+        result = task.result()
+        if result is None:
+            continue
+        stance, score = result
+        if stance == "neutral" or score < BODY_VERIFY_MIN_SCORE:
+            _stats["inconclusive"] += 1
+            continue
+        _stats["verified"] += 1
+        results[url] = (stance, score)
+    if pending:
+        logger.info("Body verification budget (%.1fs) hit; %d source(s) keep title-based stance", budget, len(pending))
+    return results
+
+
+def get_verification_stats() -> Dict[str, int]:
+    return dict(_stats)
+
+
+register_collector(lambda: stats_families("fakecheck_body_verification", _stats, counters=tuple(_stats),
+                                          documentation="Body verification counters"))
@@ -0,0 +1,118 @@
+"""
+Startup warm-up and readiness.
+
+With WARMUP_ON_STARTUP=true the lifespan starts a background warm-up that
+loads the NLI model, compiles the rule and domain indexes and runs a few dummy
+inferences. /health answers immediately; /ready returns 503 until the warm-up
+has finished, so a load balancer only routes traffic to warm workers. A model
+that fails to load (or an unreachable NLI_SERVER_SOCKET) keeps the worker
+unready in the "degraded" phase; the warm-up is retried every
+WARMUP_RETRY_SECONDS.
+"""
+import os
+import logging
+import time
+import asyncio
+from typing import Any, Dict, Optional
+
+from app import nli_model
+from app.rules import get_rules
+from app.trusted_sources import is_trusted_source
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true"
+try:
+    WARMUP_INFERENCES = max(0, int(os.getenv("WARMUP_INFERENCES", "3")))
+except ValueError:
+    WARMUP_INFERENCES = 3
+try:
+    WARMUP_RETRY_SECONDS = max(0.1, float(os.getenv("WARMUP_RETRY_SECONDS", "30")))
+except ValueError:
+    WARMUP_RETRY_SECONDS = 30.0
+
+_WARMUP_CLAIM = "Indian Railways announced mandatory Aadhaar verification for IRCTC tickets"
+_WARMUP_PREMISES = [
+    "The ministry confirmed Indian Railways will require Aadhaar verification on IRCTC bookings.",
+    "Fact-check: false. Indian Railways denied any Aadhaar requirement for IRCTC tickets.",
+]
+
+_state: Dict[str, Any] = {"ready": False, "phase": "starting", "error": None, "duration_s": None}
+_warmup_task: Optional[asyncio.Task] = None
+
+
+def warm_up(inferences: int = WARMUP_INFERENCES):
+    """Load and exercise everything the first /predict would otherwise build lazily."""
+    _state["phase"] = "rules"
+    rules = get_rules()
+    rules.scan_claim(_WARMUP_CLAIM.lower())
+    rules.scan_source(_WARMUP_PREMISES[0].lower())
+    rules.lookup_domain("pib.gov.in")
+    rules.match_announcement(_WARMUP_CLAIM, "IN")
+
+    _state["phase"] = "trusted_sources"
+    is_trusted_source("https://www.thehindu.com/news/", "IN")
+
+    if nli_model.NLI_SERVER_SOCKET:
+        # The model lives in the inference server; run_warmup checks it answers
+        return
+    _state["phase"] = "nli"
+    if nli_model.get_nli_pipeline() is None:
+        # get_nli_pipeline logs the cause; stances would come from the heuristic fallback
+        raise RuntimeError("NLI model not loaded")
+    for _ in range(inferences):
+        # Past the memo, so every pass is a forward pass and the memo metrics only count real requests
+        nli_model.classify_stances([(premise, _WARMUP_CLAIM) for premise in _WARMUP_PREMISES], use_memo=False)
+
+
+async def run_warmup(inferences: int = WARMUP_INFERENCES):
+    """
+    Warm up on the inference thread (the one that later owns the model), then mark
+    ready. Until it succeeds the worker stays unready and the warm-up is retried.
+    """
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(nli_model.get_inference_executor(), warm_up, inferences)
+            if nli_model.NLI_SERVER_SOCKET:
+                _state["phase"] = "nli_server"
+                await nli_model.get_inference_client().classify_pairs([(p, _WARMUP_CLAIM) for p in _WARMUP_PREMISES])
+            break
+        except Exception as e:
+            # A cold or model-less worker must not receive traffic: stay unready and try again
+            logger.warning("Warm-up failed during %s, not ready; retrying in %ss: %s", _state["phase"], WARMUP_RETRY_SECONDS, e)
+            _state.update(phase="degraded", error=f"{_state['phase']}: {e}")
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+    _state.update(error=None, duration_s=round(time.perf_counter() - start, 3))
+    logger.info("Warm-up finished in %ss", _state['duration_s'])
+    mark_ready()
+
+
+def start_warmup(enabled: Optional[bool] = None):
+    """Called from the lifespan: warm up in the background, or be ready immediately."""
+    global _warmup_task
+    _state.update(ready=False, phase="starting", error=None, duration_s=None)
+    if not (WARMUP_ON_STARTUP if enabled is None else enabled):
+        mark_ready()
+        return
+    _warmup_task = asyncio.get_running_loop().create_task(run_warmup())
+
+
+async def stop_warmup():
+    global _warmup_task
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+    _warmup_task = None
+
+
+def mark_ready():
+    _state.update(ready=True, phase="ready")
+
+
+def get_readiness() -> Dict[str, Any]:
+    return dict(_state)
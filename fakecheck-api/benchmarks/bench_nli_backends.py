@@ -0,0 +1,137 @@
+"""
+NLI backends compared: PyTorch text-classification pipeline vs int8 ONNX Runtime.
+
+Each backend runs in its own subprocess so peak RSS is measured separately.
+Reports load time, single-request latency (p50/p95), batched throughput,
+peak RSS, and how often the ONNX top label agrees with the PyTorch one.
+Export the ONNX model first (python -m app.nli_onnx export).
+
+    python benchmarks/bench_nli_backends.py [--iterations N] [--batch-size B]
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODEL = os.getenv("NLI_MODEL", "facebook/bart-large-mnli")
+
+PREMISES = [
+    "The Ministry of Railways confirmed that Aadhaar verification will be required for IRCTC tatkal bookings from July.",
+    "Fact-check: the viral message claiming free laptops for all students is false; no such scheme exists.",
+    "The Reserve Bank of India kept the repo rate unchanged at 6.5% at its policy meeting on Friday.",
+    "NASA said the Artemis II crew will fly around the Moon; claims of a hidden second mission are unfounded.",
+    "Punjab officials denied reports of a cash reward for farmers who stop burning stubble.",
+    "The WHO declared the outbreak a public health emergency of international concern after an emergency meeting.",
+    "Virat Kohli announced his retirement from Test cricket in a statement posted on social media.",
+    "No evidence supports the claim that the Taj Mahal will be painted gold, the ASI said.",
+    "The Election Commission announced the schedule for assembly elections in five states.",
+    "A government spokesperson said the new income tax slabs take effect from the next financial year.",
+    "Scientists reported that the claimed miracle cure showed no benefit in a controlled clinical trial.",
+    "ISRO successfully launched the communication satellite from Sriharikota on Wednesday morning.",
+]
+# Each premise is classified against the claim at the same index
+CLAIMS = [
+    "Aadhaar verification is mandatory for IRCTC tatkal bookings",
+    "The government is giving free laptops to all students",
+    "The RBI cut the repo rate on Friday",
+    "NASA is running a hidden second Moon mission",
+    "Punjab pays farmers a cash reward for not burning stubble",
+    "The WHO declared a public health emergency",
+    "Virat Kohli retired from Test cricket",
+    "The Taj Mahal will be painted gold",
+    "The Election Commission announced assembly election dates",
+    "New income tax slabs apply from the next financial year",
+    "A miracle cure was proven to work in a clinical trial",
+    "ISRO launched a communication satellite",
+]
+
+
+def _load(backend):
+    if backend == "onnx":
+        from app.nli_onnx import load_onnx_pipeline
+        return load_onnx_pipeline(MODEL)
+    from transformers import pipeline
+    return pipeline("text-classification", model=MODEL, device=-1)
+
+
+def worker(backend, iterations, batch_size):
+    start = time.perf_counter()
+    pipe = _load(backend)
+    load_seconds = time.perf_counter() - start
+
+    pairs = [{"text": premise, "text_pair": claim} for premise, claim in zip(PREMISES, CLAIMS)]
+
+    def run(batch):
+        return pipe(batch, top_k=None, truncation="only_first", batch_size=len(batch))
+
+    labels = [result[0]["label"].lower() for result in run(pairs)]  # also warms up
+
+    latencies = []
+    for _ in range(iterations):
+        for pair in pairs:
+            t = time.perf_counter()
+            run([pair])
+            latencies.append(time.perf_counter() - t)
+
+    batches = [pairs[i:i + batch_size] for i in range(0, len(pairs), batch_size)]
+    t = time.perf_counter()
+    for _ in range(iterations):
+        for batch in batches:
+            run(batch)
+    throughput = iterations * len(pairs) / (time.perf_counter() - t)
+
+    latencies.sort()
+    print(json.dumps({
+        "backend": backend,
+        "load_s": load_seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "throughput": throughput,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "labels": labels,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--worker", choices=["transformers", "onnx"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.iterations, args.batch_size)
+        return
+
+    results = {}
+    for backend in ("transformers", "onnx"):
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", backend, "--iterations", str(args.iterations),
+             "--batch-size", str(args.batch_size)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{backend}: failed\n{proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ''}")
+            continue
+        results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    print(f"model: {MODEL}, {len(PREMISES)} premise/claim pairs, batch size {args.batch_size}")
+    for name, r in results.items():
+        print(f"{name:12s}: load {r['load_s']:6.1f} s  p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms  "
+              f"{r['throughput']:6.1f} pairs/s  peak RSS {r['rss_mb']:7.0f} MB")
+    if len(results) == 2:
+        pt, ox = results["transformers"]["labels"], results["onnx"]["labels"]
+        agree = sum(a == b for a, b in zip(pt, ox))
+        print(f"label agreement: {agree}/{len(pt)} ({agree / len(pt):.0%})")
+        print(f"speedup: p50 {results['transformers']['p50_ms'] / results['onnx']['p50_ms']:.1f}x, "
+              f"throughput {results['onnx']['throughput'] / results['transformers']['throughput']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
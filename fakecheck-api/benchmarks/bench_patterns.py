@@ -0,0 +1,107 @@
+"""
+Per-source cost of the /predict keyword rules.
+
+"before" replays the previous per-source checks (one ``phrase in text`` scan
+per phrase, claim-side checks repeated for every source); "after" is one
+automaton pass over the source text plus set lookups.
+
+    python benchmarks/bench_patterns.py [--iterations N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import patterns  # noqa: E402
+from app.rules import get_rules  # noqa: E402
+
+rules = get_rules()
+CLAIM_TABLES = rules.claim_matcher.tables
+SOURCE_TABLES = rules.source_matcher.tables
+
+CLAIM = "punjab government announces reward for burning stubble, farmers to get ₹5 lakh cash reward"
+SOURCES = [
+    "punjab farmers get cash reward for not burning stubble, officials deny viral claim "
+    "the state agriculture department said farmers shunning stubble burning will be rewarded "
+    "https://www.hindustantimes.com/cities/chandigarh-news/punjab-reward-for-not-burning-stubble-101.html",
+    "stubble burning cases fall in punjab as air quality improves across the region this week "
+    "https://www.thehindu.com/news/national/punjab/stubble-burning-cases-fall/article1.ece",
+    "government scheme for crop residue management machines announced for small farmers "
+    "https://pib.gov.in/PressReleasePage.aspx?PRID=1990001",
+]
+
+KEY_PHRASES = [f"{a} {b}" for a, b in zip(CLAIM.split(), CLAIM.split()[1:]) if len(a) > 3]
+
+
+def before(source):
+    phrase_matches = sum(1 for phrase in KEY_PHRASES if phrase in source)
+    any(m in CLAIM and m in source for m in SOURCE_TABLES["space_missions"])
+    for claim_pattern, article_opposite in rules.contradiction_pairs:
+        if claim_pattern in CLAIM and article_opposite in source:
+            break
+    else:
+        for claim_topic, article_topic in rules.topic_mismatch_pairs:
+            if claim_topic in CLAIM and article_topic in source:
+                break
+    any(p in CLAIM for p in CLAIM_TABLES["conspiracy_patterns"])
+    any(k in source for k in SOURCE_TABLES["debunk_keywords"])
+    any(w in source for w in SOURCE_TABLES["confirmation_words"])
+    return phrase_matches
+
+
+def make_after(native):
+    source_matcher = patterns.RuleMatcher(SOURCE_TABLES, native=native)
+    phrase_matcher = patterns.PhraseMatcher(KEY_PHRASES, native=native)
+    claim_hits = rules.scan_claim(CLAIM)
+
+    def after(source):
+        found = phrase_matcher.find(source)
+        hits = source_matcher.scan(source)
+        phrase_matches = sum(1 for phrase in KEY_PHRASES if phrase in found)
+        bool(claim_hits["space_missions"] & hits["space_missions"])
+        for claim_pattern, article_opposite in rules.contradiction_pairs:
+            if claim_pattern in claim_hits["contradiction_claim"] and article_opposite in hits["contradiction_article"]:
+                break
+        else:
+            for claim_topic, article_topic in rules.topic_mismatch_pairs:
+                if claim_topic in claim_hits["topic_claim"] and article_topic in hits["topic_article"]:
+                    break
+        return phrase_matches
+
+    return after
+
+
+def per_source(fn, n):
+    return timeit.timeit(lambda: [fn(s) for s in SOURCES], number=n) / (n * len(SOURCES))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    base = per_source(before, args.iterations)
+    print(f"per source, phrase-by-phrase scans : {base * 1e6:7.1f} us")
+    backends = [("python", False)] + ([("pyahocorasick", True)] if patterns.ahocorasick else [])
+    for name, native in backends:
+        after = make_after(native)
+        assert [after(s) for s in SOURCES] == [before(s) for s in SOURCES]
+        cost = per_source(after, args.iterations)
+        print(f"per source, automaton ({name:13s}): {cost * 1e6:7.1f} us  ({base / cost:.1f}x)")
+
+    # Cost as the rule tables grow (e.g. a larger rules file): scans grow linearly, the automaton does not
+    print()
+    for size in (100, 1000, 5000):
+        phrases = list(SOURCE_TABLES["debunk_keywords"]) + [f"synthetic rule phrase {i}" for i in range(size)]
+        scan = per_source(lambda s: {p for p in phrases if p in s}, max(args.iterations // 10, 1))
+        line = f"{len(phrases):5d} phrases: scans {scan * 1e6:8.1f} us"
+        for name, native in backends:
+            matcher = patterns.PhraseMatcher(phrases, native=native)
+            line += f", {name} {per_source(matcher.find, max(args.iterations // 10, 1)) * 1e6:6.1f} us"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import asyncio
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app import main, near_dup
+from app.main import app
+
+HEADERS = {"X-Internal-API-Key": "batch-key"}
+
+
+def _patch(monkeypatch):
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "batch-key")
+    # Items differ only in a tag or URL; check each one from scratch
+    monkeypatch.setattr(near_dup, "_index", near_dup.NearDuplicateIndex())
+    calls = {"evidence": [], "article": []}
+
+    async def fake_gather_evidence(query, country, scope="national", **kwargs):
+        calls["evidence"].append(query)
+        await asyncio.sleep(0.05)
+        empty = {name: [] for name in ("claimreview", "newsapi", "gdelt", "web", "wikipedia")}
+        return {"results": empty, "timed_out": []}
+
+    async def fake_fetch(url, client=None):
+        calls["article"].append(url)
+        return f"Officials in Delhi confirmed the new metro line report {url}"
+
+    monkeypatch.setattr(main, "gather_evidence", fake_gather_evidence)
+    monkeypatch.setattr(main, "fetch_article_text_async", fake_fetch)
+    return calls
+
+
+def test_batch_results_in_input_order_with_item_errors(monkeypatch):
+    _patch(monkeypatch)
+    tag = uuid.uuid4().hex
+    items = [
+        {"text": f"Officials confirmed a new bridge {tag}", "country": "IN"},
+        {"country": "IN"},
+        {"text": f"Officials confirmed a new school {tag}", "scope": "national"},
+        {"text": f"Officials confirmed a new hospital {tag}", "country": "IN"},
+    ]
+    r = TestClient(app).post("/predict/batch", headers=HEADERS, json={"items": items})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [item["index"] for item in results] == [0, 1, 2, 3]
+    assert results[0]["result"]["verdict"] in {"likely_real", "likely_fake", "not_enough_info"}
+    assert results[1]["error"]["status_code"] == 400 and results[1]["result"] is None
+    assert "Country is required" in results[2]["error"]["detail"]
+    assert results[3]["result"] is not None
+
+
+def test_batch_deduplicates_texts_urls_and_claims(monkeypatch):
+    calls = _patch(monkeypatch)
+    tag = uuid.uuid4().hex
+    text = f"Officials confirmed the new metro line {tag}"
+    url = f"https://news.example.com/{tag}"
+    items = [
+        {"text": text, "country": "IN"},
+        {"text": text, "country": "IN"},                      # identical item
+        {"text": text, "country": "IN", "state": "Punjab"},   # same claim, different cache key
+        {"url": url, "country": "IN"},
+        {"url": url, "country": "IN", "state": "Delhi"},      # same URL fetched once
+    ]
+    r = TestClient(app).post("/predict/batch", headers=HEADERS, json={"items": items})
+    results = r.json()["results"]
+    assert all(item["result"] for item in results)
+    assert results[0]["result"] == results[1]["result"]
+    assert calls["article"] == [url]
+    # one fan-out for the shared text claim, one for the URL's claim
+    assert len(calls["evidence"]) == 2
+
+
+def test_batch_requires_auth_and_limits_size(monkeypatch):
+    _patch(monkeypatch)
+    client = TestClient(app)
+    assert client.post("/predict/batch", json={"items": []}).status_code == 401
+    monkeypatch.setattr(main, "BATCH_MAX_ITEMS", 2)
+    items = [{"text": "x", "country": "IN"}] * 3
+    assert client.post("/predict/batch", headers=HEADERS, json={"items": items}).status_code == 413
+
+
+def test_cancelled_batch_does_not_fail_a_coalesced_predict(monkeypatch):
+    calls = _patch(monkeypatch)
+    item = main.PredictRequest(url=f"https://news.example.com/{uuid.uuid4().hex}", country="IN")
+
+    async def run():
+        batch = asyncio.create_task(main.predict_batch(main.BatchPredictRequest(items=[item]), "batch-key"))
+        await asyncio.sleep(0.01)
+        # A plain /predict for the same item joins the batch item's computation
+        single = asyncio.create_task(main._predict_one(item))
+        await asyncio.sleep(0.01)
+        batch.cancel()  # the batch client went away
+        return await single
+
+    result = asyncio.run(run())
+    assert result.verdict in {"likely_real", "likely_fake", "not_enough_info"}
+    assert len(calls["evidence"]) == 1
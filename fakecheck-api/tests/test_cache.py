@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from app.cache import LRUCache, coalesce
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_limit_is_enforced():
+    cache = LRUCache(max_entries=100, max_bytes=50)
+    for i in range(10):
+        cache.set(f"k{i}", "x" * 10)
+    stats = cache.stats()
+    assert stats["bytes"] <= 50
+    assert stats["entries"] < 10
+    assert cache.get("k9") == "x" * 10
+
+
+def test_ttl_expiry_and_sweep():
+    cache = LRUCache(max_entries=10)
+    cache.set("short", {"v": 1}, ttl=0.05)
+    cache.set("long", {"v": 2}, ttl=60)
+    time.sleep(0.1)
+    assert cache.sweep() == 1
+    assert len(cache) == 1
+    assert cache.get("short") is None
+    assert cache.get("long") == {"v": 2}
+
+
+def test_stats_track_hits_and_misses():
+    cache = LRUCache(max_entries=10)
+    cache.set("k", "v")
+    cache.get("k")
+    cache.get("missing")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_coalesce_shares_one_computation():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"verdict": "likely_fake"}
+
+    async def run():
+        return await asyncio.gather(*(coalesce("fakecheck:same", compute) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r == {"verdict": "likely_fake"} for r in results)
+
+
+def test_coalesce_survives_cancelled_caller():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(coalesce("fakecheck:cancel", compute))
+        second = asyncio.create_task(coalesce("fakecheck:cancel", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first
+
+    result, first = asyncio.run(run())
+    assert result == "done"
+    assert first.cancelled()
+    assert len(calls) == 1
@@ -0,0 +1,111 @@
+import asyncio
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.cache import SharedCache, SQLiteCacheBackend, RedisCacheBackend
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    """Minimal Redis-protocol stand-in: GET, SET (with EX) and +OK for anything else."""
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:].strip())
+        parts = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:].strip())
+            parts.append(self.rfile.read(length + 2)[:-2])
+        return parts
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            name = command[0].upper()
+            if name == b"GET":
+                value = store.get(command[1])
+                if value is None:
+                    self.wfile.write(b"$-1\r\n")
+                else:
+                    self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+            elif name == b"SET":
+                store[command[1]] = command[2]
+                self.wfile.write(b"+OK\r\n")
+            else:
+                self.wfile.write(b"+OK\r\n")
+
+
+@pytest.fixture
+def resp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RespHandler)
+    server.daemon_threads = True
+    server.store = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a = SharedCache(SQLiteCacheBackend(path))
+    worker_b = SharedCache(SQLiteCacheBackend(path))
+
+    worker_a.set("fakecheck:k", {"verdict": "likely_fake"}, ttl=60)
+    worker_a.flush()
+
+    value, remaining = worker_b.get("fakecheck:k")
+    assert value == {"verdict": "likely_fake"}
+    assert 0 < remaining <= 60
+
+
+def test_redis_backend_against_local_server(resp_server):
+    pytest.importorskip("redis")
+    host, port = resp_server.server_address
+    cache = SharedCache(RedisCacheBackend(f"redis://{host}:{port}/0"))
+
+    assert cache.get("fakecheck:missing") is None
+    cache.set("fakecheck:k", {"verdict": "likely_real"}, ttl=60)
+    cache.flush()
+
+    value, _ = cache.get("fakecheck:k")
+    assert value == {"verdict": "likely_real"}
+
+
+def test_unreachable_backend_falls_back_to_miss():
+    pytest.importorskip("redis")
+    cache = SharedCache(RedisCacheBackend("redis://127.0.0.1:1/0", timeout=0.05), retry_seconds=60)
+
+    started = time.monotonic()
+    assert cache.get("fakecheck:k") is None
+    assert cache.get("fakecheck:k") is None
+    assert time.monotonic() - started < 1.0
+    assert not cache.healthy
+    assert cache.stats()["errors"] == 1
+    cache.set("fakecheck:k", {"verdict": "likely_fake"}, ttl=60)
+    assert cache.stats()["dropped_writes"] == 1
+
+
+def test_async_reads_run_off_the_event_loop(tmp_path):
+    threads = []
+
+    class Backend(SQLiteCacheBackend):
+        def get(self, key):
+            threads.append(threading.current_thread())
+            return super().get(key)
+
+    cache = SharedCache(Backend(str(tmp_path / "cache.sqlite3")))
+    cache.set("fakecheck:k", {"verdict": "likely_fake"}, ttl=60)
+    cache.flush()
+
+    value, _ = asyncio.run(cache.aget("fakecheck:k"))
+    assert value == {"verdict": "likely_fake"}
+    assert threads and threads[0] is not threading.main_thread()
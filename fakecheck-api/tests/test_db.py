@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app import db
+from app.db import MongoHealth
+from app.main import SOURCES, app
+
+HEADERS = {"X-Internal-API-Key": "db-key"}
+
+
+def test_health_backs_off_exponentially_up_to_the_cap(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(db.time, "monotonic", lambda: now[0])
+    health = MongoHealth(retry_seconds=5, retry_max_seconds=30)
+
+    delays = []
+    for _ in range(5):
+        health.mark_down(ConnectionError("refused"))
+        delays.append(health.retry_in())
+    assert delays == [5, 10, 20, 30, 30]
+    assert not health.healthy and health.last_error == "refused"
+
+    health.mark_up()
+    health.mark_down(ConnectionError("refused"))
+    assert health.retry_in() == 5
+
+
+def test_unreachable_mongo_is_bypassed_without_waiting(monkeypatch):
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "db-key")
+    # Nothing listens on port 1
+    monkeypatch.setenv("MONGO_URI", "mongodb://127.0.0.1:1/securenest")
+    monkeypatch.setattr(db, "MONGO_TIMEOUT_MS", 100)
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 5
+        while client.get("/health").json()["mongo"].get("failures", 0) == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        mongo = client.get("/health").json()["mongo"]
+        assert mongo["configured"] and not mongo["healthy"] and mongo["failures"] >= 1
+        assert db.get_db() is None
+
+        # Served from the built-in list without another server selection attempt
+        r = client.get("/sources", headers=HEADERS)
+        assert r.status_code == 200 and r.json() == {"sources": SOURCES}
+    assert db._client is None
+
+
+def test_ensure_indexes_creates_the_sources_indexes():
+    created = []
+
+    class Collection:
+        def __init__(self, name):
+            self.name = name
+
+        async def create_index(self, keys, **options):
+            created.append((self.name, keys, options))
+
+    class Database:
+        def __getitem__(self, name):
+            return Collection(name)
+
+    asyncio.run(db.ensure_indexes(Database()))
+    assert ("sources", [("domain", 1)], {"unique": True}) in created
+    assert ("sources", [("country_code", 1)], {}) in created
+    assert ("sources", [("regions", 1)], {}) in created
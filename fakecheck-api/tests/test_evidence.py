@@ -0,0 +1,106 @@
+import asyncio
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app import evidence, http_client, main
+from app.main import app
+
+
+def _provider(results, delay=0.0, calls=None, name=None):
+    async def run(*args, **kwargs):
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        return list(results)
+    return run
+
+
+def _patch_providers(monkeypatch, **overrides):
+    calls = []
+    defaults = {
+        "query_claimreview": ([], 0.0),
+        "query_newsapi": ([], 0.0),
+        "query_gdelt": ([], 0.0),
+        "search_web_fallback": ([], 0.0),
+        "search_wikipedia": ([], 0.0),
+    }
+    defaults.update(overrides)
+    for attr, (results, delay) in defaults.items():
+        monkeypatch.setattr(evidence, attr, _provider(results, delay, calls, attr))
+    return calls
+
+
+def test_core_providers_run_concurrently(monkeypatch):
+    _patch_providers(
+        monkeypatch,
+        query_claimreview=([{"url": "a"}], 0.2),
+        query_newsapi=([{"url": "b"}], 0.2),
+        query_gdelt=([{"url": "c"}], 0.2),
+    )
+    started = time.monotonic()
+    out = asyncio.run(evidence.gather_evidence("claim", "IN", deadline=5))
+    assert time.monotonic() - started < 0.5
+    assert out["timed_out"] == []
+    assert len(out["results"]["newsapi"]) == 1
+
+
+def test_fallbacks_skipped_when_core_is_sufficient(monkeypatch):
+    calls = _patch_providers(monkeypatch, query_newsapi=([{"url": "a"}, {"url": "b"}, {"url": "c"}], 0.0))
+    out = asyncio.run(evidence.gather_evidence("claim", "IN", deadline=5))
+    assert "search_web_fallback" not in calls
+    assert "search_wikipedia" not in calls
+    assert out["results"]["web"] == []
+
+
+def test_fallbacks_chain_when_core_is_scarce(monkeypatch):
+    calls = _patch_providers(monkeypatch, search_wikipedia=([{"url": "w"}], 0.0))
+    out = asyncio.run(evidence.gather_evidence("claim", None, "international", deadline=5))
+    assert calls.index("search_web_fallback") < calls.index("search_wikipedia")
+    assert out["results"]["wikipedia"] == [{"url": "w"}]
+
+
+def test_deadline_cancels_slow_providers(monkeypatch):
+    _patch_providers(
+        monkeypatch,
+        query_newsapi=([{"url": "a"}, {"url": "b"}, {"url": "c"}], 0.0),
+        query_gdelt=([{"url": "slow"}], 5.0),
+    )
+    started = time.monotonic()
+    out = asyncio.run(evidence.gather_evidence("claim", "IN", deadline=0.2))
+    assert time.monotonic() - started < 1.0
+    assert out["timed_out"] == ["gdelt"]
+    assert out["results"]["gdelt"] == []
+    assert len(out["results"]["newsapi"]) == 3
+
+
+def test_lazy_http_client_is_reused_per_loop_and_closed_with_it():
+    async def use():
+        client = http_client.get_http_client()
+        assert http_client.get_http_client() is client
+        return client
+
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+    # A new loop gets its own client; the previous one was closed when its loop shut down
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+def test_predict_does_not_cache_verdicts_on_partial_evidence(monkeypatch):
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "evidence-key")
+    calls = []
+
+    async def fake_gather_evidence(query, country, scope="national", **kwargs):
+        calls.append(query)
+        return {"results": {name: [] for name in evidence.PROVIDERS}, "timed_out": ["gdelt"]}
+
+    monkeypatch.setattr(main, "gather_evidence", fake_gather_evidence)
+    client = TestClient(app)
+    payload = {"text": f"Officials confirmed a new metro line in Delhi {uuid.uuid4().hex}", "country": "IN"}
+    for _ in range(2):
+        r = client.post("/predict", headers={"X-Internal-API-Key": "evidence-key"}, json=payload)
+        assert r.json()["timed_out_providers"] == ["gdelt"]
+    # The second request is checked again rather than served the partial verdict
+    assert len(calls) == 2
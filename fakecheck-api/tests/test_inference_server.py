@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app import nli_model
+from app.cache import LRUCache
+from app.inference_server import InferenceServer
+from app.nli_model import InferenceClient, StanceBatcher
+
+CLAIM = "Indian Railways announced mandatory Aadhaar verification for IRCTC tickets"
+SUPPORTING = "The ministry confirmed Indian Railways will require Aadhaar verification on IRCTC bookings."
+REFUTING = "Fact-check: false. Indian Railways denied any Aadhaar requirement for IRCTC tickets."
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memo(monkeypatch):
+    monkeypatch.setattr(nli_model, "_stance_memo", LRUCache(max_entries=100, sizeof=lambda value: 0))
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "nli.sock")
+
+
+def test_client_round_trip_batches_across_connections(monkeypatch, socket_path):
+    calls = []
+
+    def pipe(inputs, **kwargs):
+        calls.append(len(inputs))
+        return [[{"label": "contradiction" if "false" in item["text"].lower() else "entailment", "score": 0.9}]
+                for item in inputs]
+
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: pipe)
+
+    async def run():
+        server = InferenceServer(socket_path, StanceBatcher(max_batch=16, max_wait_ms=50))
+        await server.start()
+        clients = [InferenceClient(socket_path), InferenceClient(socket_path)]
+        try:
+            return await asyncio.gather(
+                clients[0].classify_pairs([(SUPPORTING, CLAIM), (REFUTING, CLAIM)]),
+                clients[1].classify_pairs([(f"{REFUTING} Again.", CLAIM)]),
+                clients[0].classify_pairs([("", CLAIM)]),
+            )
+        finally:
+            for client in clients:
+                await client.close()
+            await server.close()
+
+    first, second, empty = asyncio.run(run())
+    assert [stance for stance, _ in first] == ["supports", "refutes"]
+    assert second[0][0] == "refutes"
+    assert empty == [("neutral", 0.0)]
+    # three requests from two connections went through the model as one batch
+    assert calls == [3]
+
+
+def test_worker_batcher_falls_back_to_heuristic_when_server_is_down(monkeypatch, socket_path):
+    monkeypatch.setattr(nli_model, "_inference_client", InferenceClient(socket_path, timeout=1))
+
+    def no_local_model():
+        raise AssertionError("worker must not load the model")
+
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", no_local_model)
+
+    async def run():
+        batcher = StanceBatcher(max_batch=8, max_wait_ms=1, classify=nli_model._classify_remote)
+        try:
+            return await asyncio.gather(batcher.classify(SUPPORTING, CLAIM), batcher.classify(REFUTING, CLAIM))
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(run())
+    assert [stance for stance, _ in results] == ["supports", "refutes"]
+    assert nli_model._inference_client.failures == 1
@@ -0,0 +1,88 @@
+import json
+import queue
+import logging
+import contextvars
+
+from fastapi.testclient import TestClient
+
+from app import logging_config
+from app.logging_config import JsonFormatter, NonBlockingQueueHandler, RequestContextFilter, sampled_debug, start_request
+from app.main import app
+
+
+def _queued_logger(name, maxsize=100):
+    log_queue = queue.Queue(maxsize)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger, handler, log_queue
+
+
+def _drain(log_queue):
+    records = []
+    while not log_queue.empty():
+        records.append(log_queue.get_nowait())
+    return records
+
+
+def test_json_lines_carry_request_id_and_fields():
+    logger, _, log_queue = _queued_logger("app.test_json")
+
+    def in_request():
+        start_request("req-123")
+        logger.info("Final verdict: %s", "likely_real", extra={"confidence": 0.8})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+
+    contextvars.copy_context().run(in_request)
+    lines = [json.loads(JsonFormatter().format(r)) for r in _drain(log_queue)]
+
+    assert lines[0]["msg"] == "Final verdict: likely_real"
+    assert lines[0]["request_id"] == "req-123"
+    assert lines[0]["confidence"] == 0.8
+    assert lines[0]["level"] == "INFO" and lines[0]["logger"] == "app.test_json"
+    assert lines[1]["level"] == "ERROR" and "ValueError: boom" in lines[1]["exc"]
+
+
+def test_sampled_debug_follows_the_request_sampling_decision(monkeypatch):
+    logger, _, log_queue = _queued_logger("app.test_sampling")
+
+    def request(rate):
+        monkeypatch.setattr(logging_config, "LOG_SAMPLE_RATE", rate)
+        start_request()
+        for i in range(5):
+            sampled_debug(logger, "Source: %s", f"site{i}.com", domain=f"site{i}.com")
+
+    contextvars.copy_context().run(request, 0.0)
+    assert _drain(log_queue) == []
+
+    contextvars.copy_context().run(request, 1.0)
+    records = _drain(log_queue)
+    # A sampled request keeps all of its per-source traces
+    assert [r.domain for r in records] == [f"site{i}.com" for i in range(5)]
+    assert all(r.levelno == logging.DEBUG for r in records)
+
+    logger.setLevel(logging.INFO)
+    contextvars.copy_context().run(request, 1.0)
+    assert _drain(log_queue) == []
+
+
+def test_full_queue_drops_instead_of_blocking():
+    logger, handler, log_queue = _queued_logger("app.test_drop", maxsize=2)
+    for i in range(5):
+        logger.warning("record %d", i)
+    assert log_queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_request_id_header_is_echoed_or_generated():
+    with TestClient(app) as client:
+        r = client.get("/health", headers={"X-Request-ID": "abc-123"})
+        assert r.headers["X-Request-ID"] == "abc-123"
+        generated = client.get("/health").headers["X-Request-ID"]
+        assert len(generated) == 16 and generated != "abc-123"
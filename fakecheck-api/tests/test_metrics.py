@@ -0,0 +1,103 @@
+import asyncio
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app import evidence, main, metrics, near_dup
+from app.main import app
+from app.metrics import Counter, Histogram, STAGE_SECONDS
+
+HEADERS = {"X-Internal-API-Key": "metrics-key"}
+
+
+def _unregister(*collected):
+    for metric in collected:
+        metrics._metrics.remove(metric)
+
+
+def test_histogram_and_counter_text_format():
+    hist = Histogram("test_latency_seconds", "Test latency", ("stage",), buckets=(0.1, 1.0))
+    counter = Counter("test_events_total", "Test events", ("kind",))
+    try:
+        hist.observe(0.05, stage="a")
+        hist.observe(0.5, stage="a")
+        hist.observe(5.0, stage="a")
+        counter.inc(kind='say "hi"\n')
+        text = metrics.render()
+    finally:
+        _unregister(hist, counter)
+
+    assert "# TYPE test_latency_seconds histogram" in text
+    # Buckets are cumulative and end with +Inf
+    assert 'test_latency_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{stage="a",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_sum{stage="a"} 5.55' in text
+    assert 'test_latency_seconds_count{stage="a"} 3' in text
+    assert 'test_events_total{kind="say \\"hi\\"\\n"} 1' in text
+
+
+def test_predict_stages_metrics_and_server_timing(monkeypatch):
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "metrics-key")
+    monkeypatch.setattr(main, "SERVER_TIMING", True)
+    monkeypatch.setattr(near_dup, "_index", near_dup.NearDuplicateIndex())
+
+    async def fake_gather_evidence(query, country, scope="national", **kwargs):
+        await asyncio.sleep(0.01)
+        empty = {name: [] for name in evidence.PROVIDERS}
+        return {"results": empty, "timed_out": []}
+
+    async def fake_fetch(url, client=None):
+        return f"Officials in Delhi confirmed the new metro line {url}"
+
+    monkeypatch.setattr(main, "gather_evidence", fake_gather_evidence)
+    monkeypatch.setattr(main, "fetch_article_text_async", fake_fetch)
+    before = STAGE_SECONDS.count(stage="scoring")
+
+    client = TestClient(app)
+    r = client.post("/predict", headers=HEADERS,
+                    json={"url": f"https://example.com/{uuid.uuid4().hex}", "country": "IN"})
+    assert r.status_code == 200
+    timing = dict(entry.split(";dur=") for entry in r.headers["Server-Timing"].split(", "))
+    assert {"fetch_article_text", "extract_candidate_claims", "evidence", "scoring", "total"} <= set(timing)
+    assert float(timing["evidence"]) >= 10.0
+    assert STAGE_SECONDS.count(stage="scoring") == before + 1
+
+    client.get(f"/no-such-page/{uuid.uuid4().hex}")
+    r = client.get("/metrics", headers=HEADERS)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert 'fakecheck_stage_seconds_count{stage="fetch_article_text"}' in r.text
+    assert 'fakecheck_http_request_seconds_count{method="POST",path="/predict",status="200"}' in r.text
+    assert 'fakecheck_http_request_seconds_count{method="GET",path="other",status="404"}' in r.text
+    assert 'fakecheck_cache_misses_total{cache="predictions"}' in r.text
+
+    assert client.get("/metrics").status_code == 401
+
+
+def test_provider_outcomes_are_counted(monkeypatch):
+    async def found(*args, **kwargs):
+        return [{"url": "a"}, {"url": "b"}, {"url": "c"}]
+
+    async def slow(*args, **kwargs):
+        await asyncio.sleep(5)
+        return []
+
+    async def nothing(*args, **kwargs):
+        return []
+
+    monkeypatch.setattr(evidence, "query_claimreview", nothing)
+    monkeypatch.setattr(evidence, "query_newsapi", found)
+    monkeypatch.setattr(evidence, "query_gdelt", slow)
+    counts = metrics.PROVIDER_REQUESTS
+    before = {outcome: counts.value(provider=name, outcome=outcome)
+              for name, outcome in (("claimreview", "empty"), ("newsapi", "ok"), ("gdelt", "timeout"))}
+    results_before = metrics.PROVIDER_RESULTS.value(provider="newsapi")
+
+    out = asyncio.run(evidence.gather_evidence("claim", "IN", deadline=0.1))
+
+    assert out["timed_out"] == ["gdelt"]
+    assert counts.value(provider="claimreview", outcome="empty") == before["empty"] + 1
+    assert counts.value(provider="newsapi", outcome="ok") == before["ok"] + 1
+    assert counts.value(provider="gdelt", outcome="timeout") == before["timeout"] + 1
+    assert metrics.PROVIDER_RESULTS.value(provider="newsapi") == results_before + 3
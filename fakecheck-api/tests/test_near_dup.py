@@ -0,0 +1,123 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import evidence, main, near_dup
+from app.main import app
+from app.near_dup import NearDuplicateIndex
+
+HEADERS = {"X-Internal-API-Key": "near-dup-key"}
+CLAIM = "Government announces free electricity for all farmers in Punjab from next month"
+
+
+@pytest.fixture
+def index(monkeypatch):
+    fresh = NearDuplicateIndex(min_similarity=0.9, max_entries=100, ttl=3600)
+    monkeypatch.setattr(near_dup, "_index", fresh)
+    return fresh
+
+
+def test_variants_match_and_different_claims_do_not(index):
+    index.add(CLAIM, "IN||national", "verdict")
+
+    for variant in (
+        "BREAKING: Government announces FREE electricity for all farmers in Punjab from next month!!! 🔥🔥",
+        "Fwd: government announces free electricity for all farmers in punjab from next month https://t.co/x",
+    ):
+        match = index.lookup(variant, "IN||national")
+        assert match is not None and match[0] == "verdict" and match[1] >= 0.9
+
+    # A changed number is masked, a changed object is not
+    index.add("Petrol price cut by 5 rupees per litre across the country from today", "IN||national", "petrol")
+    assert index.lookup("Petrol price cut by 12 rupees per litre across the country from today", "IN||national")[0] == "petrol"
+    assert index.lookup("Diesel price cut by 5 rupees per litre across the country from today", "IN||national") is None
+
+    assert index.lookup("Government announces free bicycles for all students in Kerala", "IN||national") is None
+    assert index.lookup(CLAIM, "US||national") is None
+    # Too short to match approximately
+    index.add("Vaccines are safe", "IN||national", "short")
+    assert index.lookup("Vaccines are safe", "IN||national") is None
+
+
+def test_negated_claims_do_not_match(index):
+    claim = ("The Reserve Bank of India has announced that the new 2000 rupee notes will be withdrawn "
+             "from circulation by the end of this month")
+    index.add(claim, "IN||national", "original")
+
+    assert index.lookup(claim + "!!", "IN||national")[0] == "original"
+    for negated in (claim.replace("has announced", "has not announced"),
+                    claim.replace("has announced", "hasn't announced"),
+                    "FAKE: " + claim):
+        assert index.lookup(negated, "IN||national") is None
+
+
+def test_entries_expire_and_are_evicted(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(near_dup.time, "monotonic", lambda: now[0])
+    index = NearDuplicateIndex(min_similarity=0.9, max_entries=2, ttl=60)
+
+    index.add(CLAIM, "ns", 1)
+    now[0] += 61
+    assert index.lookup(CLAIM, "ns") is None
+    assert index.stats()["entries"] == 0
+
+    index.add("First claim about the new metro line opening in Delhi", "ns", 1)
+    index.add("Second claim about the new airport opening in Mumbai", "ns", 2)
+    index.add("Third claim about the new bridge opening in Chennai", "ns", 3)
+    stats = index.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert index.lookup("First claim about the new metro line opening in Delhi", "ns") is None
+    assert index.lookup("Third claim about the new bridge opening in Chennai", "ns")[0] == 3
+
+
+def test_predict_serves_near_duplicate_without_fan_out(monkeypatch, index):
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "near-dup-key")
+    calls = []
+
+    async def fake_gather_evidence(query, country, scope="national", **kwargs):
+        calls.append(query)
+        return {"results": {name: [] for name in evidence.PROVIDERS}, "timed_out": []}
+
+    monkeypatch.setattr(main, "gather_evidence", fake_gather_evidence)
+    tag = uuid.uuid4().hex[:8]
+    client = TestClient(app)
+
+    first = client.post("/predict", headers=HEADERS, json={"text": f"{CLAIM} {tag}", "country": "IN"})
+    assert first.status_code == 200 and first.json()["near_duplicate"] is None
+    assert len(calls) == 1
+
+    second = client.post("/predict", headers=HEADERS,
+                         json={"text": f"BREAKING: {CLAIM.upper()} {tag} 🔥🔥", "country": "IN"})
+    data = second.json()
+    assert len(calls) == 1
+    assert data["verdict"] == first.json()["verdict"]
+    assert data["near_duplicate"] >= 0.9
+    assert data["confidence"] == round(first.json()["confidence"] * near_dup.NEAR_DUP_CONFIDENCE_FACTOR, 3)
+    assert data["top_signals"][0].startswith("Verdict reused from a near-duplicate claim")
+
+    # Another country is checked from scratch
+    client.post("/predict", headers=HEADERS, json={"text": f"{CLAIM} {tag}", "country": "US"})
+    assert len(calls) == 2
+    assert client.get("/cache/stats", headers=HEADERS).json()["near_duplicates"]["hits"] == 1
+
+
+def test_only_the_main_claim_is_looked_up(monkeypatch, index):
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "near-dup-key")
+    calls = []
+
+    async def fake_gather_evidence(query, country, scope="national", **kwargs):
+        calls.append(query)
+        return {"results": {name: [] for name in evidence.PROVIDERS}, "timed_out": []}
+
+    monkeypatch.setattr(main, "gather_evidence", fake_gather_evidence)
+    tag = uuid.uuid4().hex[:8]
+    claim = f"{CLAIM} for 3 years {tag}"
+    client = TestClient(app)
+    client.post("/predict", headers=HEADERS, json={"text": claim, "country": "IN"})
+
+    # The indexed claim is only this article's secondary (numeric) claim: its main claim is checked
+    article = f"Heavy monsoon rains are expected across Kerala and Karnataka this week {tag}. {claim}"
+    r = client.post("/predict", headers=HEADERS, json={"text": article, "country": "IN"})
+    assert r.json()["near_duplicate"] is None
+    assert len(calls) == 2
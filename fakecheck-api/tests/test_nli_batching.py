@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from app import nli_model
+from app.cache import LRUCache
+from app.nli_model import StanceBatcher, classify_stance, classify_stances
+
+CLAIM = "Indian Railways announced mandatory Aadhaar verification for IRCTC tickets"
+SUPPORTING = "The ministry confirmed Indian Railways will require Aadhaar verification on IRCTC bookings."
+REFUTING = "Fact-check: false. Indian Railways denied any Aadhaar requirement for IRCTC tickets."
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memo(monkeypatch):
+    monkeypatch.setattr(nli_model, "_stance_memo", LRUCache(max_entries=100, sizeof=lambda value: 0))
+
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+        self.hypotheses = []
+
+    def __call__(self, inputs, top_k=None, truncation=None, batch_size=1):
+        self.calls.append([item["text"] for item in inputs])
+        self.hypotheses.extend(item["text_pair"] for item in inputs)
+        return [
+            [{"label": "contradiction" if "false" in item["text"].lower() else "entailment", "score": 0.9}]
+            for item in inputs
+        ]
+
+
+def test_classify_stances_matches_single_calls(monkeypatch):
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: None)
+    pairs = [(SUPPORTING, CLAIM), (REFUTING, CLAIM), ("Cricket scores from Mumbai", CLAIM), ("", CLAIM)]
+    assert classify_stances(pairs) == [classify_stance(p, h) for p, h in pairs]
+    assert [stance for stance, _ in classify_stances(pairs)] == ["supports", "refutes", "neutral", "neutral"]
+
+
+def test_relevant_premises_go_through_pipeline_as_one_batch(monkeypatch):
+    pipe = FakePipeline()
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: pipe)
+    results = classify_stances([(SUPPORTING, CLAIM), ("Cricket scores from Mumbai", CLAIM), (REFUTING, CLAIM)])
+    assert pipe.calls == [[SUPPORTING, REFUTING]]
+    assert results[0][0] == "supports" and results[1] == ("neutral", 0.0) and results[2][0] == "refutes"
+
+
+def test_model_classifies_the_passage_against_the_claim(monkeypatch):
+    pipe = FakePipeline()
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: pipe)
+    classify_stances([(SUPPORTING, CLAIM), (REFUTING, CLAIM)])
+    assert pipe.hypotheses == [CLAIM, CLAIM]
+
+    def neutral(inputs, **kwargs):
+        return [[{"label": "NEUTRAL", "score": 0.7}, {"label": "ENTAILMENT", "score": 0.2}] for _ in inputs]
+
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: neutral)
+    assert classify_stance(SUPPORTING + " Again.", CLAIM)[0] == "neutral"
+
+
+def test_concurrent_requests_are_micro_batched(monkeypatch):
+    pipe = FakePipeline()
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: pipe)
+
+    async def run():
+        batcher = StanceBatcher(max_batch=4, max_wait_ms=50)
+        premises = [f"{premise} Report {i}." for i in range(5) for premise in (SUPPORTING, REFUTING)]
+        results = await asyncio.gather(*(batcher.classify(p, CLAIM) for p in premises))
+        stats = batcher.stats()
+        await batcher.close()
+        return premises, results, stats
+
+    premises, results, stats = asyncio.run(run())
+    assert [stance for stance, _ in results] == ["supports", "refutes"] * 5
+    # 10 concurrent requests with max_batch=4 -> batches of 4, 4, 2
+    assert [len(call) for call in pipe.calls] == [4, 4, 2]
+    assert stats["batches"] == 3 and stats["items"] == 10 and stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 10 and stats["largest_batch"] == 4
+
+
+def test_batch_failure_resolves_callers_as_neutral():
+    def broken(pairs):
+        raise RuntimeError("model crashed")
+
+    async def run():
+        batcher = StanceBatcher(max_batch=8, max_wait_ms=1, classify=broken)
+        results = await asyncio.gather(batcher.classify(SUPPORTING, CLAIM), batcher.classify(REFUTING, CLAIM))
+        await batcher.close()
+        return results
+
+    assert asyncio.run(run()) == [("neutral", 0.0), ("neutral", 0.0)]
+
+
+def test_memo_reuses_stances_per_model_and_dedupes_within_batch(monkeypatch):
+    pipe = FakePipeline()
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: pipe)
+
+    first = classify_stances([(SUPPORTING, CLAIM), (REFUTING, CLAIM), (SUPPORTING, CLAIM)])
+    assert pipe.calls == [[SUPPORTING, REFUTING]]
+    assert first[0] == first[2]
+
+    assert classify_stances([(REFUTING, CLAIM), (SUPPORTING, CLAIM)]) == [first[1], first[0]]
+    assert len(pipe.calls) == 1
+    # a different claim is a different key
+    classify_stances([(SUPPORTING, CLAIM + " from July")])
+    assert len(pipe.calls) == 2
+
+    # switching models does not serve the old model's stances
+    monkeypatch.setenv("NLI_MODEL", "roberta-large-mnli")
+    classify_stances([(SUPPORTING, CLAIM)])
+    assert len(pipe.calls) == 3
+
+    memo = nli_model.get_nli_stats()["memo"]
+    assert memo["hits"] == 2 and memo["misses"] == 4 and memo["entries"] == 4
+    assert memo["hit_rate"] == round(2 / 6, 4)
+
+
+def test_failed_inference_is_not_memoized(monkeypatch):
+    def broken(sequences, **kwargs):
+        raise RuntimeError("out of memory")
+
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: broken)
+    assert classify_stance(SUPPORTING, CLAIM) == ("neutral", 0.0)
+    assert len(nli_model._stance_memo) == 0
@@ -0,0 +1,40 @@
+import numpy as np
+
+from app import nli_model, nli_onnx
+from app.nli_onnx import OnnxNLIPipeline, nli_scores
+
+
+def test_nli_scores_softmax_across_classes():
+    # 2 pairs x (contradiction, neutral, entailment)
+    logits = np.array([[0.1, 0.2, 3.0], [2.0, 0.1, -1.0]])
+    scores = nli_scores(logits)
+    expected = np.exp(logits) / np.exp(logits).sum(axis=-1, keepdims=True)
+    assert np.allclose(scores, expected)
+    assert list(scores.argmax(axis=-1)) == [2, 0]
+
+
+def test_pipeline_classifies_premise_claim_pairs():
+    pipe = OnnxNLIPipeline.__new__(OnnxNLIPipeline)
+    pipe.id2label = {0: "contradiction", 1: "neutral", 2: "entailment"}
+    seen = []
+
+    def logits(pairs, batch_size, truncation="only_first"):
+        seen.extend(pairs)
+        return np.array([[0.1, 0.2, 3.0], [2.0, 0.1, -1.0]])
+
+    pipe._logits = logits
+    results = pipe([{"text": "premise a", "text_pair": "claim"}, {"text": "premise b", "text_pair": "claim"}])
+    assert seen == [("premise a", "claim"), ("premise b", "claim")]
+    assert [r[0]["label"] for r in results] == ["entailment", "contradiction"]
+    assert [len(r) for r in results] == [3, 3]
+
+
+def test_onnx_backend_without_exported_model_falls_back_to_heuristic(monkeypatch, tmp_path):
+    monkeypatch.setattr(nli_model, "NLI_BACKEND", "onnx")
+    monkeypatch.setattr(nli_model, "_nli_pipeline", None)
+    monkeypatch.setattr(nli_onnx, "NLI_ONNX_DIR", str(tmp_path / "missing"))
+    assert nli_model.get_nli_pipeline() is None
+    stance, score = nli_model.classify_stance(
+        "Officials denied the claim, calling it fake.", "Officials announced free laptops for students"
+    )
+    assert stance == "refutes" and score > 0
@@ -0,0 +1,50 @@
+import pytest
+
+from app import nli_model
+from app.cache import LRUCache
+from app.nli_model import _approx_tokens, classify_stance, select_passages
+
+CLAIM = "Indian Railways makes Aadhaar mandatory for IRCTC tatkal tickets"
+RELEVANT = ("The Ministry of Railways confirmed Aadhaar verification will be required for IRCTC tatkal bookings. "
+            "Officials said the Aadhaar rule starts in July.")
+FILLER = " ".join(f"Subscribe to our newsletter for update number {i} and manage cookie settings." for i in range(60))
+ARTICLE = f"{FILLER} {RELEVANT} {FILLER}"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memo(monkeypatch):
+    monkeypatch.setattr(nli_model, "_stance_memo", LRUCache(max_entries=100, sizeof=lambda value: 0))
+
+
+def test_short_premise_is_unchanged():
+    assert select_passages(RELEVANT, CLAIM) == RELEVANT
+
+
+def test_selects_matching_windows_in_document_order_within_budget():
+    passage = select_passages(ARTICLE, CLAIM, top_k=2, window=2, token_budget=80)
+    assert "Ministry of Railways confirmed Aadhaar" in passage
+    assert "Aadhaar rule starts in July" in passage
+    assert passage.index("Ministry") < passage.index("July")
+    assert _approx_tokens(passage) <= 80 < _approx_tokens(ARTICLE) // 10
+
+
+def test_budget_limits_selection():
+    passage = select_passages(ARTICLE, CLAIM, top_k=3, window=2, token_budget=20)
+    assert _approx_tokens(passage) <= 20
+    assert "Aadhaar" in passage
+
+
+def test_model_receives_selected_passage(monkeypatch):
+    seen = []
+
+    def pipe(inputs, **kwargs):
+        seen.extend(item["text"] for item in inputs)
+        return [[{"label": "entailment", "score": 0.9}] for _ in inputs]
+
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: pipe)
+    monkeypatch.setattr(nli_model, "_passage_stats", {"premises": 0, "premise_tokens": 0, "selected_tokens": 0})
+    stance, _ = classify_stance(ARTICLE, CLAIM)
+    assert stance == "supports"
+    assert len(seen) == 1 and "IRCTC tatkal bookings" in seen[0]
+    assert _approx_tokens(seen[0]) <= nli_model.NLI_PASSAGE_TOKEN_BUDGET
+    assert nli_model.get_nli_stats()["passages"]["reduction"] > 5
@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from app import patterns
+from app.patterns import PhraseMatcher, RuleMatcher
+
+BACKENDS = [False] + ([True] if patterns.ahocorasick else [])
+
+PHRASES = ["he", "she", "his", "hers", "fake", "fake news", "₹", "₹5 lakh", "news"]
+
+
+@pytest.mark.parametrize("native", BACKENDS)
+def test_phrase_matcher_matches_substring_semantics(native):
+    matcher = PhraseMatcher(PHRASES, native=native)
+    rng = random.Random(7)
+    alphabet = "hers fakenw₹5lk"
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert matcher.find(text) == {p for p in PHRASES if p in text}
+        assert matcher.search(text) == any(p in text for p in PHRASES)
+
+
+@pytest.mark.parametrize("native", BACKENDS)
+def test_rule_matcher_reports_every_table(native):
+    matcher = RuleMatcher({"debunk": ["fake", "hoax"], "topic": ["fake news", "tax"], "empty": []}, native=native)
+    hits = matcher.scan("this fake news story about tax")
+    assert hits == {"debunk": {"fake"}, "topic": {"fake news", "tax"}, "empty": set()}
+    assert RuleMatcher({}, native=native).scan("anything") == {}
@@ -0,0 +1,160 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+from app import cache, prediction_store
+from app.cache import LRUCache, get_cached_prediction, set_cached_prediction
+
+
+class Predictions:
+    """The slice of the predictions collection the store uses (no Mongo server in the tests)."""
+
+    def __init__(self):
+        self.docs = {}
+        self.bulk_writes = []
+        self.reads = 0
+
+    async def bulk_write(self, ops, ordered=True):
+        self.bulk_writes.append(len(ops))
+        for op in ops:
+            doc = op._doc
+            key = op._filter["_id"]
+            if key not in self.docs:
+                if not op._upsert:
+                    continue
+                self.docs[key] = dict(doc.get("$setOnInsert", {}))
+            self.docs[key].update(doc.get("$set", {}))
+            for field, amount in doc.get("$inc", {}).items():
+                self.docs[key][field] = self.docs[key].get(field, 0) + amount
+
+    async def find_one(self, query, projection=None):
+        self.reads += 1
+        doc = self.docs.get(query["_id"])
+        if doc is None or doc["expires_at"] <= query["expires_at"]["$gt"]:
+            return None
+        return {"_id": query["_id"], **doc}
+
+    def find(self, query):
+        live = [{"_id": key, **doc} for key, doc in self.docs.items() if doc["expires_at"] > query["expires_at"]["$gt"]]
+        return Cursor(live)
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction):
+        self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+@pytest.fixture
+def store(monkeypatch):
+    collection = Predictions()
+    monkeypatch.setattr(prediction_store, "get_db", lambda: {"predictions": collection})
+    # Running, without the background tasks (flush() is called directly)
+    monkeypatch.setattr(prediction_store, "_writer", object())
+    monkeypatch.setattr(prediction_store, "_pending", {})
+    monkeypatch.setattr(prediction_store, "_hits", prediction_store.Counter())
+    monkeypatch.setattr(prediction_store, "_stats", dict.fromkeys(prediction_store._stats, 0))
+    monkeypatch.setattr(cache, "_memory_cache", LRUCache(max_entries=100))
+    monkeypatch.setattr(cache, "_shared_cache", None)
+    return collection
+
+
+def test_writes_are_batched_and_reads_fall_through_to_mongo(store, monkeypatch):
+    monkeypatch.setattr(prediction_store, "PREDICTION_STORE_BATCH_SIZE", 3)
+    for i in range(4):
+        set_cached_prediction(f"k{i}", {"verdict": "likely_fake", "n": i})
+    set_cached_prediction("k0", {"verdict": "likely_real", "n": 0})
+    assert store.docs == {}
+
+    assert asyncio.run(prediction_store.flush()) == 4
+    # Four upserts (the latest k0 only) in unordered bulk writes of at most three
+    assert store.bulk_writes == [3, 1]
+    assert store.docs["k0"]["value"]["verdict"] == "likely_real" and store.docs["k0"]["hits"] == 0
+
+    # A restarted worker: empty memory, the verdict comes from Mongo and is kept in memory
+    monkeypatch.setattr(cache, "_memory_cache", LRUCache(max_entries=100))
+    assert asyncio.run(get_cached_prediction("k1")) == {"verdict": "likely_fake", "n": 1}
+    assert asyncio.run(get_cached_prediction("k1")) == {"verdict": "likely_fake", "n": 1}
+    assert store.reads == 1
+    assert asyncio.run(get_cached_prediction("missing")) is None
+
+    asyncio.run(prediction_store.flush())
+    assert store.docs["k1"]["hits"] == 2
+    stats = prediction_store.get_prediction_store_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["written"] == 4
+
+
+def test_expired_verdicts_are_not_served(store):
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    store.docs["old"] = {"value": {"verdict": "likely_real"}, "expires_at": past, "created_at": past, "hits": 9}
+    assert asyncio.run(get_cached_prediction("old")) is None
+
+
+def test_warm_start_preloads_popular_or_recent_verdicts(store):
+    now = datetime.now(timezone.utc)
+    for i, hits in enumerate((5, 50, 1)):
+        store.docs[f"k{i}"] = {"value": {"n": i}, "hits": hits, "created_at": now - timedelta(minutes=10 - i),
+                               "expires_at": now + timedelta(hours=2)}
+
+    warmed = []
+    assert asyncio.run(prediction_store.preload(lambda *args: warmed.append(args), limit=2, order="popular")) == 2
+    assert [key for key, _, _ in warmed] == ["k1", "k0"]
+    # The remaining lifetime in Mongo is passed on (preload_prediction caps it at the memory TTL)
+    assert all(remaining > 3600 for _, _, remaining in warmed)
+
+    warmed.clear()
+    asyncio.run(prediction_store.preload(lambda *args: warmed.append(args), limit=1, order="recent"))
+    assert [key for key, _, _ in warmed] == ["k2"]
+
+    asyncio.run(prediction_store.preload(cache.preload_prediction, limit=3))
+    assert cache._memory_cache.get("k2") == {"n": 2}
+
+
+def test_writes_wait_while_mongo_is_down(store, monkeypatch):
+    monkeypatch.setattr(prediction_store, "get_db", lambda: None)
+    set_cached_prediction("k", {"verdict": "likely_fake"})
+    assert asyncio.run(prediction_store.flush()) == 0
+    assert prediction_store.get_prediction_store_stats()["queued"] == 1
+
+    monkeypatch.setattr(prediction_store, "get_db", lambda: {"predictions": store})
+    assert asyncio.run(prediction_store.flush()) == 1
+    assert "k" in store.docs
+
+
+def test_failed_batches_are_requeued_without_overwriting_newer_verdicts(store, monkeypatch):
+    monkeypatch.setattr(prediction_store, "PREDICTION_STORE_BATCH_SIZE", 2)
+    monkeypatch.setattr(prediction_store, "report_mongo_failure", lambda error: None)
+    for i in range(4):
+        set_cached_prediction(f"k{i}", {"verdict": "likely_fake", "n": i})
+    bulk_write = store.bulk_write
+    calls = []
+
+    async def second_batch_fails(ops, ordered=True):
+        calls.append(len(ops))
+        if len(calls) == 2:
+            # A newer verdict for k2 arrives while the write is in flight
+            set_cached_prediction("k2", {"verdict": "likely_real", "n": 2})
+            raise AutoReconnect("connection reset")
+        await bulk_write(ops, ordered)
+
+    monkeypatch.setattr(store, "bulk_write", second_batch_fails)
+    assert asyncio.run(prediction_store.flush()) == 2
+    assert sorted(store.docs) == ["k0", "k1"]
+    assert prediction_store.get_prediction_store_stats()["queued"] == 2
+
+    monkeypatch.setattr(store, "bulk_write", bulk_write)
+    assert asyncio.run(prediction_store.flush()) == 2
+    assert store.docs["k2"]["value"]["verdict"] == "likely_real"
+    assert store.docs["k3"]["value"]["n"] == 3
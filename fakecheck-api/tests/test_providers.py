@@ -0,0 +1,172 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app import cache, circuit_breaker, retrieval
+from app.cache import LRUCache
+from app.circuit_breaker import CircuitBreaker, CircuitOpenError, breaker_get
+
+GDELT_ARTICLES = {"articles": [{"url": "https://www.thehindu.com/news/national/story.ece", "title": "Story",
+                                "domain": "thehindu.com"}]}
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    monkeypatch.setattr(cache, "_provider_cache", LRUCache(max_entries=100))
+    monkeypatch.setattr(cache, "_provider_counts", {})
+    monkeypatch.setattr(cache, "_shared_cache", None)
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_half_open(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("gdelt", failure_threshold=3, cooldown=30)
+
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    breaker.record_success()
+    assert breaker.failures == 0 and breaker.state == "closed"
+
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open" and breaker.trips == 1
+    assert not breaker.allow()
+
+    now[0] += 31
+    assert breaker.allow() and breaker.state == "half_open"
+    # Only one probe at a time
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.trips == 2
+
+    now[0] += 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_open_breaker_skips_the_upstream_at_once():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.host)
+        return httpx.Response(503)
+
+    async def run():
+        async with _client(handler) as client:
+            for _ in range(3):
+                response = await breaker_get("gdelt", client, "https://api.gdeltproject.org/api/v2/doc/doc")
+                assert response.status_code == 503
+            with pytest.raises(CircuitOpenError):
+                await breaker_get("gdelt", client, "https://api.gdeltproject.org/api/v2/doc/doc")
+            # The provider swallows the error and returns nothing without a request
+            return await retrieval.query_gdelt("metro line", "IN", client=client)
+
+    assert asyncio.run(run()) == []
+    assert len(calls) == 3
+
+
+def test_captcha_page_counts_as_failure():
+    captcha = "<html><form id='challenge-form'>Please solve the CAPTCHA</form></html>"
+
+    async def run():
+        async with _client(lambda request: httpx.Response(200, text=captcha)) as client:
+            for _ in range(3):
+                await breaker_get("bing", client, "https://www.bing.com/search",
+                                  is_blocked=retrieval._blocked_by_captcha("b_algo"))
+
+    asyncio.run(run())
+    assert circuit_breaker.get_breaker("bing").state == "open"
+
+
+def test_provider_results_are_cached_per_normalized_query():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["query"])
+        return httpx.Response(200, json=GDELT_ARTICLES)
+
+    async def run():
+        async with _client(handler) as client:
+            first = await retrieval.query_gdelt("Metro line  opens", "IN", client=client)
+            second = await retrieval.query_gdelt("metro line opens", "in", client=client)
+            other_country = await retrieval.query_gdelt("metro line opens", "US", client=client)
+            return first, second, other_country
+
+    first, second, _ = asyncio.run(run())
+    assert first and first == second
+    assert len(calls) == 2
+    # No trusted source for US: cached with the short TTL
+    assert cache.get_provider_cache_stats()["providers"]["gdelt"] == {"hits": 1, "misses": 2, "negative": 1}
+
+
+def test_empty_results_use_the_negative_ttl(monkeypatch):
+    ttls = []
+    original_set = cache._provider_cache.set
+    monkeypatch.setattr(cache._provider_cache, "set", lambda key, value, ttl=None: (ttls.append(ttl), original_set(key, value, ttl)))
+
+    async def run():
+        async with _client(lambda request: httpx.Response(200, json={"articles": []})) as client:
+            await retrieval.query_gdelt("nothing here", "IN", client=client)
+        async with _client(lambda request: httpx.Response(200, json=GDELT_ARTICLES)) as client:
+            await retrieval.query_gdelt("something here", "IN", client=client)
+
+    asyncio.run(run())
+    assert ttls == [cache.PROVIDER_CACHE_NEGATIVE_TTL, cache.PROVIDER_CACHE_TTLS["gdelt"]]
+    assert cache.get_provider_cache_stats()["providers"]["gdelt"]["negative"] == 1
+
+
+def test_concurrent_identical_queries_share_one_call():
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=GDELT_ARTICLES)
+
+    async def run():
+        async with _client(handler) as client:
+            return await asyncio.gather(*(retrieval.query_gdelt("same claim", "IN", client=client) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r == results[0] and r for r in results)
+
+
+def test_cancelled_callers_cancel_the_upstream_call():
+    events = []
+
+    async def handler(request):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            events.append("upstream cancelled")
+            raise
+        events.append("finished upstream")
+        return httpx.Response(200, json=GDELT_ARTICLES)
+
+    async def run():
+        async with _client(handler) as client:
+            first = asyncio.create_task(retrieval.query_gdelt("slow claim", "IN", client=client))
+            second = asyncio.create_task(retrieval.query_gdelt("slow claim", "IN", client=client))
+            await asyncio.sleep(0.05)
+            # One caller leaving keeps the shared call running for the other
+            first.cancel()
+            await asyncio.sleep(0.05)
+            assert events == [] and not second.done()
+            second.cancel()
+            await asyncio.gather(first, second, return_exceptions=True)
+            await asyncio.sleep(0.05)
+            return list(events)
+
+    # Checked before asyncio.run cancels whatever is left over
+    assert asyncio.run(run()) == ["upstream cancelled"]
+    assert circuit_breaker.get_breaker("gdelt").failures == 0
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import threading
+import zlib
+
+import httpx
+
+from app import article_store, retrieval
+from app.article_store import ArticleStore, canonical_url
+from app.retrieval import fetch_article_text_async
+
+ARTICLE_HTML = (
+    "<html><head><title>Policy</title></head><body><nav>menu</nav><article>"
+    + "<p>The state government announced a new irrigation policy for farmers on Monday.</p>" * 5
+    + "</article></body></html>"
+)
+
+
+def test_fetch_article_text_async_downloads_once():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text=ARTICLE_HTML)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_article_text_async("https://news.example.com/story", client=client)
+
+    text = asyncio.run(run())
+    assert text and "irrigation policy" in text
+    assert len(requests) == 1
+
+
+def test_fetch_article_text_async_non_200_returns_none():
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(404))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await fetch_article_text_async("https://news.example.com/missing", client=client)
+
+    assert asyncio.run(run()) is None
+
+
+def test_canonical_url_strips_tracking_fragments_and_amp():
+    canonical = "https://ndtv.com/india-news/story-123?id=5"
+    assert canonical_url("https://www.NDTV.com/india-news/story-123/amp?utm_source=tw&fbclid=x&id=5#top") == canonical
+    assert canonical_url("http://m.ndtv.com/india-news/story-123/?id=5") == canonical
+    assert canonical_url("https://www-ndtv-com.cdn.ampproject.org/c/s/www.ndtv.com/india-news/story-123/amp/?id=5") == canonical
+    assert canonical_url("https://example.com/a?b=2&a=1") == canonical_url("https://example.com/a?a=1&b=2")
+    assert canonical_url("https://example.com/a?id=1") != canonical_url("https://example.com/a?id=2")
+
+
+def test_stored_article_is_revalidated_and_not_reparsed(tmp_path, monkeypatch):
+    monkeypatch.setattr(article_store, "_store", ArticleStore(str(tmp_path / "articles.sqlite3")))
+    parsed, conditional = [], []
+    original_extract = retrieval.extract_article_text
+    monkeypatch.setattr(retrieval, "extract_article_text", lambda html, url: parsed.append(url) or original_extract(html, url))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        conditional.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text=ARTICLE_HTML, headers={"ETag": '"v1"'})
+
+    async def run(*urls):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [await fetch_article_text_async(url, client=client) for url in urls]
+
+    first, second = asyncio.run(run("https://news.example.com/story?utm_source=x",
+                                    "https://news.example.com/story/amp#comments"))
+    assert first and second == first
+    assert conditional == [None, '"v1"']
+    assert len(parsed) == 1
+    assert article_store.get_article_store_stats()["revalidated"] == 1
+
+
+def test_article_store_prunes_least_recently_used(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(article_store.time, "time", lambda: now[0])
+    texts = {key: os.urandom(500).hex() for key in ("a", "b", "c", "d")}
+    size = max(len(zlib.compress(text.encode(), 6)) for text in texts.values())
+    # Room for three articles and a half
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"), max_bytes=int(size * 3.5))
+    for key in ("a", "b", "c"):
+        store.put(key, texts[key], '"etag"', None)
+        now[0] += 1
+    store.touch("a")
+    now[0] += 1
+    store.put("d", texts["d"], None, "Mon, 01 Jan 2024 00:00:00 GMT")
+
+    # "a" was used after "b" and "c", so "b" is the least recently used
+    assert store.get("b") is None
+    assert store.get("a").text == texts["a"] and store.get("c").text == texts["c"]
+    assert store.get("d").conditional_headers() == {"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert store.evictions == 1 and store.stats()["entries"] == 3
+
+
+def test_article_store_is_used_off_the_event_loop(tmp_path, monkeypatch):
+    threads = []
+
+    class Store(ArticleStore):
+        def get(self, key):
+            threads.append(threading.current_thread())
+            return super().get(key)
+
+        def delete(self, key):
+            threads.append(threading.current_thread())
+            super().delete(key)
+
+    store = Store(str(tmp_path / "articles.sqlite3"))
+    store.put(canonical_url("https://news.example.com/gone"), "stored text", '"v1"', None)
+    monkeypatch.setattr(article_store, "_store", store)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(410))) as client:
+            return await fetch_article_text_async("https://news.example.com/gone", client=client), threading.current_thread()
+
+    text, loop_thread = asyncio.run(run())
+    # The read before the request and the delete after the 410
+    assert len(threads) == 2 and loop_thread not in threads
+    assert text is None and store.get(canonical_url("https://news.example.com/gone")) is None
@@ -0,0 +1,109 @@
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import rules as rules_module
+from app.main import app
+from app.rules import RuleSet, load_rules
+
+
+def _rules_data():
+    with open(rules_module.RULES_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_domain_tiers_match_whole_labels():
+    rules = load_rules()
+    assert rules.lookup_domain("x.com").tier == "high"
+    assert rules.lookup_domain("sport.bbc.co.uk").tier == "high"
+    assert rules.lookup_domain("foxnews.com").tier == "high"
+    assert rules.lookup_domain("nap.org").tier is None
+    assert rules.lookup_domain("dw.com").tier == "medium"
+    assert rules.lookup_domain("incredibleindia.gov.in").tier is None
+    assert rules.lookup_domain("who.int").is_health_authority
+
+
+def test_announcements_follow_group_order_and_country():
+    rules = load_rules()
+    local = rules.match_announcement("RBI keeps repo rate unchanged", "IN")
+    assert local["type"] == "local_news_direct" and local["source"] == "rbi.org.in"
+    # India-only groups are skipped for other countries
+    assert rules.match_announcement("RBI keeps repo rate unchanged", "US") is None
+    generic = rules.match_announcement("Cabinet decision on the new policy", "IN")
+    assert generic["source"] == "pib.gov.in" and generic["type"] == "government_direct"
+    tech = rules.match_announcement("OpenAI launches GPT-5", None)
+    assert tech["description"].startswith("Openai official announcement")
+    assert rules.match_announcement("Farmers protest in the capital", "IN") is None
+
+
+def test_invalid_rules_are_rejected():
+    data = _rules_data()
+    del data["claim"]["fake_patterns"]
+    with pytest.raises(ValueError):
+        RuleSet(data)
+
+
+def test_reload_swaps_atomically_and_keeps_old_set_on_error(tmp_path, monkeypatch):
+    data = _rules_data()
+    path = tmp_path / "rules.json"
+    data["version"] = "test-1"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setattr(rules_module, "RULES_PATH", str(path))
+    monkeypatch.setattr(rules_module, "_active_rules", None)
+
+    first = rules_module.get_rules()
+    assert first.version == "test-1"
+    assert not first.scan_claim("aliens land in delhi")["fake_patterns"]
+
+    data["version"] = "test-2"
+    data["claim"]["fake_patterns"].append("aliens land")
+    path.write_text(json.dumps(data), encoding="utf-8")
+    second = rules_module.reload_rules()
+    assert rules_module.get_rules() is second
+    assert second.scan_claim("aliens land in delhi")["fake_patterns"] == {"aliens land"}
+    # A request holding the old set keeps seeing its version
+    assert first.version == "test-1" and not first.scan_claim("aliens land in delhi")["fake_patterns"]
+
+    path.write_text("{not json", encoding="utf-8")
+    with pytest.raises(ValueError):
+        rules_module.reload_rules()
+    assert rules_module.get_rules() is second
+
+
+def test_reload_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "secret")
+    monkeypatch.setattr(rules_module, "_active_rules", None)
+    version = _rules_data()["version"]
+    client = TestClient(app)
+    assert client.post("/rules/reload").status_code == 401
+    response = client.post("/rules/reload", headers={"X-Internal-API-Key": "secret"})
+    assert response.status_code == 200
+    assert response.json()["rules"]["version"] == version
+
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps({"version": "x"}), encoding="utf-8")
+    monkeypatch.setattr(rules_module, "RULES_PATH", str(path))
+    assert client.post("/rules/reload", headers={"X-Internal-API-Key": "secret"}).status_code == 422
+    assert rules_module.get_rules().version == version
+
+
+def test_watcher_reloads_on_file_change(tmp_path, monkeypatch):
+    data = _rules_data()
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setattr(rules_module, "RULES_PATH", str(path))
+    monkeypatch.setattr(rules_module, "_active_rules", None)
+    rules_module.start_rules_watcher(interval=0.05)
+    try:
+        data["version"] = "watched"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        os.utime(path, ns=(1, 10 ** 18))
+        deadline = time.monotonic() + 2
+        while rules_module.get_rules().version != "watched" and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert rules_module.get_rules().version == "watched"
+    finally:
+        rules_module.stop_rules_watcher()
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import uuid
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app import cache, circuit_breaker, evidence, main, near_dup, retrieval
+from app.cache import LRUCache
+from app.main import PredictRequest, app
+
+HEADERS = {"X-Internal-API-Key": "stream-key"}
+FACT_CHECK = {"claims": [{"claimReview": [{"url": "https://www.altnews.in/fact-check-metro",
+                                           "publisher": {"name": "Alt News"}, "textualRating": "False"}]}]}
+
+
+def _patch_providers(monkeypatch, gdelt_delay=0.1, cancelled=None):
+    """The real (cached, breaker-guarded) providers over a fake HTTP layer; GDELT answers slowly."""
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "stream-key")
+    monkeypatch.setenv("GOOGLE_FACTCHECK_API_KEY", "test-key")
+    monkeypatch.delenv("NEWSAPI_KEY", raising=False)
+    monkeypatch.setattr(near_dup, "_index", near_dup.NearDuplicateIndex())
+    monkeypatch.setattr(cache, "_provider_cache", LRUCache(max_entries=100))
+    monkeypatch.setattr(cache, "_shared_cache", None)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host == "factchecktools.googleapis.com":
+            return httpx.Response(200, json=FACT_CHECK)
+        if host == "api.gdeltproject.org":
+            try:
+                await asyncio.sleep(gdelt_delay)
+            except asyncio.CancelledError:
+                if cancelled is not None:
+                    cancelled.append("gdelt")
+                raise
+            return httpx.Response(200, json={"articles": []})
+        return httpx.Response(404)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(evidence, "get_http_client", lambda: client)
+    monkeypatch.setattr(retrieval, "get_http_client", lambda: client)
+
+
+def test_stream_emits_claims_evidence_provisional_and_result(monkeypatch):
+    _patch_providers(monkeypatch)
+    claim = f"Delhi metro fares will be free for all students from next month {uuid.uuid4().hex[:8]}"
+
+    with TestClient(app).stream("POST", "/predict/stream", headers=HEADERS, json={"text": claim, "country": "IN"}) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in r.iter_lines() if line]
+
+    kinds = [e["event"] for e in events]
+    assert kinds[0] == "claims" and kinds[-1] == "result"
+    position = {e.get("provider", e["event"]): i for i, e in enumerate(events)}
+    # The fact check and the provisional verdict are streamed before the slow GDELT call returns
+    assert position["claimreview"] < position["provisional"] < position["gdelt"]
+    provisional = events[position["provisional"]]
+    assert provisional["verdict"] == "likely_fake" and provisional["signal"] == "Fact-checkers refute this claim"
+    claimreview = next(e for e in events if e["event"] == "evidence" and e["provider"] == "claimreview")
+    assert claimreview["sources"][0]["rating"] == "False" and claimreview["sources"][0]["source"] == "Alt News"
+    result = events[-1]["result"]
+    assert result["verdict"] == "likely_fake"
+    assert any(item["type"] == "claim_review" for item in result["evidence"])
+
+    # The result was cached like a /predict result
+    with TestClient(app).stream("POST", "/predict/stream", headers=HEADERS, json={"text": claim, "country": "IN"}) as r:
+        events = [json.loads(line) for line in r.iter_lines() if line]
+    assert [e["event"] for e in events] == ["result"] and events[0]["result"] == result
+
+
+def test_stream_validation_errors_and_auth(monkeypatch):
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "stream-key")
+    client = TestClient(app)
+    assert client.post("/predict/stream", json={"text": "x", "country": "IN"}).status_code == 401
+    assert client.post("/predict/stream", headers=HEADERS, json={"text": "claim"}).status_code == 400
+
+
+def test_closing_the_stream_cancels_pending_providers(monkeypatch):
+    cancelled = []
+    _patch_providers(monkeypatch, gdelt_delay=30, cancelled=cancelled)
+    payload = PredictRequest(text=f"Delhi metro fares will be free for all students {uuid.uuid4().hex[:8]}", country="IN")
+
+    async def run():
+        stream = main._prediction_events(payload, main._prediction_key(payload))
+        seen = []
+        async for line in stream:
+            seen.append(json.loads(line)["event"])
+            if seen.count("evidence") == 2:
+                break
+        # What the server does when the client goes away
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        # Checked before asyncio.run cancels whatever is left over
+        return seen, list(cancelled)
+
+    seen, cancelled_upstream = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert seen[0] == "claims" and "result" not in seen
+    # The upstream GDELT request itself was cancelled, not just the coroutine awaiting it
+    assert cancelled_upstream == ["gdelt"]
+    assert circuit_breaker.get_breaker("gdelt").failures == 0
@@ -0,0 +1,41 @@
+from app import rules as rules_module
+from app.rules import load_rules
+from app.trusted_sources import get_trust_index, is_trusted_source
+
+rules = load_rules()
+
+
+def test_lookup_matches_whole_labels_only():
+    assert rules.lookup_domain("x.com").reliability == 0.95
+    assert rules.lookup_domain("www.bbc.com").country == "GB"
+    # Substring matching used to treat these as x.com / ap.org
+    assert rules.lookup_domain("foxnews.com").reliability == 0.0
+    assert rules.lookup_domain("nap.org").reliability == 0.0
+
+
+def test_lookup_gov_domains():
+    assert rules.lookup_domain("incredibleindia.gov.in").is_gov
+    assert rules.lookup_domain("cdc.gov").country == "US"
+    assert not rules.lookup_domain("gov.example.com").is_gov
+
+
+def test_one_index_answers_tier_reliability_and_country():
+    info = rules.lookup_domain("www.bbc.com")
+    assert (info.tier, info.reliability, info.country) == ("high", 0.96, "GB")
+    # is_trusted_source reads the index of the active rule set
+    active = rules_module.get_rules()
+    assert get_trust_index() is active.domain_index
+
+
+def test_is_trusted_source_country_filtering():
+    assert is_trusted_source("https://pib.gov.in/PressRelease.aspx", "IN") == (True, 0.97)
+    assert is_trusted_source("https://www.whitehouse.gov/briefing", "IN") == (False, 0.0)
+    assert is_trusted_source("https://www.gov.uk/news", "IN") == (False, 0.0)
+    assert is_trusted_source("https://www.gov.uk/news", "GB") == (True, 0.97)
+    assert is_trusted_source("https://agency.gov/x", "US") == (True, 0.97)
+
+
+def test_is_trusted_source_fact_checker_path_prefix():
+    assert is_trusted_source("https://www.indiatoday.in/fact-check/story/x", None, "international") == (True, 0.91)
+    assert is_trusted_source("https://www.indiatoday.in/india/story/x", None, "international") == (False, 0.0)
+    assert is_trusted_source("https://www.indiatoday.in/india/story/x", "IN")[0]
@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main, near_dup, nli_model, verification
+from app.cache import LRUCache
+from app.main import app
+from app.verification import verify_bodies
+
+HEADERS = {"X-Internal-API-Key": "verify-key"}
+
+
+def test_verify_bodies_respects_budget_threshold_and_host_limit(monkeypatch):
+    monkeypatch.setattr(verification, "BODY_VERIFY_PER_HOST", 1)
+    active, peak = {}, {}
+
+    async def fetch(url):
+        host = url.split("/")[2]
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(2 if "slow" in url else 0.01)
+        active[host] -= 1
+        return None if "empty" in url else f"body of {url}"
+
+    async def fake_stance(body, claim):
+        if "weak" in body:
+            return "supports", 0.1
+        return ("refutes" if "refute" in body else "supports"), 0.8
+
+    monkeypatch.setattr(verification, "classify_stance_async", fake_stance)
+    urls = [
+        "https://a.example.com/refute", "https://a.example.com/support", "https://b.example.com/weak",
+        "https://c.example.com/empty", "https://d.example.com/slow",
+    ]
+    results = asyncio.run(asyncio.wait_for(verify_bodies("claim", urls, budget=0.5, fetch=fetch), 5))
+    assert results == {
+        "https://a.example.com/refute": ("refutes", 0.8),
+        "https://a.example.com/support": ("supports", 0.8),
+    }
+    # the two a.example.com URLs were fetched one at a time
+    assert peak["a.example.com"] == 1
+    stats = verification.get_verification_stats()
+    assert stats["timed_out"] >= 1 and stats["inconclusive"] >= 1 and stats["no_body"] >= 1
+
+
+def test_no_budget_left_skips_verification():
+    async def fetch(url):
+        raise AssertionError("should not fetch")
+
+    assert asyncio.run(verify_bodies("claim", ["https://a.example.com/x"], budget=0, fetch=fetch)) == {}
+
+
+def _article_stance(monkeypatch, title, body):
+    """Stance /predict gives one trusted Reuters article with this title and body."""
+    monkeypatch.setenv("FAKECHECK_INTERNAL_API_KEY", "verify-key")
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: None)
+    monkeypatch.setattr(nli_model, "_stance_memo", LRUCache(max_entries=100, sizeof=lambda value: 0))
+    monkeypatch.setattr(near_dup, "_index", near_dup.NearDuplicateIndex())
+    tag = uuid.uuid4().hex[:8]
+    claim = f"Delhi metro fares will be free for students from next month {tag}"
+    article_url = f"https://www.reuters.com/world/india/delhi-metro-fares-free-students-{tag}"
+
+    async def fake_gather_evidence(query, country, scope="national", **kwargs):
+        results = {name: [] for name in ("claimreview", "newsapi", "gdelt", "web", "wikipedia")}
+        results["newsapi"] = [{
+            "title": title,
+            "url": article_url,
+            "source": "Reuters",
+            "description": "",
+        }]
+        return {"results": results, "timed_out": []}
+
+    fetched = []
+
+    async def fake_fetch(url, client=None):
+        fetched.append(url)
+        return body
+
+    monkeypatch.setattr(main, "gather_evidence", fake_gather_evidence)
+    monkeypatch.setattr(main, "fetch_article_text_async", fake_fetch)
+
+    r = TestClient(app).post("/predict", headers=HEADERS, json={"text": claim, "country": "IN"})
+    assert r.status_code == 200
+    evidence = [e for e in r.json()["evidence"] if e["url"] == article_url]
+    assert fetched == [article_url]
+    assert evidence
+    return evidence[0]["stance"]
+
+
+@pytest.mark.parametrize("body, expected", [
+    ("Fact check: the claim is false. Officials denied that Delhi metro fares will be free for students.", "refutes"),
+    (None, "supports"),  # body unavailable -> title-based stance
+])
+def test_predict_uses_body_stance_for_trusted_sources(monkeypatch, body, expected):
+    title = "Delhi metro fares will be free for students from next month"
+    assert _article_stance(monkeypatch, title, body) == expected
+
+
+def test_supporting_body_does_not_clear_a_debunking_title(monkeypatch):
+    async def supports(body, claim):
+        return "supports", 0.9
+
+    monkeypatch.setattr(verification, "classify_stance_async", supports)
+    title = "Fact check: Delhi metro fares will be free for students from next month is false"
+    body = "Officials announced the Delhi metro fares for students in an official statement."
+    assert _article_stance(monkeypatch, title, body) == "refutes"
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app import nli_model, warmup
+from app.main import app
+
+
+def _wait_ready(client, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        r = client.get("/ready")
+        if r.status_code == 200:
+            return r
+        time.sleep(0.02)
+    raise AssertionError("worker never became ready")
+
+
+def _wait_degraded(client, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        r = client.get("/ready")
+        if r.json()["phase"] == "degraded":
+            return r
+        time.sleep(0.02)
+    raise AssertionError("warm-up never failed")
+
+
+def test_ready_is_503_until_warmup_finishes(monkeypatch):
+    loaded = threading.Event()
+    calls = []
+
+    class SlowPipeline:
+        def __call__(self, inputs, **kwargs):
+            calls.append([item["text"] for item in inputs])
+            return [[{"label": "entailment", "score": 0.9}] for _ in inputs]
+
+    def slow_load():
+        loaded.wait(5)
+        return SlowPipeline()
+
+    monkeypatch.setattr(warmup, "WARMUP_ON_STARTUP", True)
+    monkeypatch.setattr(warmup, "WARMUP_INFERENCES", 2)
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", slow_load)
+    nli_model._stance_memo.clear()
+
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        r = client.get("/ready")
+        assert r.status_code == 503 and r.json()["ready"] is False
+        loaded.set()
+        body = _wait_ready(client).json()
+        assert body["phase"] == "ready" and body["error"] is None
+    # the dummy inferences went through the model
+    assert len(calls) >= 1
+
+
+def test_ready_immediately_when_warmup_disabled(monkeypatch):
+    monkeypatch.setattr(warmup, "WARMUP_ON_STARTUP", False)
+    with TestClient(app) as client:
+        assert client.get("/ready").status_code == 200
+
+
+def test_failed_model_load_keeps_the_worker_unready_until_a_retry_succeeds(monkeypatch):
+    attempts = []
+
+    class Pipeline:
+        def __call__(self, inputs, **kwargs):
+            return [[{"label": "entailment", "score": 0.9}] for _ in inputs]
+
+    def flaky_load():
+        # get_nli_pipeline returns None (heuristic fallback) when the model fails to load
+        attempts.append(1)
+        return Pipeline() if len(attempts) > 2 else None
+
+    monkeypatch.setattr(warmup, "WARMUP_ON_STARTUP", True)
+    monkeypatch.setattr(warmup, "WARMUP_RETRY_SECONDS", 0.2)
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", flaky_load)
+    with TestClient(app) as client:
+        assert client.get("/ready").status_code == 503
+        body = _wait_degraded(client).json()
+        assert body["ready"] is False and "NLI model not loaded" in body["error"]
+        body = _wait_ready(client).json()
+        assert body["phase"] == "ready" and body["error"] is None
+
+
+def test_unreachable_inference_server_keeps_the_worker_unready(monkeypatch, tmp_path):
+    monkeypatch.setattr(warmup, "WARMUP_ON_STARTUP", True)
+    monkeypatch.setattr(nli_model, "NLI_SERVER_SOCKET", str(tmp_path / "missing.sock"))
+    monkeypatch.setattr(nli_model, "_inference_client", None)
+    monkeypatch.setattr(nli_model, "_stance_batcher", None)
+    with TestClient(app) as client:
+        r = _wait_degraded(client)
+        assert r.status_code == 503 and r.json()["error"].startswith("nli_server:")
+
+
+def test_every_warmup_inference_runs_the_model(monkeypatch):
+    calls = []
+
+    class Pipeline:
+        def __call__(self, inputs, **kwargs):
+            calls.append([item["text"] for item in inputs])
+            return [[{"label": "entailment", "score": 0.9}] for _ in inputs]
+
+    pipe = Pipeline()
+    monkeypatch.setattr(nli_model, "get_nli_pipeline", lambda: pipe)
+    nli_model._stance_memo.clear()
+    before = nli_model._stance_memo.stats()
+
+    warmup.warm_up(inferences=3)
+    assert len(calls) == 3
+    # Warm-up neither fills the stance memo nor counts as hits
+    after = nli_model._stance_memo.stats()
+    assert after["entries"] == 0 and after["hits"] == before["hits"]